@@ -0,0 +1,130 @@
+# analytics_jobs.py
+# 습관 / 회고 분석을 rerun 밖(스레드 풀)에서 계산하고, (사용자, 분석 이름)마다 마지막 결과를 기억해 두는 곳
+#
+# 화면은 request() 로 지금 데이터 버전의 결과를 달라고 하고, 아직 없으면 바로 직전 결과를
+# 먼저 그립니다. 계산은 풀에서 돌고, 끝나면 다음 rerun 부터 새 결과가 나와요.
+# 계산 함수는 스크립트 스레드 밖에서 돌기 때문에 st.* 나 세션의 기록 객체를 건드리면 안 되고,
+# 스냅숏(bits, 점수 목록 같은 값)이나 저장소(자체 잠금 있음)만 써야 합니다.
+# shared_cache 를 주면 같은 (key, 버전) 결과를 다른 서버 프로세스가 이미 만들었을 때 그대로 가져와요.
+# 실패한 계산은 기억하지 않아요: 직전 결과를 계속 보여주고 retry_after 초가 지난 다음 요청 때 다시 계산합니다.
+import collections
+import concurrent.futures
+import threading
+import time
+
+
+class AnalyticsJobs:
+    """분석 계산용 스레드 풀 + (key, 버전)별 결과 기억.
+
+    key 마다 가장 최근에 성공한 (버전, 결과) 하나와, 계산 중인 (버전, future) 하나,
+    마지막으로 실패한 (버전, 오류, 시각) 하나만 둡니다.
+    같은 버전을 여러 세션이 동시에 요청해도 계산은 한 번만 해요.
+    """
+
+    SHARED_NAMESPACE = "analytics"
+
+    def __init__(self, max_workers=2, max_results=256, shared_cache=None, shared_ttl=None, retry_after=5.0):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers, thread_name_prefix="analytics")
+        self._lock = threading.Lock()
+        self._results = collections.OrderedDict() # key -> (version, result), 오래 안 쓴 key 부터 내려놓음
+        self._pending = {} # key -> (version, future)
+        self._requested = {} # key -> 가장 최근에 요청된 버전
+        self._failures = {} # key -> (version, error, 실패한 시각). 다음 성공 때 지워요
+        self.max_results = max_results
+        self.retry_after = retry_after # 실패한 버전을 다시 계산하기까지 기다릴 초 (실패가 rerun 마다 되풀이되지 않게)
+        self.shared_cache = shared_cache # SharedCache 또는 None
+        self.shared_ttl = shared_ttl
+
+    def request(self, key, version, compute, *args, wait=0.0):
+        """(결과, 최신 여부) 를 돌려줍니다.
+
+        version 의 결과가 있으면 (결과, True). 없으면 compute(*args) 를 풀에 맡기고
+        wait 초까지만 기다려 본 뒤, 그래도 안 끝났으면 직전 결과(없으면 None)와 False.
+        이 버전의 계산이 방금 실패했으면 retry_after 초가 지날 때까지는 다시 맡기지 않고 직전 결과를 돌려줘요.
+        """
+        future = None
+        with self._lock:
+            entry = self._lookup(key, version)
+            if entry is None and not self._failed_recently(key, version):
+                future = self._submit(key, version, compute, args)
+        if future is not None and wait > 0:
+            concurrent.futures.wait([future], timeout=wait)
+            with self._lock:
+                entry = self._lookup(key, version)
+        if entry is not None:
+            return entry[1], True
+        with self._lock:
+            last = self._results.get(key)
+        return (last[1] if last is not None else None), False
+
+    def is_done(self, key, version):
+        # 다시 요청할 때가 됐는지: version 의 결과가 나왔거나, 실패한 뒤 retry_after 초가 지났을 때
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and entry[0] == version:
+                return True
+            failure = self._failures.get(key)
+            return failure is not None and failure[0] == version and not self._failed_recently(key, version)
+
+    def last_result(self, key):
+        # 버전과 상관없이 마지막으로 성공한 결과 (없으면 None). 새 버전을 직전 결과에서 고쳐 만들 때 써요
+        with self._lock:
+            entry = self._results.get(key)
+            return entry[1] if entry is not None else None
+
+    def last_error(self, key):
+        # 마지막으로 실패한 계산의 오류 (다음에 성공하면 None)
+        with self._lock:
+            failure = self._failures.get(key)
+            return failure[1] if failure is not None else None
+
+    def _failed_recently(self, key, version):
+        failure = self._failures.get(key)
+        return failure is not None and failure[0] == version and time.monotonic() - failure[2] < self.retry_after
+
+    def _lookup(self, key, version):
+        entry = self._results.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        self._results.move_to_end(key)
+        return entry
+
+    def _submit(self, key, version, compute, args):
+        self._requested[key] = version
+        pending = self._pending.get(key)
+        if pending is not None:
+            if pending[0] == version:
+                return pending[1]
+            pending[1].cancel() # 아직 시작 안 한 옛 버전 계산은 취소
+        future = self._executor.submit(self._run, key, version, compute, args)
+        self._pending[key] = (version, future)
+        return future
+
+    def _run(self, key, version, compute, args):
+        try:
+            if self.shared_cache is None:
+                result = compute(*args)
+            else:
+                result = self.shared_cache.get_or_compute(self.SHARED_NAMESPACE, key, version, compute, *args, ttl=self.shared_ttl)
+        except Exception as exc: # 결과로 남기지 않아요. 직전 결과를 계속 쓰고 retry_after 뒤에 다시 계산
+            with self._lock:
+                if self._pending.get(key, (None,))[0] == version:
+                    del self._pending[key]
+                self._failures[key] = (version, exc, time.monotonic())
+            return
+        with self._lock:
+            if self._pending.get(key, (None,))[0] == version:
+                del self._pending[key]
+            current = self._results.get(key)
+            latest = self._requested.get(key)
+            if current is not None and current[0] == latest and version != latest:
+                return # 늦게 끝난 옛 버전이 더 새 결과를 덮지 않도록
+            if self._failures.get(key, (None,))[0] == version:
+                del self._failures[key]
+            self._results[key] = (version, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_results:
+                old_key, _ = self._results.popitem(last=False)
+                if old_key not in self._pending:
+                    self._requested.pop(old_key, None)
+                    self._failures.pop(old_key, None)
@@ -0,0 +1,299 @@
+# analytics_snapshot.py
+# 모든 사용자의 집중 기록 / 습관 달성 / 회고 감성을 열(column) 단위 Parquet 스냅숏으로 떠 두고,
+# 그 위에서 운영자 대시보드(operator_dashboard.py)가 쓰는 집계를 한 번에(벡터 연산으로) 계산하는 곳
+#
+#   python analytics_snapshot.py [DB 경로] [--out snapshots] [--keep 3] [--every 60]
+#
+# --every 분을 주면 그 간격으로 계속 새 스냅숏을 뜹니다 (cron 등으로 한 번씩 불러도 돼요).
+# 스냅숏은 <out>/<시각>/ 아래 표마다 월(month=YYYY-MM) 파티션으로 쓰고, 다 쓴 뒤에 LATEST 가 가리키게
+# 바꿉니다. 대시보드는 LATEST 만 읽으니 쓰는 중인 스냅숏을 볼 일이 없어요.
+#   tasks        user_id, date, complexity_level, focus_duration_minutes, break_duration_minutes, logged_focus_minutes, feedback
+#   habit_days   user_id, habit_id, date, done   (습관마다 만든 날부터 스냅숏 날까지 하루 한 줄)
+#   reflections  user_id, date, sentiment_score, sentiment_level, lexicon_version
+# 작업 이름과 회고 본문은 운영 분석에 필요 없어서 담지 않습니다.
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from habit_analytics import tracking_matrix
+from storage import SNAPSHOT_TASK_COLUMNS, Storage
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.environ.get("ASSISTANT_SNAPSHOT_DIR", os.path.join(APP_DIR, "snapshots"))
+LATEST_NAME = "LATEST"
+MANIFEST_NAME = "manifest.json"
+KEEP_SNAPSHOTS = 3
+ROW_GROUP_ROWS = 1 << 17
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal() # date32 는 1970-01-01 부터의 일수
+
+TASK_SCHEMA = pa.schema([
+    ('user_id', pa.string()),
+    ('date', pa.date32()),
+    ('complexity_level', pa.string()),
+    ('focus_duration_minutes', pa.int32()),
+    ('break_duration_minutes', pa.int32()),
+    ('logged_focus_minutes', pa.int32()),
+    ('feedback', pa.string()),
+    ('month', pa.string()),
+])
+HABIT_DAY_SCHEMA = pa.schema([
+    ('user_id', pa.string()),
+    ('habit_id', pa.int32()),
+    ('date', pa.date32()),
+    ('done', pa.bool_()),
+    ('month', pa.string()),
+])
+REFLECTION_SCHEMA = pa.schema([
+    ('user_id', pa.string()),
+    ('date', pa.date32()),
+    ('sentiment_score', pa.float64()),
+    ('sentiment_level', pa.string()),
+    ('lexicon_version', pa.string()),
+    ('month', pa.string()),
+])
+TABLE_SCHEMAS = {'tasks': TASK_SCHEMA, 'habit_days': HABIT_DAY_SCHEMA, 'reflections': REFLECTION_SCHEMA}
+PARTITIONING = ds.partitioning(pa.schema([('month', pa.string())]), flavor="hive")
+
+
+# --- 스냅숏 쓰기 ---
+def month_of(dates):
+    # date32 배열 -> 'YYYY-MM' 파티션 값
+    return pc.strftime(dates, format="%Y-%m")
+
+
+def task_batches(storage, batch_size):
+    # SQLite 에서 끊어 읽은 줄을 열로 돌려 RecordBatch 로 (작업 이름 / id 는 뺌)
+    for rows in storage.scan_all_tasks(batch_size):
+        columns = dict(zip(SNAPSHOT_TASK_COLUMNS, zip(*rows)))
+        dates = pa.array(columns['date'], pa.string()).cast(pa.date32())
+        yield pa.record_batch([
+            pa.array(columns['user_id'], pa.string()),
+            dates,
+            pa.array(columns['complexity_level'], pa.string()),
+            pa.array(columns['focus_duration_minutes'], pa.int32()),
+            pa.array(columns['break_duration_minutes'], pa.int32()),
+            pa.array(columns['logged_focus_minutes'], pa.int32()),
+            pa.array(columns['feedback'], pa.string()),
+            month_of(dates),
+        ], schema=TASK_SCHEMA)
+
+
+def habit_day_batches(storage, today_str, batch_size):
+    # 습관 묶음마다 bits 를 (습관 × 날짜) 행렬로 펼치고(habit_analytics.tracking_matrix), 만든 뒤의 날만 줄로
+    for rows in storage.scan_all_habits(batch_size):
+        done, active, first_ordinal = tracking_matrix([(creation_date, bits) for _, _, creation_date, bits in rows], today_str)
+        habit_rows, day_columns = np.nonzero(active)
+        if not len(habit_rows):
+            continue
+        user_ids = pa.array([user_id for user_id, _, _, _ in rows], pa.string())
+        habit_ids = np.array([habit_id for _, habit_id, _, _ in rows], dtype=np.int32)
+        dates = pa.array((day_columns + (first_ordinal - EPOCH_ORDINAL)).astype(np.int32)).cast(pa.date32())
+        yield pa.record_batch([
+            user_ids.take(pa.array(habit_rows)),
+            pa.array(habit_ids[habit_rows]),
+            dates,
+            pa.array(done[habit_rows, day_columns]),
+            month_of(dates),
+        ], schema=HABIT_DAY_SCHEMA)
+
+
+def reflection_batches(storage, batch_size):
+    for rows in storage.scan_all_reflection_scores(batch_size):
+        user_ids, dates, scores, levels, versions = zip(*rows)
+        dates = pa.array(dates, pa.string()).cast(pa.date32())
+        yield pa.record_batch([
+            pa.array(user_ids, pa.string()),
+            dates,
+            pa.array(scores, pa.float64()),
+            pa.array(levels, pa.string()),
+            pa.array(versions, pa.string()),
+            month_of(dates),
+        ], schema=REFLECTION_SCHEMA)
+
+
+def write_table(batches, schema, base_dir):
+    # 묶음을 하나씩 흘려보내며 월 파티션으로 씁니다 (전체를 메모리에 올리지 않음). 쓴 줄 수를 돌려줘요
+    counted = {'rows': 0}
+
+    def counting(batches):
+        for batch in batches:
+            counted['rows'] += batch.num_rows
+            yield batch
+
+    # 줄이 하나도 없으면 write_dataset 이 폴더를 만들지 않아요. 빈 표도 읽을 수 있게 폴더는 항상 만들어 둡니다
+    os.makedirs(base_dir)
+    ds.write_dataset(
+        counting(batches), base_dir, schema=schema, format="parquet", partitioning=PARTITIONING,
+        basename_template="part-{i}.parquet", existing_data_behavior="error",
+        # 들어오는 묶음이 여러 달에 걸쳐 있어 파티션마다 조각이 작아요. 모아서 큰 row group 으로 써야 읽기가 빨라요
+        min_rows_per_group=ROW_GROUP_ROWS, max_rows_per_group=ROW_GROUP_ROWS * 4,
+    )
+    return counted['rows']
+
+
+def write_snapshot(storage, out_dir=SNAPSHOT_DIR, keep=KEEP_SNAPSHOTS, today_str=None, batch_size=50000):
+    """모든 사용자의 기록으로 새 스냅숏을 쓰고 LATEST 를 옮긴 뒤 manifest 를 돌려줍니다."""
+    if keep < 1: # 다 쓴 뒤에 알게 되지 않도록 먼저 확인 (prune_snapshots 와 같은 조건)
+        raise ValueError(f"keep must be at least 1, got {keep}")
+    today_str = today_str or datetime.now().strftime("%Y-%m-%d")
+    # 마이크로초까지 넣어 같은 초에 시작한 두 실행도 다른 폴더를 쓰게 해요 (이름 순서 = 만든 순서는 그대로)
+    snapshot_id = datetime.now().strftime("%Y%m%dT%H%M%S.%f")
+    final_dir = os.path.join(out_dir, snapshot_id)
+    work_dir = final_dir + ".tmp"
+    if os.path.exists(final_dir):
+        raise FileExistsError(f"snapshot {snapshot_id} already exists")
+    os.makedirs(work_dir, exist_ok=False) # 그래도 겹치면 남의 스냅숏에 섞어 쓰지 않고 바로 실패
+    started = time.perf_counter()
+    try:
+        rows = {
+            'tasks': write_table(task_batches(storage, batch_size), TASK_SCHEMA, os.path.join(work_dir, 'tasks')),
+            'habit_days': write_table(habit_day_batches(storage, today_str, batch_size // 50), HABIT_DAY_SCHEMA, os.path.join(work_dir, 'habit_days')),
+            'reflections': write_table(reflection_batches(storage, batch_size), REFLECTION_SCHEMA, os.path.join(work_dir, 'reflections')),
+        }
+        manifest = {
+            'id': snapshot_id,
+            'created': datetime.now().isoformat(timespec="seconds"),
+            'as_of': today_str,
+            'rows': rows,
+            'elapsed_s': round(time.perf_counter() - started, 2),
+        }
+        with open(os.path.join(work_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.rename(work_dir, final_dir)
+    except BaseException:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+    latest_path = os.path.join(out_dir, LATEST_NAME)
+    with open(latest_path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(snapshot_id)
+    os.replace(latest_path + ".tmp", latest_path)
+    prune_snapshots(out_dir, keep)
+    return manifest
+
+
+def prune_snapshots(out_dir, keep):
+    # 최근 keep 개만 남기고 지웁니다 (이름이 시각이라 이름 순서 = 만든 순서). 방금 뜬 스냅숏은 남아야 하니 keep >= 1
+    if keep < 1:
+        raise ValueError(f"keep must be at least 1, got {keep}")
+    snapshot_ids = sorted(
+        name for name in os.listdir(out_dir)
+        if os.path.isdir(os.path.join(out_dir, name)) and not name.endswith(".tmp")
+    )
+    for snapshot_id in snapshot_ids[:-keep]:
+        shutil.rmtree(os.path.join(out_dir, snapshot_id), ignore_errors=True)
+
+
+# --- 스냅숏 읽기 / 집계 ---
+def latest_snapshot(out_dir=SNAPSHOT_DIR):
+    # LATEST 가 가리키는 스냅숏의 manifest (없으면 None)
+    try:
+        with open(os.path.join(out_dir, LATEST_NAME), encoding="utf-8") as f:
+            snapshot_id = f.read().strip()
+        with open(os.path.join(out_dir, snapshot_id, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_table(out_dir, snapshot_id, table, columns, since, until):
+    """since <= date <= until (datetime.date) 인 줄의 columns 만 읽습니다.
+
+    월 파티션 조건을 함께 걸어 기간 밖의 파일은 열지도 않아요. 표 폴더가 없으면(빈 표) 빈 결과를 돌려줘요.
+    """
+    schema = TABLE_SCHEMAS[table]
+    table_dir = os.path.join(out_dir, snapshot_id, table)
+    if not os.path.isdir(table_dir):
+        return schema.empty_table().select(columns)
+    dataset = ds.dataset(table_dir, schema=schema, format="parquet", partitioning=PARTITIONING)
+    condition = (
+        (ds.field('month') >= since.strftime("%Y-%m")) & (ds.field('month') <= until.strftime("%Y-%m"))
+        & (ds.field('date') >= pa.scalar(since, pa.date32())) & (ds.field('date') <= pa.scalar(until, pa.date32()))
+    )
+    return dataset.to_table(columns=columns, filter=condition)
+
+
+def daily_focus(out_dir, snapshot_id, since, until):
+    # 날짜별 집중 시간 합계(진행 중인 작업 포함) / 완료 세션 수(피드백을 남긴 작업) / 집중한 사용자 수
+    tasks = read_table(out_dir, snapshot_id, 'tasks', ['date', 'user_id', 'logged_focus_minutes', 'feedback'], since, until)
+    tasks = tasks.filter(pc.or_(pc.greater(tasks['logged_focus_minutes'], 0), pc.is_valid(tasks['feedback'])))
+    return tasks.group_by('date').aggregate([
+        ('logged_focus_minutes', 'sum'), ('feedback', 'count'), ('user_id', 'count_distinct'), # count 는 null 을 세지 않아요
+    ]).sort_by('date').rename_columns(['date', 'focus_minutes', 'sessions', 'users'])
+
+
+def feedback_distribution(out_dir, snapshot_id, since, until):
+    # 집중도 피드백별 횟수와 집중 시간 합계 (피드백을 남긴 작업만)
+    tasks = read_table(out_dir, snapshot_id, 'tasks', ['feedback', 'logged_focus_minutes'], since, until)
+    tasks = tasks.filter(pc.is_valid(tasks['feedback']))
+    return tasks.group_by('feedback').aggregate([
+        ('feedback', 'count'), ('logged_focus_minutes', 'sum'),
+    ]).sort_by([('feedback_count', 'descending')]).rename_columns(['feedback', 'count', 'focus_minutes'])
+
+
+def daily_habit_completion(out_dir, snapshot_id, since, until):
+    # 날짜별 (달성 수, 기록 중인 습관 수, 달성률 %)
+    days = read_table(out_dir, snapshot_id, 'habit_days', ['date', 'done'], since, until)
+    days = days.append_column('done_count', pc.cast(days['done'], pa.int32()))
+    daily = days.group_by('date').aggregate([('done_count', 'sum'), ('done_count', 'count')]).sort_by('date')
+    daily = daily.rename_columns(['date', 'done', 'habits'])
+    return daily.append_column('rate', pc.multiply(pc.divide(pc.cast(daily['done'], pa.float64()), daily['habits']), 100.0))
+
+
+def daily_sentiment(out_dir, snapshot_id, since, until):
+    # 날짜별 평균 감성 점수와 회고 수
+    reflections = read_table(out_dir, snapshot_id, 'reflections', ['date', 'sentiment_score'], since, until)
+    return reflections.group_by('date').aggregate([
+        ('sentiment_score', 'mean'), ('sentiment_score', 'count'),
+    ]).sort_by('date').rename_columns(['date', 'mean_score', 'reflections'])
+
+
+def sentiment_distribution(out_dir, snapshot_id, since, until):
+    reflections = read_table(out_dir, snapshot_id, 'reflections', ['sentiment_level'], since, until)
+    return reflections.group_by('sentiment_level').aggregate([('sentiment_level', 'count')]).rename_columns(['sentiment_level', 'count'])
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1 이상이어야 해요: {value}")
+    return number
+
+
+def positive_float(value):
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"0 보다 커야 해요: {value}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모든 사용자의 기록을 운영 분석용 Parquet 스냅숏으로 떠 둡니다")
+    parser.add_argument("db", nargs="?", default=os.environ.get("ASSISTANT_DB_PATH", "assistant_data.db"), help="저장소 DB 경로")
+    parser.add_argument("--out", default=SNAPSHOT_DIR, help="스냅숏을 쓸 폴더")
+    parser.add_argument("--keep", type=positive_int, default=KEEP_SNAPSHOTS, help="남겨 둘 최근 스냅숏 수 (1 이상)")
+    parser.add_argument("--every", type=positive_float, help="이 간격(분)으로 계속 새 스냅숏을 뜹니다 (없으면 한 번만)")
+    args = parser.parse_args(argv)
+    os.makedirs(args.out, exist_ok=True)
+
+    storage = Storage(args.db)
+    try:
+        while True:
+            manifest = write_snapshot(storage, args.out, keep=args.keep)
+            print(f"snapshot {manifest['id']}: {manifest['rows']} in {manifest['elapsed_s']}s", flush=True)
+            if args.every is None:
+                break
+            time.sleep(args.every * 60)
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# assistant_common.py
+# 스마트 비서 앱(test.py)의 여러 모듈이 함께 쓰는 저장소 / 검색 색인 / 백그라운드 분석 / 날짜 헬퍼
+# (이력 조회 기간 / 표 위젯은 history_view.py)
+import streamlit as st
+from datetime import datetime, timedelta
+import os
+import uuid
+from analytics_jobs import AnalyticsJobs
+from search_index import SearchIndex
+from shared_cache import get_shared_cache
+from storage import Storage
+
+# --- 저장소 (프로세스당 하나의 SQLite 연결을 모든 세션이 공유) ---
+DB_PATH = os.environ.get("ASSISTANT_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "assistant_data.db"))
+# 세션 메모리에 들고 있을 최근 기록 기간(일). 그 이전 기록은 SQLite 에만 두고 이력 화면이 찾을 때 불러와요
+HOT_WINDOW_DAYS = int(os.environ.get("ASSISTANT_HOT_WINDOW_DAYS", "30"))
+
+@st.cache_resource
+def get_storage():
+    return Storage(DB_PATH)
+
+# 검색 색인을 들고 있을 사용자 수 (넘으면 오래 안 쓴 사용자 색인부터 내려놓고, 다음 검색 때 다시 만들어요)
+SEARCH_INDEX_USERS = int(os.environ.get("ASSISTANT_SEARCH_INDEX_USERS", "100"))
+
+@st.cache_resource(max_entries=SEARCH_INDEX_USERS)
+def get_search_index(user_id):
+    # 사용자별 기록 검색 색인. 같은 사용자의 모든 세션이 함께 쓰고, 처음 검색할 때 저장소에서 채워요
+    return SearchIndex()
+
+# --- 백그라운드 분석 (rerun 밖의 스레드 풀, 모든 세션이 공유) ---
+ANALYTICS_WORKERS = int(os.environ.get("ASSISTANT_ANALYTICS_WORKERS", "2"))
+ANALYTICS_WAIT_SECONDS = 0.05 # 이만큼 안에 끝나는 계산은 기다렸다가 바로 새 결과를 그려요
+ANALYTICS_POLL_SECONDS = 0.5  # 계산이 더 걸리면 이 간격으로 끝났는지 확인
+ANALYTICS_SHARED_TTL_SECONDS = 7 * 24 * 3600 # 다른 서버 프로세스와 함께 쓰는 결과를 둘 기간
+
+@st.cache_resource
+def get_analytics_jobs():
+    # 결과는 같은 노드의 다른 서버 프로세스와도 나눠 씁니다 (shared_cache.py)
+    return AnalyticsJobs(ANALYTICS_WORKERS, shared_cache=get_shared_cache(), shared_ttl=ANALYTICS_SHARED_TTL_SECONDS)
+
+def watch_analytics_job(key, version):
+    # 백그라운드 계산이 끝났을 때만 전체 앱을 다시 실행해서 새 결과를 보여줍니다
+    if get_analytics_jobs().is_done(key, version):
+        st.rerun()
+
+def request_analytics(name, version, compute, *args):
+    """이 사용자의 분석 name 을 데이터 버전 version 으로 요청하고 (결과, 최신 여부) 를 돌려줍니다.
+
+    최신 결과가 아직 없으면 직전 결과(없으면 None)를 먼저 돌려주고, 계산이 끝나면
+    앱이 한 번 다시 실행되도록 작은 fragment 를 걸어 둬요.
+    """
+    key = (st.session_state.user_id, name)
+    result, fresh = get_analytics_jobs().request(key, version, compute, *args, wait=ANALYTICS_WAIT_SECONDS)
+    if not fresh:
+        st.fragment(watch_analytics_job, run_every=ANALYTICS_POLL_SECONDS)(key, version)
+    return result, fresh
+
+def last_analytics(name):
+    # 이 사용자의 분석 name 의 직전 결과 (버전과 상관없이, 없으면 None)
+    return get_analytics_jobs().last_result((st.session_state.user_id, name))
+
+def get_user_id():
+    # 주소의 ?user= 값으로 사용자를 구분해요. 없으면 새로 만들어 주소에 남겨둡니다 (새로고침해도 기록 유지)
+    if 'user' not in st.query_params:
+        st.query_params['user'] = uuid.uuid4().hex[:12]
+    return st.query_params['user']
+
+# --- 헬퍼 함수 ---
+def get_today_date_str():
+    return datetime.now().strftime("%Y-%m-%d")
+
+def get_hot_window_start():
+    return (datetime.now() - timedelta(days=HOT_WINDOW_DAYS - 1)).strftime("%Y-%m-%d")
@@ -0,0 +1,186 @@
+# bench_first_paint.py
+# 앱 첫 화면이 그려지기까지 필요한 것들을 실제 streamlit 서버에 붙어서 잽니다 (브라우저 없이 프로토콜 수준)
+#
+#   python bench_first_paint.py [앱 경로 ...] [--repeat 20] [--output results.jsonl]
+#
+# 앱마다 (기본: main.py) 새 세션을 repeat 번 열어
+#   first_delta_ms   첫 화면 요소가 도착하기까지
+#   load_ms          첫 실행이 끝나기까지 (script_finished)
+#   load_bytes       첫 실행에서 받은 메시지 크기,  rerun_bytes  같은 화면을 다시 실행할 때 크기
+#   external         화면 요소 / 스타일시트가 부르는 외부 주소 (렌더링을 막는 @import, <link> 포함)
+#   static           app/static 파일마다 크기, 받는 시간, ETag 로 다시 확인했을 때 304 여부
+# 를 재고 JSON 한 줄로 출력합니다. 예전 버전과 비교할 때는 git worktree 로 꺼낸 main.py 를 같이 넘겨요.
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from websockets.asyncio.client import connect
+
+from load_test import APPS, free_port, start_server, wait_until_healthy
+
+STATIC_REF = re.compile(r"""(?:href|src)=['"](app/static/[^'"]+)['"]""")
+CSS_URL = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)""")
+EXTERNAL_URL = re.compile(r"""https?://[^\s'"()<>]+""")
+EXTERNAL_IMPORT = re.compile(r"""@import\s+url\(\s*['"]?https?://""") # 렌더링을 막는 외부 스타일시트
+
+
+def element_html(element):
+    # 화면 요소에서 HTML / 마크다운 본문만 (외부 주소와 app/static 참조를 찾는 데 씀)
+    kind = element.WhichOneof("type")
+    if kind == "markdown":
+        return element.markdown.body
+    if kind == "html":
+        return element.html.body
+    return ""
+
+
+async def open_session(port):
+    # 새 세션 하나로 첫 실행을 하고 (첫 요소까지 초, 끝까지 초, 받은 bytes, 본문들) 과 웹소켓을 돌려줍니다
+    ws = await connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None, open_timeout=60)
+    load = await run_script(ws)
+    return ws, load
+
+
+async def run_script(ws):
+    message = BackMsg()
+    message.rerun_script.query_string = ""
+    message.rerun_script.page_script_hash = ""
+    started = time.perf_counter()
+    await ws.send(message.SerializeToString())
+    first_delta = None
+    received = 0
+    bodies = []
+    async for data in ws:
+        received += len(data)
+        forward = ForwardMsg()
+        forward.ParseFromString(data)
+        kind = forward.WhichOneof("type")
+        if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+            if first_delta is None:
+                first_delta = time.perf_counter() - started
+            bodies.append(element_html(forward.delta.new_element))
+        elif kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+            return first_delta, time.perf_counter() - started, received, bodies
+    raise ConnectionError("websocket closed before the script finished")
+
+
+def fetch(url, headers=None):
+    # (상태, 본문 bytes, 응답 헤더, 초)
+    request = urllib.request.Request(url, headers=headers or {})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.read(), dict(response.headers), time.perf_counter() - started
+    except urllib.error.HTTPError as error:
+        return error.code, b"", dict(error.headers), time.perf_counter() - started
+
+
+def check_static(port, paths):
+    # app/static 파일과, 스타일시트가 url() 로 부르는 같은 폴더의 파일까지 받아 봅니다.
+    # (파일별 결과, 스타일시트가 부르는 외부 주소, 그중 렌더링을 막는 @import 수)
+    results = {}
+    external = set()
+    blocking = 0
+    queue = list(paths)
+    while queue:
+        path = queue.pop()
+        if path in results:
+            continue
+        url = f"http://127.0.0.1:{port}/{path}"
+        status, body, headers, elapsed = fetch(url)
+        etag = headers.get("etag")
+        revalidated = fetch(url, {"If-None-Match": etag})[0] if etag else None
+        results[path] = {
+            'status': status, 'bytes': len(body), 'ms': round(elapsed * 1000, 2),
+            'cache_control': headers.get("cache-control"), 'etag': etag is not None, 'revalidate_status': revalidated,
+        }
+        if path.endswith(".css"):
+            text = body.decode("utf-8", errors="replace")
+            external.update(EXTERNAL_URL.findall(text))
+            blocking += len(EXTERNAL_IMPORT.findall(text))
+            for ref in CSS_URL.findall(text):
+                if not EXTERNAL_URL.match(ref) and not ref.startswith("data:"):
+                    queue.append(urllib.parse.urljoin(path, ref))
+    return results, external, blocking
+
+
+def summarize_ms(values):
+    values = sorted(values)
+    return {
+        'p50_ms': round(statistics.median(values) * 1000, 2),
+        'max_ms': round(values[-1] * 1000, 2),
+    }
+
+
+async def measure_app(app_path, args):
+    port = args.port or free_port()
+    work_dir = tempfile.mkdtemp(prefix="first_paint_")
+    server = start_server(app_path, port, os.path.join(work_dir, "first_paint.db"))
+    try:
+        wait_until_healthy(server, port, args.startup_timeout)
+        first_deltas, loads, load_bytes, rerun_bytes = [], [], [], []
+        bodies = []
+        for _ in range(args.repeat):
+            ws, (first_delta, load, received, bodies) = await open_session(port)
+            first_deltas.append(first_delta)
+            loads.append(load)
+            load_bytes.append(received)
+            rerun_bytes.append((await run_script(ws))[2])
+            await ws.close()
+        html = "\n".join(bodies)
+        static, css_external, css_blocking = check_static(port, STATIC_REF.findall(html))
+        return {
+            'app': os.path.relpath(app_path),
+            'repeat': args.repeat,
+            'first_delta': summarize_ms(first_deltas),
+            'load': summarize_ms(loads),
+            'load_bytes': int(statistics.median(load_bytes)),
+            'rerun_bytes': int(statistics.median(rerun_bytes)),
+            'inline_style_bytes': sum(len(body) for body in bodies if "<style" in body),
+            'external': sorted(set(EXTERNAL_URL.findall(html)) | css_external),
+            'render_blocking_external': len(EXTERNAL_IMPORT.findall(html)) + css_blocking
+                                        + sum("https://" in ref or "http://" in ref for ref in re.findall(r"<link[^>]+href=['\"]([^'\"]+)", html)),
+            'static': static,
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="streamlit 앱 첫 화면 비용 (시간, 전송량, 외부 요청, 정적 파일 캐시) 측정")
+    parser.add_argument("apps", nargs="*", default=[APPS["mbti"]], help="잴 앱 스크립트 (기본: main.py)")
+    parser.add_argument("--repeat", type=int, default=20, help="앱마다 새로 열 세션 수")
+    parser.add_argument("--port", type=int, default=0, help="서버 포트 (기본: 빈 포트)")
+    parser.add_argument("--startup-timeout", type=float, default=60.0, help="서버가 뜨기를 기다릴 최대 시간(초)")
+    parser.add_argument("--output", help="결과를 JSON lines 로 저장할 파일 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    common = {'python': platform.python_version(), 'timestamp': datetime.now().isoformat(timespec="seconds")}
+    try:
+        for app_path in args.apps:
+            result = asyncio.run(measure_app(os.path.abspath(app_path), args))
+            print(json.dumps({**result, **common}, ensure_ascii=False), file=out, flush=True)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# bench_reruns.py
+# 두 앱(main.py, test.py 의 세 모듈)을 화면 없이 실행해 데이터 크기별 rerun 성능을 재는 벤치마크
+#
+#   python bench_reruns.py [--sizes 10,100,1000,10000,100000] [--repeat 3] [--output results.jsonl]
+#   python bench_reruns.py --cold-start [--repeat 5]
+#   python bench_reruns.py --records [--sizes ...]
+#
+# 크기마다 가짜 세션 상태(집중 기록 / 습관 × 날짜 / 회고)를 채워 넣고 rerun 하면서
+# 걸린 시간, 화면 요소 수, 최대 메모리를 JSON 한 줄씩 출력합니다.
+# --cold-start 는 탭마다 새 파이썬 프로세스에서 첫 화면이 그려질 때까지의 시간을 잽니다.
+# --records 는 같은 기록을 dict 와 __slots__ 레코드로 만들었을 때의 메모리를 비교합니다.
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block
+
+from habit_store import HabitTracking
+from records import HabitRecord, ReflectionRecord, TaskRecord
+from sentiment import get_matcher, reflection_text, sentiment_label
+from storage import Storage
+from task_store import TaskStore
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_APP = os.path.join(APP_DIR, "test.py")
+MBTI_APP = os.path.join(APP_DIR, "main.py")
+
+MODULES = {
+    "pomodoro": "🧠 집중 타이머",
+    "habits": "💖 습관 분석기",
+    "reflection": "🌙 자기전 회고",
+}
+TASKS_PER_DAY = 8
+HABIT_COUNT = 20
+FEEDBACKS = ["매우 좋음", "좋음", "보통", "나쁨", "매우 나쁨"]
+SAMPLE_ANSWERS = ["친구와 즐거웠다", "새로운 코딩 방법을 배웠다", "조금 피곤했다", "발표가 어렵지 않았다", "산책하며 행복했다"]
+
+
+# --- 가짜 세션 상태 만들기 ---
+def days_ago(today, days):
+    return (today - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(size, today, rng):
+    tasks = []
+    for i in range(size):
+        focus = rng.choice([10, 15, 20, 25, 30, 35, 40, 45, 50])
+        tasks.append({
+            'name': f"작업 {i % 37}",
+            'complexity_level': f"{focus}분",
+            'focus_duration_minutes': focus,
+            'break_duration_minutes': 10 if focus >= 40 else 5,
+            'logged_focus_minutes': focus * rng.randint(0, 3),
+            'feedback': rng.choice(FEEDBACKS),
+            'date': days_ago(today, size // TASKS_PER_DAY - i // TASKS_PER_DAY),
+        })
+    return TaskStore(tasks)
+
+
+def make_habits(size, today, rng):
+    # size 를 (습관 수 × 기록 일수) 칸 수로 봅니다
+    habit_count = min(HABIT_COUNT, size)
+    days = max(1, size // habit_count)
+    habits = []
+    for habit_id in range(1, habit_count + 1):
+        tracking = HabitTracking(days_ago(today, days - 1), rng.getrandbits(days))
+        habits.append(HabitRecord(habit_id, f"습관 {habit_id}", tracking.creation_date, tracking))
+    return habits
+
+
+def make_reflections(size, today, rng):
+    matcher = get_matcher()
+    reflections = {}
+    for day in range(1, size + 1): # 오늘은 비워 두어 입력 화면도 함께 그려지게
+        q1, q2, q3 = (rng.choice(SAMPLE_ANSWERS) for _ in range(3))
+        score = matcher.score(reflection_text(q1, q2, q3))
+        reflections[days_ago(today, day)] = ReflectionRecord(
+            q1, q2, q3, f"오늘 하루는 '{q1}'으로 기뻤습니다.", sentiment_label(score), score, matcher.version
+        )
+    return reflections
+
+
+# --- 측정 ---
+def count_elements(app_test):
+    # 본문과 사이드바에 그려진 화면 요소 수 (컨테이너 / 열 같은 블록은 빼고). 블록을 돌면 그 아래 노드가 모두 나와요
+    return sum(1 for area in (app_test.main, app_test.sidebar) for node in area if not isinstance(node, Block))
+
+
+def measure(app_test, repeat, prepare=None):
+    # prepare: 매 rerun 전에 부르는 함수 (버튼 클릭처럼 한 번만 유지되는 입력을 다시 넣어 같은 화면을 재도록)
+    timings = []
+    peaks = []
+    for _ in range(repeat):
+        if prepare is not None:
+            prepare()
+        tracemalloc.start()
+        started = time.perf_counter()
+        app_test.run()
+        timings.append(time.perf_counter() - started)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        if app_test.exception:
+            raise RuntimeError(app_test.exception[0].message)
+    return {
+        'rerun_ms_median': round(statistics.median(timings) * 1000, 2),
+        'rerun_ms_max': round(max(timings) * 1000, 2),
+        'elements': count_elements(app_test),
+        'peak_memory_kb': round(max(peaks) / 1024, 1),
+    }
+
+
+def bench_assistant_module(module, size, repeat, timeout):
+    rng = random.Random(size)
+    today = datetime.now()
+    user_id = f"bench-{module}-{size}"
+    reflections = make_reflections(size, today, rng) if module == "reflection" else {}
+    if reflections:
+        # 감성 통계는 저장된 회고로 계산하므로 임시 DB 에도 넣어 둡니다
+        storage = Storage(os.environ["ASSISTANT_DB_PATH"])
+        storage.save(user_id, reflections=list(reflections.items()))
+        storage.close()
+    app_test = AppTest.from_file(TEST_APP, default_timeout=timeout)
+    app_test.query_params["user"] = user_id
+    app_test.session_state["main_menu_selection"] = MODULES[module]
+    app_test.session_state["user_id"] = user_id
+    app_test.session_state["tasks"] = make_tasks(size, today, rng) if module == "pomodoro" else TaskStore()
+    app_test.session_state["habits"] = make_habits(size, today, rng) if module == "habits" else []
+    app_test.session_state["reflections"] = reflections
+    app_test.run() # 첫 실행(캐시 채우기)은 따로 잽니다
+    return measure(app_test, repeat)
+
+
+def bench_mbti(repeat, timeout):
+    # 버튼 클릭은 바로 다음 rerun 에만 남으므로, 매번 다시 눌러 결과 카드가 있는 화면만 잽니다
+    app_test = AppTest.from_file(MBTI_APP, default_timeout=timeout).run()
+    app_test.selectbox[0].set_value("ENFP")
+    show_result = lambda: app_test.button[0].click()
+    show_result()
+    app_test.run() # 첫 결과 카드(카드 만들기 / 캐시 채우기)는 따로
+    return measure(app_test, repeat, prepare=show_result)
+
+
+def cold_start_child(module, timeout):
+    # 새 프로세스 안에서 실행됨: 스크립트 첫 실행(앱 모듈 import + 첫 화면) 시간
+    app_test = AppTest.from_file(TEST_APP, default_timeout=timeout)
+    app_test.query_params["user"] = "bench"
+    app_test.session_state["main_menu_selection"] = MODULES[module]
+    started = time.perf_counter()
+    app_test.run()
+    first_render = time.perf_counter() - started
+    if app_test.exception:
+        raise RuntimeError(app_test.exception[0].message)
+    print(json.dumps({'first_render_ms': round(first_render * 1000, 2), 'elements': count_elements(app_test)}))
+
+
+def bench_cold_start(module, repeat, timeout):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--cold-start-child", module, "--timeout", str(timeout)],
+            capture_output=True, text=True, check=True, cwd=APP_DIR
+        )
+        process_ms = (time.perf_counter() - started) * 1000
+        child = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append((child['first_render_ms'], process_ms, child['elements']))
+    return {
+        'first_render_ms_median': round(statistics.median(t[0] for t in timings), 2),
+        'process_ms_median': round(statistics.median(t[1] for t in timings), 2),
+        'elements': timings[-1][2],
+    }
+
+
+def traced_kb(build):
+    # build() 가 만든 객체가 차지하는 메모리 (KB)
+    tracemalloc.start()
+    built = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return round(size / 1024, 1)
+
+
+def bench_record_memory(size):
+    # 필드 값은 미리 만들어 두고 그릇(dict / 레코드)만 새로 만들어, 한 건당 오버헤드만 비교합니다
+    rng = random.Random(size)
+    today = datetime.now()
+    task_rows = [tuple(task[column] for column in TaskRecord.__slots__) for task in make_tasks(size, today, rng)]
+    reflection_rows = [tuple(record[column] for column in ReflectionRecord.__slots__) for record in make_reflections(size, today, rng).values()]
+    results = []
+    for entity, record_class, rows in (("task", TaskRecord, task_rows), ("reflection", ReflectionRecord, reflection_rows)):
+        columns = record_class.__slots__
+        dict_kb = traced_kb(lambda: [dict(zip(columns, row)) for row in rows])
+        slots_kb = traced_kb(lambda: [record_class(*row) for row in rows])
+        results.append({
+            'entity': entity,
+            'dict_kb': dict_kb,
+            'slots_kb': slots_kb,
+            'saved_pct': round((1 - slots_kb / dict_kb) * 100, 1) if dict_kb else 0.0,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="데이터 크기별 rerun 벤치마크")
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000", help="쉼표로 구분한 데이터 크기 목록")
+    parser.add_argument("--modules", default="mbti," + ",".join(MODULES), help="잴 모듈 (mbti,pomodoro,habits,reflection)")
+    parser.add_argument("--repeat", type=int, default=3, help="크기마다 잴 rerun 횟수")
+    parser.add_argument("--timeout", type=float, default=120, help="rerun 한 번의 최대 시간(초)")
+    parser.add_argument("--output", help="결과를 JSON lines 로 저장할 파일 (기본: 표준 출력)")
+    parser.add_argument("--cold-start", action="store_true", help="탭별 첫 화면까지의 시간을 새 프로세스에서 잽니다")
+    parser.add_argument("--records", action="store_true", help="dict 와 __slots__ 레코드의 메모리를 크기별로 비교합니다")
+    parser.add_argument("--cold-start-child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.cold_start_child:
+        cold_start_child(args.cold_start_child, args.timeout)
+        return
+
+    # 벤치마크 기록이 실제 DB / 공유 캐시에 섞이지 않도록 임시 폴더를 쓰고, 끝나면 지웁니다
+    with tempfile.TemporaryDirectory(prefix="bench_reruns_") as bench_dir:
+        os.environ["ASSISTANT_DB_PATH"] = os.path.join(bench_dir, "bench.db")
+        os.environ["ASSISTANT_SHARED_CACHE_PATH"] = os.path.join(bench_dir, "shared_cache.db")
+        run_benchmarks(args)
+
+
+def run_benchmarks(args):
+    sizes = [int(size) for size in args.sizes.split(",")]
+    modules = args.modules.split(",")
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    common = {'python': platform.python_version(), 'timestamp': datetime.now().isoformat(timespec="seconds")}
+    try:
+        if args.records:
+            for size in sizes:
+                for result in bench_record_memory(size):
+                    out.write(json.dumps({'module': 'records', 'size': size, **result, **common}, ensure_ascii=False) + "\n")
+                    out.flush()
+            return
+        for module in modules:
+            if args.cold_start:
+                if module in MODULES:
+                    result = bench_cold_start(module, args.repeat, args.timeout)
+                    out.write(json.dumps({'module': module, 'cold_start': True, **result, **common}, ensure_ascii=False) + "\n")
+                    out.flush()
+                continue
+            if module == "mbti":
+                results = [(None, bench_mbti(args.repeat, args.timeout))]
+            else:
+                results = ((size, bench_assistant_module(module, size, args.repeat, args.timeout)) for size in sizes)
+            for size, result in results:
+                out.write(json.dumps({'module': module, 'size': size, **result, **common}, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# habit_analytics.py
+# 습관 달성 기록을 습관 × 날짜 행렬로 펼쳐 한 번에 계산하는 분석 함수들
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from habit_store import date_ordinal
+
+
+def habit_snapshot(habits):
+    # 캐시 키로 쓸 수 있는 가벼운 값: ((creation_date, bits), ...)
+    return tuple((h['tracking'].creation_date, h['tracking'].bits) for h in habits)
+
+
+def tracking_matrix(snapshot, today_str):
+    """(달성 행렬, 생성 이후 여부 행렬, 첫 날짜 ordinal) 을 돌려줍니다.
+
+    두 행렬 모두 (습관 수, 첫 생성일부터 오늘까지의 일수) 모양의 bool 배열이에요.
+    """
+    today_ordinal = date_ordinal(today_str)
+    start_ordinals = [date_ordinal(creation_date) for creation_date, _ in snapshot]
+    first_ordinal = min(start_ordinals)
+    n_days = max(0, today_ordinal - first_ordinal + 1)
+
+    done = np.zeros((len(snapshot), n_days), dtype=bool)
+    active = np.zeros((len(snapshot), n_days), dtype=bool)
+    for row, ((_, bits), start_ordinal) in enumerate(zip(snapshot, start_ordinals)):
+        span = today_ordinal - start_ordinal + 1
+        if span <= 0:
+            continue
+        column = start_ordinal - first_ordinal
+        raw = np.frombuffer((bits & ((1 << span) - 1)).to_bytes((span + 7) // 8, 'little'), dtype=np.uint8)
+        done[row, column:] = np.unpackbits(raw, bitorder='little')[:span].astype(bool)
+        active[row, column:] = True
+    return done, active, first_ordinal
+
+
+def habit_trend(snapshot, today_str):
+    """날짜를 index 로 하는 일별 달성률 추이 DataFrame 을 계산합니다.
+
+    습관별 달성률은 화면이 누적 통계(HabitStats)에서 바로 꺼내므로 여기서는 날짜 방향 합계만 구해요.
+    """
+    done, active, first_ordinal = tracking_matrix(snapshot, today_str)
+
+    completed_per_day = done.sum(axis=0)
+    habits_per_day = active.sum(axis=0)
+    daily_rates = np.divide(
+        completed_per_day * 100, habits_per_day,
+        out=np.zeros(len(habits_per_day)), where=habits_per_day > 0
+    )
+    dates = pd.Index([date.fromordinal(first_ordinal + day).isoformat() for day in range(done.shape[1])], name='날짜')
+    trend = pd.DataFrame({
+        '달성률(%)': daily_rates,
+        '성공': completed_per_day,
+        '총 습관': habits_per_day,
+    }, index=dates)
+    return trend
@@ -0,0 +1,211 @@
+# habit_module.py
+# 2. 습관 분석기 모듈 - 탭을 처음 열 때 불러옵니다 (numpy / pandas 분석 코드 포함)
+import streamlit as st
+import profiling
+from datetime import date
+from habit_store import WEEKDAY_NAMES, HabitTracking, date_ordinal
+from records import HabitRecord
+from habit_analytics import habit_snapshot, habit_trend
+from assistant_common import get_storage, get_today_date_str, request_analytics
+
+def init_state():
+    # 이 탭에서 쓰는 세션 상태만 초기화
+    if 'dirty_habit_ids' not in st.session_state:
+        st.session_state.dirty_habit_ids = set()
+    if 'habits' not in st.session_state:
+        st.session_state.habits = [ # HabitRecord: id, name, creation_date, tracking (creation_date 기준 비트셋)
+            HabitRecord(h['id'], h['name'], h['creation_date'], HabitTracking(h['creation_date'], h['bits']))
+            for h in get_storage().load_habits(st.session_state.user_id)
+        ]
+
+def render_habit_rollups(habits, today_ordinal):
+    # 모든 습관의 주 / 월 / 요일별 누적 통계를 합쳐서 보여줍니다 (기록 기간과 상관없이 습관 수 × 기간 수만큼만 계산)
+    def rate(done, active):
+        return round(done / active * 100, 1) if active else 0.0
+
+    week_totals = {}
+    month_totals = {}
+    weekday_done = [0] * 7
+    weekday_active = [0] * 7
+    for habit in habits:
+        tracking = habit['tracking']
+        for week, done, active in tracking.stats.recent_weeks(tracking.start_ordinal, today_ordinal):
+            totals = week_totals.setdefault(week, [0, 0])
+            totals[0] += done
+            totals[1] += active
+        for month, done, active in tracking.stats.recent_months(tracking.start_ordinal, today_ordinal):
+            totals = month_totals.setdefault(month, [0, 0])
+            totals[0] += done
+            totals[1] += active
+        for weekday, active in enumerate(tracking.stats.weekday_days(tracking.start_ordinal, today_ordinal)):
+            weekday_done[weekday] += tracking.stats.by_weekday[weekday]
+            weekday_active[weekday] += active
+
+    st.markdown("##### 📆 주간 / 월간 달성률:")
+    week_column, month_column = st.columns(2)
+    with week_column:
+        st.bar_chart(
+            [{'주 (월요일)': date.fromordinal(week).isoformat(), '달성률(%)': rate(*totals)} for week, totals in sorted(week_totals.items())],
+            x='주 (월요일)', y='달성률(%)'
+        )
+    with month_column:
+        st.bar_chart(
+            [{'월': date.fromordinal(month).strftime("%Y-%m"), '달성률(%)': rate(*totals)} for month, totals in sorted(month_totals.items())],
+            x='월', y='달성률(%)'
+        )
+
+    st.markdown("##### 🗓️ 요일별 달성 패턴:")
+    weekday_rates = [rate(weekday_done[weekday], weekday_active[weekday]) for weekday in range(7)]
+    st.bar_chart(
+        [{'요일': f"{weekday + 1}.{WEEKDAY_NAMES[weekday]}", '달성률(%)': weekday_rates[weekday]} for weekday in range(7)],
+        x='요일', y='달성률(%)'
+    )
+    if sum(weekday_active) >= 14: # 두 주 이상 기록이 쌓였을 때만
+        best_day = max(range(7), key=lambda weekday: weekday_rates[weekday])
+        worst_day = min(range(7), key=lambda weekday: weekday_rates[weekday])
+        if weekday_rates[best_day] > weekday_rates[worst_day]:
+            st.info(f"💪 **`{WEEKDAY_NAMES[best_day]}`요일**에 습관을 가장 잘 지키고, **`{WEEKDAY_NAMES[worst_day]}`요일**엔 자주 쉬어가요. {WEEKDAY_NAMES[worst_day]}요일엔 알림을 맞춰보는 건 어떨까요? ⏰")
+
+# 2. 습관 분석기 모듈
+def habit_analyzer_module():
+    init_state()
+    profiling.section("habits.add")
+    st.markdown("## 💖 습관 파워업! 행동 성향 프로파일러 ✨")
+    st.write("당신의 작은 습관들이 어떻게 큰 변화를 만드는지 기록하고, 숨겨진 당신의 행동 성향을 발견해보세요.")
+    
+    st.markdown("---")
+
+    st.markdown("### ✅ 나의 소중한 습관 관리")
+    habit_name = st.text_input("추가하고 싶은 새로운 습관은 무엇인가요?", key="new_habit_input", placeholder="예: 매일 물 8잔 마시기, 아침 일찍 일어나기")
+    if st.button("➕ 새 습관 추가하기", key="add_habit_button", use_container_width=True):
+        if habit_name:
+            if not any(h['name'] == habit_name for h in st.session_state.habits):
+                new_habit = HabitRecord(
+                    id=None, # 바로 저장해서 SQLite 가 매긴 id 를 받아요 (체크박스 키로 쓰임)
+                    name=habit_name,
+                    creation_date=get_today_date_str(),
+                    tracking=HabitTracking(get_today_date_str())
+                )
+                get_storage().save(st.session_state.user_id, habits=[new_habit])
+                st.session_state.habits.append(new_habit)
+                st.success(f"🌟 '{habit_name}' 습관이 성공적으로 추가되었습니다!")
+            else:
+                st.warning("이런! 이미 같은 이름의 습관이 있어요. 다른 이름을 써볼까요? 🤔")
+        else:
+            st.warning("습관 이름을 입력해주세요. 어떤 좋은 습관을 만들고 싶으신가요? 🌱")
+    
+    st.markdown("---")
+    profiling.section("habits.checkin")
+    st.markdown("### 📅 오늘의 습관 달성 기록하기")
+    today = get_today_date_str()
+    if st.session_state.habits:
+        # 체크박스는 폼 안에 두어 여러 개를 바꿔도 저장 버튼을 누를 때 한 번의 rerun 으로 모아 반영해요
+        # (아래 프로파일 / 통계도 그 rerun 에서 한 번만 다시 계산됨)
+        with st.form("habit_checkin_form", border=False):
+            checked_by_id = {}
+            for habit in st.session_state.habits:
+                # 체크하지 않은 날은 따로 저장하지 않아요 (비트가 0 이면 미달성)
+                checked_by_id[habit['id']] = st.checkbox(
+                    f"**[{habit['name']}]** 오늘 달성했나요?",
+                    value=habit['tracking'].get(today),
+                    key=f"habit_check_{habit['id']}_{today}"
+                )
+            submitted = st.form_submit_button("💾 오늘 달성 기록 저장하기", key="habit_checkin_submit", use_container_width=True)
+
+        if submitted:
+            changed_names = []
+            for habit in st.session_state.habits:
+                checked = checked_by_id[habit['id']]
+                if checked != habit['tracking'].get(today):
+                    habit['tracking'][today] = checked
+                    st.session_state.dirty_habit_ids.add(habit['id'])
+                    changed_names.append(habit['name'])
+            if changed_names:
+                st.success(f"☑️ 습관 `{len(changed_names)}`개의 오늘 기록이 저장되었습니다! ({', '.join(changed_names)})")
+            else:
+                st.info("바뀐 기록이 없어요. 오늘 달성한 습관을 체크해보세요! 🌱")
+    else:
+        st.info("아직 추가된 습관이 없어요. 위에서 첫 번째 습관을 추가해보세요! 🌈")
+
+    st.markdown("---")
+    profiling.section("habits.stats")
+    st.markdown("### ⭐ AI가 분석한 나의 행동 성향 프로파일")
+    if st.session_state.habits:
+        # 달성 일수 / streak 는 체크할 때마다 갱신되는 누적 통계(HabitStats)에서 바로 꺼내요
+        today_ordinal = date_ordinal(today)
+        habit_stats = []
+        for habit in st.session_state.habits:
+            tracking = habit['tracking']
+            total_days_tracked = max(1, today_ordinal - tracking.start_ordinal + 1) # Safety for new habits
+            habit_stats.append({
+                'name': habit['name'], 
+                'completed_days': tracking.stats.completed,
+                'total_days_tracked': total_days_tracked,
+                'rate': tracking.stats.completed / total_days_tracked * 100,
+                'current_streak': tracking.stats.current_streak(today_ordinal),
+                'longest_streak': tracking.stats.longest
+            })
+        
+        habit_stats_sorted = sorted(habit_stats, key=lambda x: x['rate'], reverse=True)
+        st.markdown("##### ✅ 현재 나의 습관별 달성률 현황:")
+        for hs in habit_stats_sorted:
+            st.write(f"- **`{hs['name']}`**: `{hs['rate']:.1f}`% 달성 (`{hs['completed_days']}`/`{hs['total_days_tracked']}`일 기록) · 🔥 연속 `{hs['current_streak']}`일 (최장 `{hs['longest_streak']}`일)")
+
+        profiling.section("habits.profile")
+        st.markdown("##### 💡 AI가 읽어주는 당신의 행동 패턴:")
+        profile_messages = []
+
+        overall_rates = [h['rate'] for h in habit_stats if h['total_days_tracked'] > 1] # Exclude habits created today for avg
+        if overall_rates:
+            avg_rate = sum(overall_rates) / len(overall_rates)
+            if avg_rate > 75:
+                profile_messages.append("✨ **최고의 꾸준함!** 당신은 목표를 향해 흔들림 없이 나아가는 **강력한 의지의 소유자**입니다.")
+            elif avg_rate > 50:
+                profile_messages.append("👍 **성장 중인 노력파!** 꾸준함이 돋보이며, 조금 더 동기 부여된다면 엄청난 잠재력을 발휘할 거예요.")
+            else:
+                profile_messages.append("🌱 **새로운 시작의 씨앗!** 아직은 습관 형성이 낯설지만, 작은 성공부터 쌓아나갈 준비가 되어 있습니다. 응원해요!")
+        
+        best_streak = max(habit_stats, key=lambda x: x['current_streak'])
+        if best_streak['current_streak'] >= 7:
+            profile_messages.append(f"🔥 **불타는 연속 기록!** **`'{best_streak['name']}'`** 습관을 `{best_streak['current_streak']}`일째 이어가고 있어요. 이 흐름을 놓치지 마세요!")
+
+        if habit_stats_sorted and habit_stats_sorted[0]['rate'] > 60:
+            top_habit = habit_stats_sorted[0]
+            profile_messages.append(f"👑 특히 **`'{top_habit['name']}'`** 습관에서 압도적인 성과를 보여, 이 분야에 대한 **남다른 열정과 집중력**이 있음을 알 수 있습니다.")
+            
+        # Specific habits -> personality traits
+        if any(h['name'].lower() in ['운동', 'exercise', '걷기', '달리기', '산책'] and h['rate'] > 70 for h in habit_stats):
+            profile_messages.append("🏃‍♀️ **에너지 넘치는 활동가!** 꾸준한 운동 습관은 당신이 얼마나 **활기차고 긍정적인지**를 보여줍니다.")
+        if any(h['name'].lower() in ['독서', 'reading', '공부', '학습'] and h['rate'] > 70 for h in habit_stats):
+            profile_messages.append("📚 **지식 탐구형 인재!** 독서를 통해 끊임없이 배우고 성장하려는 **지적인 호기심**이 뛰어납니다.")
+        if any(h['name'].lower() in ['일기쓰기', '명상', '자기전 회고'] and h['rate'] > 70 for h in habit_stats):
+            profile_messages.append("🧘‍♀️ **자기 성찰가!** 내면의 소리에 귀 기울이며 자신을 이해하고 발전시키려는 **현명한 태도**가 돋보입니다.")
+
+        if profile_messages:
+            for msg in profile_messages:
+                st.success(msg)
+        else:
+            st.info("아직 분석할 데이터가 부족하거나, 특별한 성향 패턴을 발견하지 못했습니다. 더 많은 습관을 기록하고 당신을 발견해보세요! 🔍")
+        
+        profiling.section("habits.rollups")
+        render_habit_rollups(st.session_state.habits, today_ordinal)
+
+        profiling.section("habits.trend")
+        st.markdown("##### 📈 일별 습관 달성률 변화 추이:")
+        # 습관 × 날짜 행렬에서 일별 추이를 계산 (기록 기간에 비례하는 일이라 스레드 풀에서, 체크가 바뀔 때만 다시)
+        snapshot = habit_snapshot(st.session_state.habits) # 체크가 바뀌면 달라지는 데이터 버전
+        # 이름이 예전 (습관별 달성률, 추이) 결과와 다르게 해서, 다른 프로세스와 함께 쓰는 캐시의 옛 결과를 받지 않아요
+        daily_trend, fresh = request_analytics("habit_daily_trend", (snapshot, today), habit_trend, snapshot, today)
+        if daily_trend is None:
+            st.info("📊 달성률 추이를 계산하고 있어요... 잠시만 기다려주세요! ⏳")
+            return
+        if not fresh:
+            st.caption("🔄 방금 바뀐 기록으로 추이를 다시 계산하고 있어요. 아래는 직전 결과예요.")
+        if not daily_trend.empty:
+            st.line_chart(daily_trend['달성률(%)'])
+            with st.expander("🗓️ 날짜별 자세히 보기"):
+                st.dataframe(daily_trend.iloc[::-1])
+        else:
+            st.info("달성률 추이를 볼 데이터가 아직 부족합니다. 습관을 꾸준히 기록해주세요! 🗓️")
+    else:
+        st.info("습관 분석을 위해 먼저 습관을 추가하고 매일 기록해주세요. 당신의 잠재력을 깨울 시간! 💖")
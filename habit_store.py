@@ -0,0 +1,232 @@
+# habit_store.py
+# 습관 분석기의 달성 기록 저장소
+import bisect
+from datetime import date
+
+WEEKDAY_NAMES = ("월", "화", "수", "목", "금", "토", "일")
+
+
+def date_ordinal(date_str):
+    return date.fromisoformat(date_str).toordinal()
+
+
+def weekday_of(ordinal):
+    # 월요일 = 0 (date(1, 1, 1) 이 월요일)
+    return (ordinal - 1) % 7
+
+
+def week_start(ordinal):
+    return ordinal - weekday_of(ordinal)
+
+
+def month_start(ordinal):
+    return date.fromordinal(ordinal).replace(day=1).toordinal()
+
+
+def next_month_start(ordinal):
+    day = date.fromordinal(ordinal)
+    return (date(day.year + 1, 1, 1) if day.month == 12 else date(day.year, day.month + 1, 1)).toordinal()
+
+
+def overlap_days(start, end, first, last):
+    # [start, end] 와 [first, last] 가 겹치는 일수
+    return max(0, min(end, last) - max(start, first) + 1)
+
+
+class HabitStats:
+    """습관 하나의 누적 통계: 달성 일수, 연속 달성 구간, 주/월/요일별 달성 수.
+
+    처음 한 번 비트셋에서 만든 뒤에는 하루의 달성 여부가 바뀔 때마다 apply() 로
+    그 하루만큼만 고칩니다. 연속 달성 구간(run)은 시작일 <-> 마지막 날로 들고
+    있어서 현재 / 최장 streak 도 기록을 다시 훑지 않고 바로 꺼낼 수 있어요.
+    주 / 월 / 요일 통계는 모두 ordinal(날짜 정수)을 키로 씁니다.
+    """
+
+    __slots__ = ('completed', 'by_week', 'by_month', 'by_weekday', 'longest',
+                 '_starts', '_end_of', '_start_of', '_run_lengths')
+
+    def __init__(self):
+        self.completed = 0
+        self.by_week = {}         # 그 주 월요일 ordinal -> 달성 일수
+        self.by_month = {}        # 그 달 1일 ordinal -> 달성 일수
+        self.by_weekday = [0] * 7 # 월 ~ 일 -> 달성 일수
+        self.longest = 0
+        self._starts = []         # run 시작 ordinal (정렬됨)
+        self._end_of = {}         # run 시작 -> 마지막 날
+        self._start_of = {}       # run 마지막 날 -> 시작
+        self._run_lengths = {}    # run 길이 -> 개수 (최장 run 이 사라질 때 다음 최장을 찾는 용도)
+
+    @classmethod
+    def from_bits(cls, start_ordinal, bits):
+        stats = cls()
+        day = 0
+        while bits:
+            zeros = (bits & -bits).bit_length() - 1 # 다음 run 까지 건너뛸 미달성 일수
+            bits >>= zeros
+            day += zeros
+            ones = (~bits & (bits + 1)).bit_length() - 1 # 이어진 달성 일수
+            first = start_ordinal + day
+            stats._add_run(first, first + ones - 1)
+            for ordinal in range(first, first + ones):
+                stats._count(ordinal, 1)
+            bits >>= ones
+            day += ones
+        return stats
+
+    # --- 갱신 ---
+    def apply(self, ordinal, completed):
+        # 하루의 달성 여부가 실제로 바뀌었을 때만 부릅니다
+        self._count(ordinal, 1 if completed else -1)
+        if completed:
+            start = self._start_of.get(ordinal - 1, ordinal)
+            end = self._end_of.get(ordinal + 1, ordinal)
+            if start < ordinal:
+                self._remove_run(start, ordinal - 1)
+            if end > ordinal:
+                self._remove_run(ordinal + 1, end)
+            self._add_run(start, end)
+        else:
+            start = self._starts[bisect.bisect_right(self._starts, ordinal) - 1]
+            end = self._end_of[start]
+            self._remove_run(start, end)
+            if start < ordinal:
+                self._add_run(start, ordinal - 1)
+            if end > ordinal:
+                self._add_run(ordinal + 1, end)
+
+    def _count(self, ordinal, delta):
+        self.completed += delta
+        week = week_start(ordinal)
+        self.by_week[week] = self.by_week.get(week, 0) + delta
+        month = month_start(ordinal)
+        self.by_month[month] = self.by_month.get(month, 0) + delta
+        self.by_weekday[weekday_of(ordinal)] += delta
+
+    def _add_run(self, start, end):
+        bisect.insort(self._starts, start)
+        self._end_of[start] = end
+        self._start_of[end] = start
+        length = end - start + 1
+        self._run_lengths[length] = self._run_lengths.get(length, 0) + 1
+        self.longest = max(self.longest, length)
+
+    def _remove_run(self, start, end):
+        del self._starts[bisect.bisect_left(self._starts, start)]
+        del self._end_of[start]
+        del self._start_of[end]
+        length = end - start + 1
+        self._run_lengths[length] -= 1
+        if not self._run_lengths[length]:
+            del self._run_lengths[length]
+            if length == self.longest:
+                self.longest = max(self._run_lengths, default=0)
+
+    # --- 조회 ---
+    def current_streak(self, today_ordinal):
+        # 오늘(아직 체크 전이면 어제)까지 끊기지 않고 이어진 달성 일수
+        for day in (today_ordinal, today_ordinal - 1):
+            index = bisect.bisect_right(self._starts, day) - 1
+            if index >= 0 and self._end_of[self._starts[index]] >= day:
+                return day - self._starts[index] + 1
+        return 0
+
+    def recent_weeks(self, creation_ordinal, today_ordinal, count=8):
+        # 최근 count 주의 (그 주 월요일 ordinal, 달성 일수, 기록한 일수). 오래된 주부터
+        first_week = week_start(today_ordinal) - 7 * (count - 1)
+        return [
+            (week, self.by_week.get(week, 0), overlap_days(week, week + 6, creation_ordinal, today_ordinal))
+            for week in range(first_week, first_week + 7 * count, 7)
+        ]
+
+    def recent_months(self, creation_ordinal, today_ordinal, count=6):
+        # 최근 count 달의 (그 달 1일 ordinal, 달성 일수, 기록한 일수). 오래된 달부터
+        months = [month_start(today_ordinal)]
+        while len(months) < count:
+            months.append(month_start(months[-1] - 1))
+        return [
+            (month, self.by_month.get(month, 0), overlap_days(month, next_month_start(month) - 1, creation_ordinal, today_ordinal))
+            for month in reversed(months)
+        ]
+
+    def weekday_days(self, creation_ordinal, today_ordinal):
+        # 생성일부터 오늘까지 요일별 날짜 수 (요일별 달성률의 분모)
+        total = max(0, today_ordinal - creation_ordinal + 1)
+        full_weeks, extra = divmod(total, 7)
+        first_weekday = weekday_of(creation_ordinal)
+        return [full_weeks + ((weekday - first_weekday) % 7 < extra) for weekday in range(7)]
+
+
+class HabitTracking:
+    """습관 하나의 날짜별 달성 기록.
+
+    {'YYYY-MM-DD': bool} dict 대신, creation_date 로부터 며칠째인지를 비트 위치로
+    쓰는 정수 비트셋 하나에 기록합니다. 기록하지 않은 날은 따로 저장하지 않고
+    False 로 봅니다. 달성 일수 / streak / 주·월·요일 통계는 stats(HabitStats)가
+    처음 쓰일 때 한 번 만들어지고, 그 뒤로는 날짜를 체크할 때마다 그 하루만 갱신돼요.
+    """
+
+    __slots__ = ('creation_date', 'start_ordinal', 'bits', '_stats')
+
+    def __init__(self, creation_date, bits=0):
+        self.creation_date = creation_date
+        self.start_ordinal = date_ordinal(creation_date)
+        self.bits = bits # i 번째 비트 = creation_date + i 일의 달성 여부
+        self._stats = None
+
+    @property
+    def stats(self):
+        if self._stats is None:
+            self._stats = HabitStats.from_bits(self.start_ordinal, self.bits)
+        return self._stats
+
+    @classmethod
+    def from_dict(cls, creation_date, tracking):
+        # 예전 {'YYYY-MM-DD': bool} 형식의 기록을 옮겨올 때 사용
+        habit_tracking = cls(creation_date)
+        for date_str, completed in tracking.items():
+            if completed:
+                habit_tracking[date_str] = True
+        return habit_tracking
+
+    def offset(self, date_str):
+        return date_ordinal(date_str) - self.start_ordinal
+
+    # --- 기존 dict 처럼 쓸 수 있도록 ---
+    def get(self, date_str, default=False):
+        day = self.offset(date_str)
+        if day < 0:
+            return default
+        return bool(self.bits >> day & 1)
+
+    def __getitem__(self, date_str):
+        return self.get(date_str)
+
+    def __setitem__(self, date_str, completed):
+        day = self.offset(date_str)
+        if day < 0:
+            raise ValueError(f"{date_str} is before the habit creation date {self.creation_date}")
+        if bool(self.bits >> day & 1) == bool(completed):
+            return
+        self.bits ^= 1 << day
+        if self._stats is not None:
+            self._stats.apply(self.start_ordinal + day, bool(completed))
+
+    def items(self):
+        # 생성일부터 마지막으로 달성한 날까지 (date_str, bool)
+        for day in range(self.bits.bit_length()):
+            yield date.fromordinal(self.start_ordinal + day).isoformat(), bool(self.bits >> day & 1)
+
+    # --- 통계 ---
+    def days_since_creation(self, today_str):
+        # 생성일 당일을 1일째로 셉니다
+        return self.offset(today_str) + 1
+
+    def completed_days(self):
+        return self.stats.completed
+
+    def current_streak(self, today_str):
+        # 오늘(아직 체크 전이면 어제)까지 끊기지 않고 이어진 달성 일수
+        return self.stats.current_streak(date_ordinal(today_str))
+
+    def longest_streak(self):
+        return self.stats.longest
@@ -0,0 +1,229 @@
+# history_io.py
+# 사용자 기록(집중 작업 / 습관 / 회고)을 JSON lines 또는 CSV 로 내보내고 가져오기
+#
+# 두 형식 모두 한 줄(행)이 기록 하나이고, kind 로 종류를 구분합니다:
+#   task        집중 세션 작업 한 건
+#   habit       습관 하나 (name, creation_date)
+#   habit_day   습관을 달성한 하루 (name, date)
+#   reflection  하루치 회고
+# 내보내기와 가져오기 모두 한 줄씩 흘려보내므로 몇 년치 기록도 파일 전체를 메모리에 올리지 않아요.
+# (단, 앱의 내려받기 버튼은 Streamlit 이 완성된 파일을 메모리에 한 번 들고 내려줘요. test.py 참고)
+import collections
+import csv
+import io
+import json
+from datetime import date
+
+from habit_store import HabitTracking, date_ordinal
+from records import HabitRecord, ReflectionRecord, TaskRecord
+from storage import task_occurrences
+
+FORMATS = ("jsonl", "csv")
+KINDS = ("task", "habit", "habit_day", "reflection")
+BATCH_SIZE = 1000
+MAX_ERRORS = 20 # 보고서에 남길 잘못된 줄 메시지 수
+
+TASK_FIELDS = TaskRecord.__slots__[1:] # id 는 가져올 때 새로 매겨요
+CSV_COLUMNS = (
+    'kind', 'date', 'name', 'creation_date',
+    'complexity_level', 'focus_duration_minutes', 'break_duration_minutes', 'logged_focus_minutes', 'feedback',
+    *ReflectionRecord.__slots__,
+)
+
+
+# --- 내보내기 ---
+def iter_export_rows(storage, user_id):
+    for task in storage.iter_tasks(user_id, BATCH_SIZE):
+        yield {'kind': 'task', **{field: task[field] for field in TASK_FIELDS}}
+    for habit in storage.load_habits(user_id):
+        yield {'kind': 'habit', 'name': habit['name'], 'creation_date': habit['creation_date']}
+        for date_str, completed in HabitTracking(habit['creation_date'], habit['bits']).items():
+            if completed:
+                yield {'kind': 'habit_day', 'name': habit['name'], 'date': date_str}
+    for date_str, reflection in storage.iter_reflections(user_id, BATCH_SIZE):
+        yield {'kind': 'reflection', 'date': date_str, **reflection.to_dict()}
+
+
+def export_lines(storage, user_id, fmt="jsonl"):
+    # 내보낼 파일의 줄을 하나씩 돌려줍니다
+    rows = iter_export_rows(storage, user_id)
+    if fmt == "jsonl":
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+# --- 읽기 / 검사 ---
+def parse_lines(lines, fmt="jsonl"):
+    # 파일의 줄을 (줄 번호, dict) 로 하나씩. 읽을 수 없는 줄은 (줄 번호, None)
+    if fmt == "jsonl":
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_no, row if isinstance(row, dict) else None
+        return
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _optional(row, field):
+    value = row.get(field)
+    return None if value is None or value == "" else value
+
+
+def _text(row, field):
+    value = _optional(row, field)
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"'{field}' 값이 비어 있어요")
+    return value
+
+
+def _date(row, field):
+    value = _text(row, field)
+    try:
+        if len(value) == 10:
+            date.fromisoformat(value)
+            return value
+    except ValueError:
+        pass
+    raise ValueError(f"'{field}' 가 YYYY-MM-DD 형식이 아니에요 ({value!r})")
+
+
+def _minutes(row, field):
+    value = row.get(field)
+    try:
+        minutes = int(value)
+    except (TypeError, ValueError):
+        minutes = -1
+    if isinstance(value, (bool, float)) or minutes < 0:
+        raise ValueError(f"'{field}' 는 0 이상의 정수여야 해요 ({value!r})")
+    return minutes
+
+
+def _score(row, field):
+    value = _optional(row, field)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{field}' 는 숫자여야 해요 ({value!r})") from None
+
+
+def validate_task(row):
+    return TaskRecord(
+        None, _text(row, 'name'), _text(row, 'complexity_level'),
+        _minutes(row, 'focus_duration_minutes'), _minutes(row, 'break_duration_minutes'), _minutes(row, 'logged_focus_minutes'),
+        _optional(row, 'feedback'), _date(row, 'date'),
+    )
+
+
+def validate_reflection(row):
+    return _date(row, 'date'), ReflectionRecord(
+        _text(row, 'q1'), _text(row, 'q2'), _text(row, 'q3'), _text(row, 'summary'), _text(row, 'sentiment_level'),
+        _score(row, 'sentiment_score'), _optional(row, 'lexicon_version'),
+    )
+
+
+# --- 가져오기 ---
+def import_lines(storage, user_id, lines, fmt="jsonl"):
+    """파일의 줄을 읽어 user_id 의 기록에 더하고, 종류별 결과 보고서(dict)를 돌려줍니다.
+
+    작업과 회고는 BATCH_SIZE 개씩 한 트랜잭션으로 넣어요. 진행 중인 작업은
+    (name, date), 회고는 날짜가 이미 있으면 건너뜁니다. 완료한 작업은 똑같은
+    작업이 파일에 있는 개수만큼 저장소에 있도록 모자란 것만 넣어서, 같은 날
+    똑같은 세션 두 번도 두 줄로 남고 같은 파일을 다시 가져와도 늘지 않아요
+    (이를 위해 완료 작업의 (날짜, 이름, 피드백, 집중 시간)별 개수는 끝까지 들고 있어요).
+    습관은 이름이 같으면 달성한 날을 합칩니다. 잘못된 줄은 건너뛰고 보고서에 줄 번호를 남겨요.
+    """
+    report = {
+        'valid': dict.fromkeys(KINDS, 0),
+        'inserted': dict.fromkeys(KINDS, 0),
+        'invalid': 0,
+        'errors': [],
+    }
+    tasks = []
+    task_seen = collections.Counter() # 완료 작업 키 -> 파일에서 나온 횟수
+    reflections = []
+    habit_creation = {} # name -> 파일에 적힌 가장 이른 creation_date
+    habit_days = {}     # name -> {달성한 날짜}
+
+    def flush():
+        if tasks:
+            report['inserted']['task'] += storage.insert_new_tasks(user_id, tasks, task_occurrences(tasks, task_seen))
+            tasks.clear()
+        if reflections:
+            report['inserted']['reflection'] += storage.insert_new_reflections(user_id, reflections)
+            reflections.clear()
+
+    for line_no, row in parse_lines(lines, fmt):
+        try:
+            if row is None:
+                raise ValueError("읽을 수 없는 줄이에요")
+            kind = row.get('kind')
+            if kind == 'task':
+                tasks.append(validate_task(row))
+            elif kind == 'reflection':
+                reflections.append(validate_reflection(row))
+            elif kind == 'habit':
+                name, creation_date = _text(row, 'name'), _date(row, 'creation_date')
+                habit_creation[name] = min(habit_creation.get(name, creation_date), creation_date)
+            elif kind == 'habit_day':
+                habit_days.setdefault(_text(row, 'name'), set()).add(_date(row, 'date'))
+            else:
+                raise ValueError(f"알 수 없는 kind 예요 ({kind!r})")
+        except ValueError as error:
+            report['invalid'] += 1
+            if len(report['errors']) < MAX_ERRORS:
+                report['errors'].append(f"{line_no}번째 줄: {error}")
+            continue
+        report['valid'][kind] += 1
+        if len(tasks) >= BATCH_SIZE or len(reflections) >= BATCH_SIZE:
+            flush()
+    flush()
+    merge_habits(storage, user_id, habit_creation, habit_days, report)
+    report['duplicates'] = {kind: report['valid'][kind] - report['inserted'][kind] for kind in KINDS}
+    return report
+
+
+def merge_habits(storage, user_id, habit_creation, habit_days, report):
+    # 같은 이름의 습관이 있으면 생성일을 더 이른 쪽으로 맞추고 달성한 날을 합칩니다
+    existing = {habit['name']: habit for habit in storage.load_habits(user_id)}
+    changed = []
+    for name in sorted(habit_creation.keys() | habit_days.keys()):
+        days = habit_days.get(name, ())
+        candidates = [day for day in (habit_creation.get(name), min(days, default=None)) if day is not None]
+        habit = existing.get(name)
+        if habit is not None:
+            candidates.append(habit['creation_date'])
+        creation_date = min(candidates)
+        old_bits = 0
+        if habit is None:
+            habit_id = None # 저장할 때 SQLite 가 매겨요
+            if name in habit_creation:
+                report['inserted']['habit'] += 1
+        else:
+            habit_id = habit['id']
+            old_bits = habit['bits'] << (date_ordinal(habit['creation_date']) - date_ordinal(creation_date))
+        tracking = HabitTracking(creation_date, old_bits)
+        for day in days:
+            tracking[day] = True
+        report['inserted']['habit_day'] += tracking.completed_days() - old_bits.bit_count()
+        if habit is None or tracking.bits != habit['bits'] or creation_date != habit['creation_date']:
+            changed.append(HabitRecord(habit_id, name, creation_date, tracking))
+    storage.save(user_id, habits=changed)
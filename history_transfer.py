@@ -0,0 +1,63 @@
+# history_transfer.py
+# 한 사용자의 기록을 파일로 내보내거나 파일에서 가져오는 일괄 작업 (백업 / 다른 서버로 옮기기)
+#
+#   python history_transfer.py export USER_ID [--format jsonl|csv] [--output FILE] [--db DB 경로]
+#   python history_transfer.py import USER_ID FILE [--format jsonl|csv] [--db DB 경로]
+#
+# 형식을 주지 않으면 파일 확장자(.csv)로 고릅니다. 가져온 기록은 그 사용자가 앱을 새로 열 때 보여요.
+import argparse
+import os
+import sys
+import time
+
+from history_io import FORMATS, export_lines, import_lines
+from storage import Storage
+
+
+def guess_format(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path and path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="사용자 기록 내보내기 / 가져오기")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("user_id")
+    parser.add_argument("file", nargs="?", help="가져올 파일 (import)")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--output", help="내보낼 파일 (기본: 표준 출력)")
+    parser.add_argument("--db", default=os.environ.get("ASSISTANT_DB_PATH", "assistant_data.db"))
+    args = parser.parse_args(argv)
+
+    storage = Storage(args.db)
+    started = time.perf_counter()
+    try:
+        if args.command == "export":
+            fmt = guess_format(args.output, args.format)
+            out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+            try:
+                out.writelines(export_lines(storage, args.user_id, fmt))
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            print(f"exported {args.user_id} as {fmt} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+            return
+
+        if not args.file:
+            parser.error("import needs a FILE")
+        fmt = guess_format(args.file, args.format)
+        with open(args.file, encoding="utf-8-sig", newline="") as lines:
+            report = import_lines(storage, args.user_id, lines, fmt)
+        elapsed = time.perf_counter() - started
+        for kind, inserted in report['inserted'].items():
+            print(f"  {kind}: {inserted} imported, {report['duplicates'][kind]} duplicates skipped")
+        for error in report['errors']:
+            print(f"  invalid: {error}")
+        print(f"imported {sum(report['valid'].values())} valid rows ({report['invalid']} invalid) into {args.user_id} in {elapsed:.2f}s")
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# history_view.py
+# 이력 화면들이 함께 쓰는 조회 기간 선택 / 페이지 나눈 표 위젯
+# 저장소나 분석 코드를 불러오지 않아서 운영자 대시보드(operator_dashboard.py)도 가볍게 가져다 써요
+import streamlit as st
+from datetime import datetime, timedelta
+
+HISTORY_PAGE_SIZE = 20 # 이력 표에 한 번에 보여줄 기록 수
+
+def iter_date_strs(start_date, end_date):
+    # 조회 기간의 날짜 문자열을 최신 날짜부터 돌려줍니다
+    current = end_date
+    while current >= start_date:
+        yield current.strftime("%Y-%m-%d")
+        current -= timedelta(days=1)
+
+def select_history_date_range(key, default_days=30):
+    today_obj = datetime.now().date()
+    selected_range = st.date_input(
+        "📆 조회 기간",
+        value=(today_obj - timedelta(days=default_days - 1), today_obj),
+        key=key
+    )
+    if isinstance(selected_range, (tuple, list)):
+        if len(selected_range) == 2:
+            return selected_range[0], selected_range[1]
+        if len(selected_range) == 1: # 시작일만 고른 상태
+            return selected_range[0], selected_range[0]
+        return today_obj, today_obj
+    return selected_range, selected_range
+
+def render_history_page(records, make_row, key):
+    # 조회된 기록 중 현재 페이지만 표로 만들어 한 번에 보냅니다 (기록이 많아도 전송량은 일정)
+    total_pages = max(1, (len(records) + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE)
+    page = st.number_input("페이지", min_value=1, max_value=total_pages, value=1, step=1, key=key)
+    start = (page - 1) * HISTORY_PAGE_SIZE
+    page_records = records[start:start + HISTORY_PAGE_SIZE]
+    st.dataframe([make_row(record) for record in page_records], hide_index=True)
+    st.caption(f"총 `{len(records)}`개 기록 중 `{start + 1}`~`{start + len(page_records)}`번째 (페이지 {page}/{total_pages})")
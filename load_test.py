@@ -0,0 +1,345 @@
+# load_test.py
+# 두 앱(main.py, test.py)을 실제 streamlit 서버로 띄우고, 웹소켓으로 여러 세션을 동시에 흉내 내는 부하 테스트
+#
+#   python load_test.py [--apps mbti,assistant] [--sessions 200] [--rounds 3] [--think 0.5,1.5] [--output results.jsonl]
+#
+# 세션마다 브라우저가 하듯 BackMsg.rerun_script 에 위젯 값을 담아 보내고, script_finished 가
+# 올 때까지의 시간을 rerun 지연으로 잽니다. (st.rerun() 으로 이어지는 재실행은 끝까지 기다려요)
+#   mbti       MBTI 유형 고르기 -> 결과 보기
+#   assistant  작업 추가 -> 집중 시작 -> 중지, 습관 추가 -> 모두 체크 후 저장, 회고 작성 -> 제출
+# 앱마다 동작별 / 전체 p50·p95·p99 지연과 서버 프로세스의 최대 스레드 수, 최대 RSS 를 JSON 한 줄로 출력합니다.
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APPS = {
+    "mbti": os.path.join(APP_DIR, "main.py"),
+    "assistant": os.path.join(APP_DIR, "test.py"),
+}
+MBTI_TYPES = ["ISTJ", "ISFJ", "INFJ", "INTJ", "ISTP", "ISFP", "INFP", "INTP",
+              "ESTP", "ESFP", "ENFP", "ENTP", "ESTJ", "ESFJ", "ENFJ", "ENTJ"]
+SAMPLE_ANSWERS = ["친구와 즐거웠다", "새로운 코딩 방법을 배웠다", "조금 피곤했다", "발표가 어렵지 않았다", "산책하며 행복했다"]
+SAMPLE_INTERVAL = 0.2 # 서버 스레드 수 / RSS 를 읽는 간격(초)
+
+
+# --- 서버 ---
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app_path, port, db_path):
+    command = [
+        sys.executable, "-m", "streamlit", "run", app_path,
+        "--server.port", str(port), "--server.address", "127.0.0.1", "--server.headless", "true",
+        "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+    ]
+    shared_cache_path = os.path.join(os.path.dirname(db_path), "shared_cache.db")
+    env = dict(os.environ, ASSISTANT_DB_PATH=db_path, ASSISTANT_SHARED_CACHE_PATH=shared_cache_path)
+    return subprocess.Popen(command, cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def wait_until_healthy(server, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited early: {server.stderr.read().decode(errors='replace')}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server did not become healthy within {timeout}s")
+
+
+def read_process_usage(pid):
+    # (스레드 수, RSS KB). /proc 이 없는 OS 에서는 (None, None)
+    usage = {}
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("Threads", "VmRSS"):
+                    usage[name] = int(value.split()[0])
+    except OSError:
+        return None, None
+    return usage.get("Threads"), usage.get("VmRSS")
+
+
+async def sample_process(pid, samples, stop):
+    while not stop.is_set():
+        threads, rss_kb = read_process_usage(pid)
+        if threads is not None:
+            samples.append((threads, rss_kb))
+        try:
+            await asyncio.wait_for(stop.wait(), SAMPLE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+# --- 세션 하나 (브라우저 흉내) ---
+class LoadSession:
+    """웹소켓 하나로 앱에 붙은 가짜 브라우저.
+
+    마지막 실행에서 받은 화면 요소의 위젯 id 를 key(또는 label)로 기억해 두고, 다음 rerun 마다
+    지금까지의 위젯 값을 모두 담아 보냅니다. 버튼(trigger)은 누른 그 rerun 에만 보내요.
+    """
+
+    def __init__(self, port, user_id, latencies, errors):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.query_string = f"user={user_id}"
+        self.latencies = latencies # 동작 이름 -> [초]
+        self.errors = errors
+        self.widgets = {} # key 또는 label -> 위젯 id
+        self.values = {}  # 위젯 id -> WidgetState (값을 바꾼 위젯만)
+        self.ws = None
+
+    async def open(self):
+        self.ws = await connect(self.url, subprotocols=["streamlit"], max_size=None, open_timeout=60)
+        await self.rerun("load")
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def has(self, name):
+        return name in self.widgets
+
+    def find_all(self, prefix):
+        return [name for name in self.widgets if name.startswith(prefix)]
+
+    def set_value(self, name, field, value):
+        state = WidgetState(id=self.widgets[name])
+        setattr(state, field, value)
+        self.values[state.id] = state
+
+    async def click(self, action, name):
+        await self.rerun(action, WidgetState(id=self.widgets[name], trigger_value=True))
+
+    async def rerun(self, action, trigger=None):
+        message = BackMsg()
+        message.rerun_script.query_string = self.query_string
+        message.rerun_script.page_script_hash = ""
+        states = [state for widget_id, state in self.values.items() if trigger is None or widget_id != trigger.id]
+        if trigger is not None:
+            states.append(trigger)
+        message.rerun_script.widget_states.widgets.extend(states)
+        self.widgets = {} # 이번 실행에서 그려진 위젯만 남도록 새로 모아요
+        started = time.perf_counter()
+        await self.ws.send(message.SerializeToString())
+        await self.read_until_finished()
+        self.latencies.setdefault(action, []).append(time.perf_counter() - started)
+
+    async def read_until_finished(self):
+        async for data in self.ws:
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                self.remember(forward.delta.new_element)
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    self.widgets = {}
+                    continue # st.rerun() 뒤의 재실행까지 기다려요
+                return
+        raise ConnectionError("websocket closed before the script finished")
+
+    def remember(self, element):
+        element_type = element.WhichOneof("type")
+        proto = getattr(element, element_type)
+        if element_type == "exception":
+            self.errors.append(proto.message)
+            return
+        widget_id = getattr(proto, "id", "")
+        if not widget_id or not widget_id.startswith("$$ID-"):
+            return
+        user_key = widget_id.split("-", 2)[2]
+        self.widgets[user_key if user_key != "None" else proto.label] = widget_id
+
+
+# --- 시나리오 ---
+async def think(think_range, rng):
+    await asyncio.sleep(rng.uniform(*think_range))
+
+
+async def mbti_scenario(session, rounds, think_range, rng):
+    for _ in range(rounds):
+        await think(think_range, rng)
+        session.set_value("🔮 당신의 MBTI를 선택하세요", "string_value", rng.choice(MBTI_TYPES))
+        await session.rerun("select_type")
+        await think(think_range, rng)
+        await session.click("show_result", "🌟 결과 보기 🌟")
+
+
+async def choose_tab(session, label):
+    session.set_value("main_menu_selection", "string_value", label)
+    await session.rerun("switch_tab")
+
+
+async def assistant_scenario(session, rounds, think_range, rng):
+    for round_no in range(rounds):
+        # 집중 타이머: 작업 추가 -> 시작 -> 중지
+        await think(think_range, rng)
+        await choose_tab(session, "🧠 집중 타이머")
+        if session.has("pomodoro_task_input"):
+            session.set_value("pomodoro_task_input", "string_value", f"부하 작업 {round_no}")
+            await session.click("add_task", "add_task_button")
+        if session.has("start_pomodoro"):
+            await think(think_range, rng)
+            await session.click("start_pomodoro", "start_pomodoro")
+        if session.has("stop_pomodoro"):
+            await think(think_range, rng)
+            await session.click("stop_pomodoro", "stop_pomodoro")
+
+        # 습관: 추가 -> 오늘 체크한 뒤 폼 저장 (체크 여러 개가 한 번의 rerun 으로 반영)
+        await think(think_range, rng)
+        await choose_tab(session, "💖 습관 분석기")
+        session.set_value("new_habit_input", "string_value", f"부하 습관 {round_no}")
+        await session.click("add_habit", "add_habit_button")
+        habit_keys = session.find_all("habit_check_")
+        if habit_keys:
+            await think(think_range, rng)
+            for habit_key in habit_keys:
+                checked = session.values.get(session.widgets[habit_key])
+                session.set_value(habit_key, "bool_value", not (checked and checked.bool_value))
+            await session.click("save_habits", "habit_checkin_submit")
+
+        # 회고: 오늘 회고가 아직 없을 때만 작성 -> 제출
+        await think(think_range, rng)
+        await choose_tab(session, "🌙 자기전 회고")
+        if session.has("submit_reflection"):
+            for key in ("reflect_q1", "reflect_q2", "reflect_q3"):
+                session.set_value(key, "string_value", rng.choice(SAMPLE_ANSWERS))
+            await session.click("submit_reflection", "submit_reflection")
+
+
+SCENARIOS = {
+    "mbti": mbti_scenario,
+    "assistant": assistant_scenario,
+}
+
+
+async def run_session(app, port, index, args, latencies, errors):
+    rng = random.Random(index)
+    await asyncio.sleep(rng.uniform(0, args.ramp_up)) # 한꺼번에 몰리지 않게 조금씩 접속
+    session = LoadSession(port, f"load{index}", latencies, errors)
+    try:
+        await session.open()
+        await SCENARIOS[app](session, args.rounds, args.think, rng)
+    except (OSError, ConnectionError, KeyError, asyncio.TimeoutError) as error:
+        errors.append(f"session {index}: {type(error).__name__}: {error}")
+    finally:
+        await session.close()
+
+
+# --- 결과 ---
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(timings):
+    return {
+        'count': len(timings),
+        'p50_ms': round(percentile(timings, 50) * 1000, 1),
+        'p95_ms': round(percentile(timings, 95) * 1000, 1),
+        'p99_ms': round(percentile(timings, 99) * 1000, 1),
+        'max_ms': round(max(timings) * 1000, 1),
+    }
+
+
+async def load_app(app, args):
+    port = args.port or free_port()
+    db_path = os.path.join(tempfile.mkdtemp(prefix="load_test_"), "load.db") # 실제 DB / 공유 캐시에 섞이지 않게
+    server = start_server(APPS[app], port, db_path)
+    latencies = {}
+    errors = []
+    samples = []
+    try:
+        wait_until_healthy(server, port, args.startup_timeout)
+        idle_threads, idle_rss_kb = read_process_usage(server.pid)
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_process(server.pid, samples, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(run_session(app, port, index, args, latencies, errors) for index in range(args.sessions)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    all_timings = [t for timings in latencies.values() for t in timings]
+    return {
+        'app': app,
+        'sessions': args.sessions,
+        'rounds': args.rounds,
+        'duration_s': round(elapsed, 1),
+        'reruns_per_s': round(len(all_timings) / elapsed, 1) if elapsed else 0.0,
+        'overall': summarize(all_timings) if all_timings else None,
+        'actions': {action: summarize(timings) for action, timings in sorted(latencies.items())},
+        'idle_threads': idle_threads,
+        'max_threads': max((s[0] for s in samples), default=None),
+        'idle_rss_mb': round(idle_rss_kb / 1024, 1) if idle_rss_kb else None,
+        'max_rss_mb': round(max(s[1] for s in samples) / 1024, 1) if samples else None,
+        'mean_rss_mb': round(statistics.mean(s[1] for s in samples) / 1024, 1) if samples else None,
+        'errors': len(errors),
+        'error_samples': errors[:5],
+    }
+
+
+def parse_think(value):
+    low, _, high = value.partition(",")
+    return float(low), float(high or low)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="main.py / test.py 동시 웹소켓 부하 테스트")
+    parser.add_argument("--apps", default=",".join(APPS), help="쉼표로 구분한 테스트할 앱 (mbti,assistant)")
+    parser.add_argument("--sessions", type=int, default=100, help="앱마다 동시에 띄울 세션 수")
+    parser.add_argument("--rounds", type=int, default=3, help="세션마다 시나리오를 반복할 횟수")
+    parser.add_argument("--think", type=parse_think, default=(0.5, 1.5), help="동작 사이에 쉬는 시간 범위(초), 예: 0.5,1.5")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="이 시간(초)에 걸쳐 세션을 나눠 시작")
+    parser.add_argument("--port", type=int, help="서버 포트 (기본: 빈 포트)")
+    parser.add_argument("--startup-timeout", type=float, default=60, help="서버가 뜨기를 기다릴 최대 시간(초)")
+    parser.add_argument("--output", help="결과를 JSON lines 로 저장할 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    common = {'python': platform.python_version(), 'timestamp': datetime.now().isoformat(timespec="seconds")}
+    try:
+        for app in args.apps.split(","):
+            result = asyncio.run(load_app(app, args))
+            out.write(json.dumps({**result, **common}, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# mbti_profiles.py
+# MBTI 유형 데이터와 미리 계산한 색인 (유형 간 유사도, 직업 -> 유형)
+#
+# 데이터는 mbti_profiles.tsv 에서 프로세스당 한 번만 읽고, 바꿀 수 없는 구조
+# (tuple / MappingProxyType)로 만들어 모든 세션이 함께 씁니다.
+import collections
+import functools
+import os
+from types import MappingProxyType
+
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mbti_profiles.tsv")
+
+# 네 자리마다 올 수 있는 글자
+AXES = ("IE", "SN", "TF", "JP")
+
+MbtiProfile = collections.namedtuple("MbtiProfile", "code desc jobs")
+
+
+def shared_letters(a, b):
+    # 두 유형이 같은 자리에 같은 글자를 가진 수 (0~4)
+    return sum(x == y for x, y in zip(a, b))
+
+
+def load_profiles(path=PROFILES_PATH):
+    profiles = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                code, desc, jobs = line.split("\t")
+            except ValueError:
+                raise ValueError(f"{path}:{line_no}: 유형<TAB>설명<TAB>직업 세 칸이어야 해요") from None
+            if len(code) != len(AXES) or any(letter not in axis for letter, axis in zip(code, AXES)):
+                raise ValueError(f"{path}:{line_no}: 알 수 없는 MBTI 유형이에요 ({code!r})")
+            profiles.append(MbtiProfile(code, desc, tuple(job.strip() for job in jobs.split(",") if job.strip())))
+    return profiles
+
+
+class MbtiReference:
+    """MBTI 유형 데이터와 그 위에 미리 만든 색인. 만든 뒤에는 바뀌지 않아요.
+
+    similarity[i][j] 는 types[i] 와 types[j] 가 공유하는 글자 수,
+    similar_types[code] 는 code 와 글자를 많이 공유하는 순서의 (유형, 공유 글자 수),
+    types_by_job[job] 은 그 직업이 추천된 유형들입니다.
+    """
+
+    __slots__ = ('profiles', 'types', 'similarity', 'similar_types', 'types_by_job')
+
+    def __init__(self, profiles):
+        by_code = {profile.code: profile for profile in profiles}
+        if len(by_code) != len(profiles):
+            raise ValueError("같은 MBTI 유형이 두 번 나왔어요")
+        types = tuple(by_code)
+        similarity = tuple(tuple(shared_letters(a, b) for b in types) for a in types)
+        similar_types = {}
+        for i, code in enumerate(types):
+            others = [(types[j], shared) for j, shared in enumerate(similarity[i]) if j != i]
+            others.sort(key=lambda item: -item[1]) # 안정 정렬이라 같은 점수면 데이터 파일 순서
+            similar_types[code] = tuple(others)
+        types_by_job = {}
+        for profile in profiles:
+            for job in profile.jobs:
+                types_by_job.setdefault(job, []).append(profile.code)
+
+        self.profiles = MappingProxyType(by_code)
+        self.types = types
+        self.similarity = similarity
+        self.similar_types = MappingProxyType(similar_types)
+        self.types_by_job = MappingProxyType({job: tuple(codes) for job, codes in types_by_job.items()})
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"MbtiReference.{name} 는 바꿀 수 없어요")
+        object.__setattr__(self, name, value)
+
+    def most_similar(self, code):
+        # 가장 많은 글자를 공유하는 유형들 (보통 한 글자만 다른 4가지)
+        ranked = self.similar_types[code]
+        best = ranked[0][1] if ranked else 0
+        return tuple(other for other, shared in ranked if shared == best)
+
+    def job_peers(self, code):
+        # code 의 추천 직업마다, 같은 직업이 추천된 다른 유형들 (없으면 빠짐)
+        return tuple(
+            (job, tuple(other for other in self.types_by_job[job] if other != code))
+            for job in self.profiles[code].jobs
+            if len(self.types_by_job[job]) > 1
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_reference(path=PROFILES_PATH):
+    # 프로세스당 한 번만 읽고 색인을 만들어 모든 세션이 함께 씁니다
+    return MbtiReference(load_profiles(path))
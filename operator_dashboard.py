@@ -0,0 +1,81 @@
+# operator_dashboard.py
+# 운영자용 전체 사용자 분석 대시보드 - analytics_snapshot.py 가 떠 둔 최신 Parquet 스냅숏만 읽어요
+#
+#   streamlit run operator_dashboard.py
+#
+# 사용자 세션이나 SQLite 를 건드리지 않으므로 서비스 중인 앱(test.py)과 따로 띄워도 됩니다.
+import time
+import streamlit as st
+import analytics_snapshot
+from history_view import select_history_date_range
+
+st.set_page_config(layout="wide", page_title="운영자 대시보드 📊")
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def run_query(name, snapshot_id, since, until):
+    # 스냅숏은 만든 뒤 바뀌지 않아서 (스냅숏, 기간)이 같으면 결과도 같아요. (결과 DataFrame, 계산 ms)
+    started = time.perf_counter()
+    table = getattr(analytics_snapshot, name)(analytics_snapshot.SNAPSHOT_DIR, snapshot_id, since, until)
+    return table.to_pandas(), (time.perf_counter() - started) * 1000
+
+def query_caption(elapsed_ms):
+    st.caption(f"⚡ 스냅숏에서 `{elapsed_ms:.0f}`ms 만에 집계했어요")
+
+st.title("📊 운영자 대시보드")
+st.write("모든 사용자의 집중 기록, 습관 달성, 회고 감성을 한눈에 봐요. (개인 작업 이름 / 회고 본문은 스냅숏에 없어요)")
+
+snapshot = analytics_snapshot.latest_snapshot()
+if snapshot is None:
+    st.info(f"아직 스냅숏이 없어요. `python analytics_snapshot.py` 로 먼저 만들어 주세요! (저장 위치: `{analytics_snapshot.SNAPSHOT_DIR}`)")
+    st.stop()
+
+rows = snapshot['rows']
+st.caption(
+    f"🗂️ 스냅숏 `{snapshot['id']}` ({snapshot['as_of']} 기준, {snapshot['created']} 생성) · "
+    f"작업 `{rows['tasks']:,}`줄 / 습관 기록 `{rows['habit_days']:,}`줄 / 회고 `{rows['reflections']:,}`줄"
+)
+since, until = select_history_date_range("operator_range", default_days=90)
+snapshot_id = snapshot['id']
+
+st.markdown("---")
+st.markdown("### 🧠 하루 집중 시간")
+focus, elapsed_ms = run_query("daily_focus", snapshot_id, since, until)
+if focus.empty:
+    st.info("이 기간에는 집중 기록이 없어요.")
+else:
+    total_col, sessions_col, users_col = st.columns(3)
+    total_col.metric("총 집중 시간", f"{int(focus['focus_minutes'].sum()):,}분")
+    sessions_col.metric("완료한 세션", f"{int(focus['sessions'].sum()):,}회")
+    users_col.metric("하루 평균 집중한 사용자", f"{focus['users'].mean():,.1f}명")
+    focus = focus.set_index('date')
+    st.line_chart(focus[['focus_minutes']])
+    st.bar_chart(focus[['users']])
+query_caption(elapsed_ms)
+
+st.markdown("### 🗳️ 집중도 피드백 분포")
+feedback, elapsed_ms = run_query("feedback_distribution", snapshot_id, since, until)
+if feedback.empty:
+    st.info("이 기간에는 피드백이 없어요.")
+else:
+    st.bar_chart(feedback.set_index('feedback')[['count']])
+    st.dataframe(feedback, hide_index=True)
+query_caption(elapsed_ms)
+
+st.markdown("### 💖 전체 습관 달성률")
+habits, elapsed_ms = run_query("daily_habit_completion", snapshot_id, since, until)
+if habits.empty:
+    st.info("이 기간에는 기록 중인 습관이 없어요.")
+else:
+    st.line_chart(habits.set_index('date')[['rate']])
+query_caption(elapsed_ms)
+
+st.markdown("### 🌙 회고 감성 추이")
+sentiment, elapsed_ms = run_query("daily_sentiment", snapshot_id, since, until)
+levels, levels_ms = run_query("sentiment_distribution", snapshot_id, since, until)
+if sentiment.empty:
+    st.info("이 기간에는 회고가 없어요.")
+else:
+    trend_col, levels_col = st.columns([2, 1])
+    trend_col.line_chart(sentiment.set_index('date')[['mean_score']])
+    levels_col.bar_chart(levels.set_index('sentiment_level')[['count']])
+query_caption(elapsed_ms + levels_ms)
@@ -0,0 +1,318 @@
+# pomodoro_module.py
+# 1. 지능형 집중 타이머 (Smart Pomodoro) 모듈 - 탭을 처음 열 때 불러옵니다
+import streamlit as st
+from datetime import datetime
+import random
+import profiling
+from task_store import TaskStore
+from assistant_common import get_storage, get_today_date_str, get_hot_window_start
+from history_view import iter_date_strs, select_history_date_range, render_history_page
+
+def load_task_store(storage, user_id):
+    # 최근 기록만 불러오고, 그 이전 기록은 합계만 가져와 리포트를 맞춥니다
+    loaded_from = get_hot_window_start()
+    task_store = TaskStore(storage.load_tasks(user_id, since=loaded_from), loaded_from=loaded_from)
+    task_store.seed_rollups(*storage.task_rollups_before(user_id, loaded_from))
+    return task_store
+
+def set_tasks_window(since_date_str):
+    # 이력 화면이 보려는 기간에 맞춰 메모리에 둘 기록 범위를 조정합니다.
+    # 더 오래된 기간을 고르면 저장소에서 불러오고, 다시 좁히면 최근 HOT_WINDOW_DAYS 일 바깥 기록은 내려놓아요
+    task_store = st.session_state.tasks
+    if task_store.loaded_from is None:
+        return
+    if since_date_str < task_store.loaded_from:
+        task_store.load_older(get_storage().load_tasks(st.session_state.user_id, since=since_date_str, until=task_store.loaded_from), since_date_str)
+    else:
+        task_store.evict_before(min(since_date_str, get_hot_window_start()))
+
+def init_state():
+    # 이 탭에서 쓰는 세션 상태만 초기화
+    if 'tasks' not in st.session_state:
+        st.session_state.tasks = load_task_store(get_storage(), st.session_state.user_id) # Smart Pomodoro: TaskRecord 들의 TaskStore
+    if 'pomodoro_running' not in st.session_state:
+        st.session_state.pomodoro_running = False
+    if 'current_pomodoro_stage' not in st.session_state:
+        st.session_state.current_pomodoro_stage = 'focus' # 'focus' or 'break'
+    if 'remaining_time' not in st.session_state:
+        st.session_state.remaining_time = 0
+    if 'pomodoro_start_time' not in st.session_state:
+        st.session_state.pomodoro_start_time = None
+    if 'pomodoro_stage_seconds' not in st.session_state:
+        st.session_state.pomodoro_stage_seconds = 0 # 현재 단계의 전체 길이(초). 남은 시간은 시작 시각 + 이 값으로 계산
+    if 'pomodoro_completed_stage' not in st.session_state:
+        st.session_state.pomodoro_completed_stage = None # 방금 끝난 단계: None, 'focus' or 'break'
+    if 'pomodoro_break_suggestion' not in st.session_state:
+        st.session_state.pomodoro_break_suggestion = ""
+    if 'pomodoro_task_name' not in st.session_state:
+        st.session_state.pomodoro_task_name = ""
+
+def get_pomodoro_remaining_seconds():
+    # 매초 값을 갱신하지 않고, 시작 시각과 단계 길이(마감 시각)로부터 남은 시간을 계산
+    if not st.session_state.pomodoro_running or st.session_state.pomodoro_start_time is None:
+        return st.session_state.remaining_time
+    elapsed_seconds = (datetime.now() - st.session_state.pomodoro_start_time).total_seconds()
+    return max(0, int(st.session_state.pomodoro_stage_seconds - elapsed_seconds))
+
+def start_pomodoro_stage(stage_seconds):
+    st.session_state.pomodoro_running = True
+    st.session_state.pomodoro_completed_stage = None
+    st.session_state.pomodoro_stage_seconds = stage_seconds
+    st.session_state.remaining_time = stage_seconds
+    st.session_state.pomodoro_start_time = datetime.now()
+
+def render_pomodoro_countdown(remaining_seconds, stage_text, timer_color):
+    # 카운트다운은 브라우저에서 돌아가므로 서버는 매초 다시 그릴 필요가 없어요
+    st.iframe(
+        f"""
+        <div style='text-align: center; font-family: sans-serif; font-size: 1.5em; font-weight: bold;'>{stage_text} 🏃</div>
+        <div id='pomodoro-clock' style='text-align: center; font-family: sans-serif; font-size: 4em; font-weight: bolder; color: {timer_color};'>
+            {remaining_seconds // 60:02d}:{remaining_seconds % 60:02d}
+        </div>
+        <script>
+            const deadline = Date.now() + {remaining_seconds} * 1000;
+            const clock = document.getElementById('pomodoro-clock');
+            function tick() {{
+                const left = Math.max(0, Math.round((deadline - Date.now()) / 1000));
+                const minutes = String(Math.floor(left / 60)).padStart(2, '0');
+                const seconds = String(left % 60).padStart(2, '0');
+                clock.textContent = minutes + ':' + seconds;
+                if (left <= 0) clearInterval(timer);
+            }}
+            const timer = setInterval(tick, 1000);
+            tick();
+        </script>
+        """,
+        height=140,
+    )
+
+def watch_pomodoro_deadline():
+    # 마감 시각이 지났을 때만 전체 앱을 다시 실행해서 단계 종료 처리를 합니다
+    if st.session_state.pomodoro_running and get_pomodoro_remaining_seconds() <= 0:
+        st.rerun()
+
+def finish_pomodoro_stage(current_task_details):
+    st.session_state.pomodoro_running = False
+    st.session_state.pomodoro_start_time = None
+    st.session_state.pomodoro_completed_stage = st.session_state.current_pomodoro_stage
+
+    if st.session_state.current_pomodoro_stage == 'focus':
+        st.session_state.tasks.log_focus_minutes(current_task_details['name'], current_task_details['date'], current_task_details['focus_duration_minutes'])
+        st.session_state.pomodoro_break_suggestion = random.choice([
+            "잠시 스트레칭하며 몸을 풀어보세요.",
+            "창 밖을 보며 눈을 쉬게 해주세요.",
+            "물 한 잔 마시며 재충전하세요.",
+            "가벼운 명상으로 마음을 진정시켜보세요."
+        ])
+        st.session_state.current_pomodoro_stage = 'break'
+        st.session_state.remaining_time = current_task_details['break_duration_minutes'] * 60
+    else:
+        st.session_state.remaining_time = 0
+
+# 1. 지능형 집중 타이머 (Smart Pomodoro) 모듈
+def smart_pomodoro_module():
+    init_state()
+    profiling.section("pomodoro.setup")
+    st.markdown("## 🧠 집중력 부스터! 지능형 집중 타이머 🚀")
+    st.write("당신의 작업 스타일에 맞춰 최적의 집중과 휴식 시간을 제안해 드립니다. 지금 바로 생산성을 최대로 끌어올리세요!")
+
+    st.markdown("---") # 시각적 구분선
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.markdown("### 🎯 새로운 작업 설정하기")
+        task_name = st.text_input("수행할 작업 이름을 입력하세요", key="pomodoro_task_input", placeholder="예: 보고서 작성, 코딩 학습")
+
+        # ⭐️ AI 기반 작업 복잡성 추론 (규칙 기반 시뮬레이션)
+        complexity_options = ["10분","15분", "20분", "25분", "30분", "35분", "40분", "45분", "50분"]
+        selected_complexity = st.selectbox("집중 시간 설정", complexity_options, key="complexity_select")
+
+        # ⭐️ 복잡성에 따른 집중/휴식 시간 제안 로직 (AI 시뮬레이션)
+        focus_minutes_suggestion = 25
+        break_minutes_suggestion = 5
+        
+        if selected_complexity == "10분":
+            focus_minutes_suggestion = 10
+            break_minutes_suggestion = 5
+        elif selected_complexity == "15분":
+            focus_minutes_suggestion = 15
+            break_minutes_suggestion = 5
+        elif selected_complexity == "20분":
+            focus_minutes_suggestion = 20
+            break_minutes_suggestion = 5
+        elif selected_complexity == "25분":
+            focus_minutes_suggestion = 25
+            break_minutes_suggestion = 5
+        elif selected_complexity == "30분":
+            focus_minutes_suggestion = 30
+            break_minutes_suggestion = 5
+        elif selected_complexity == "35분":
+            focus_minutes_suggestion = 35
+            break_minutes_suggestion = 5
+        elif selected_complexity == "40분":
+            focus_minutes_suggestion = 40
+            break_minutes_suggestion = 10
+        elif selected_complexity == "45분":
+            focus_minutes_suggestion = 45
+            break_minutes_suggestion = 10
+        elif selected_complexity == "50분":
+            focus_minutes_suggestion = 50
+            break_minutes_suggestion = 10
+
+
+
+        st.success(f"✨ AI의 최적화된 제안: **집중 {focus_minutes_suggestion}분** / **휴식 {break_minutes_suggestion}분**")
+
+        if st.button("🚀 작업 추가 및 타이머 시작 준비", key="add_task_button", use_container_width=True):
+            if task_name:
+                st.session_state.pomodoro_task_name = task_name
+                st.session_state.current_pomodoro_stage = 'focus'
+                st.session_state.remaining_time = focus_minutes_suggestion * 60 # Initial setup
+                st.session_state.pomodoro_running = False # Reset for start
+                st.session_state.pomodoro_start_time = None
+                st.session_state.pomodoro_completed_stage = None
+                
+                # Check if task already exists in current session (same name, same day, not yet completed), update it. Otherwise add.
+                st.session_state.tasks.upsert_open(task_name, get_today_date_str(), selected_complexity, focus_minutes_suggestion, break_minutes_suggestion)
+                st.success(f"🎉 '{task_name}' 작업을 위해 타이머가 준비되었습니다. '시작' 버튼을 눌러 집중하세요!")
+                st.rerun() # Refresh to show timer status
+            else:
+                st.warning("앗, 작업 이름을 입력해야 시작할 수 있어요! 😅")
+
+    with col2:
+        profiling.section("pomodoro.timer")
+        st.markdown("### ⏱️ 현재 타이머 상태")
+        if st.session_state.pomodoro_task_name:
+            st.write(f"**진행 중인 작업:** **`{st.session_state.pomodoro_task_name}`**")
+            
+            # --- 남은 시간 디스플레이! 크고 아름답게! ---
+            time_placeholder = st.empty() # Timer will update here
+            
+            # Find the current task being run to get its configured focus/break times
+            current_task_details = st.session_state.tasks.get_open(st.session_state.pomodoro_task_name, get_today_date_str())
+            
+            if current_task_details is None:
+                st.error("현재 진행 중인 작업 정보가 없어요 😥 새 작업을 다시 설정해주세요!")
+                st.session_state.pomodoro_task_name = "" 
+                return
+
+            # 단계가 끝났는지는 마감 시각으로 한 번만 판단 (서버는 시작/중지/종료 때만 일함)
+            stage_just_finished = False
+            if st.session_state.pomodoro_running and get_pomodoro_remaining_seconds() <= 0:
+                finish_pomodoro_stage(current_task_details)
+                stage_just_finished = True
+
+            if st.session_state.pomodoro_running:
+                # 🚀🚀🚀 남은 시간 표시 스타일 강화! 🚀🚀🚀
+                current_stage_text = "집중 중" if st.session_state.current_pomodoro_stage == 'focus' else "휴식 중"
+                timer_color = "#28a745" if st.session_state.current_pomodoro_stage == 'focus' else "#007bff"
+                remaining_seconds = get_pomodoro_remaining_seconds()
+                with time_placeholder.container():
+                    render_pomodoro_countdown(remaining_seconds, current_stage_text, timer_color)
+                    # 남은 시간이 다 지난 뒤에 한 번만 부분 재실행
+                    st.fragment(watch_pomodoro_deadline, run_every=remaining_seconds + 1)()
+            elif st.session_state.pomodoro_completed_stage is None:
+                # Display initial state before timer starts
+                minutes = st.session_state.remaining_time // 60
+                seconds = st.session_state.remaining_time % 60
+                time_placeholder.markdown(
+                    f"<div style='text-align: center; font-size: 1.5em; font-weight: bold;'>{st.session_state.current_pomodoro_stage.capitalize()} 준비</div>"
+                    f"<div style='text-align: center; font-size: 4em; font-weight: bolder; color: #FF6347;'>{minutes:02d}:{seconds:02d}</div>",
+                    unsafe_allow_html=True
+                )
+            
+            # Buttons
+            button_col1, button_col2 = st.columns(2)
+            with button_col1:
+                if st.session_state.pomodoro_running:
+                    if st.button("⏹️ 중지하기", key="stop_pomodoro", use_container_width=True):
+                        st.session_state.pomodoro_running = False
+                        st.session_state.pomodoro_start_time = None
+                        st.warning("타이머가 잠시 멈췄어요. 다시 시작하거나 재설정하세요.")
+                        st.rerun()
+                elif st.session_state.pomodoro_completed_stage is None:
+                    if st.button("▶️ 시작하기", key="start_pomodoro", use_container_width=True):
+                        if st.session_state.current_pomodoro_stage == 'focus':
+                            start_pomodoro_stage(current_task_details['focus_duration_minutes'] * 60)
+                        else: # break
+                            start_pomodoro_stage(current_task_details['break_duration_minutes'] * 60)
+                        st.rerun()
+
+            if st.session_state.pomodoro_completed_stage == 'focus':
+                if stage_just_finished:
+                    st.balloons() # 시각적 완료 알림
+                st.success(f"🎊 **'{st.session_state.pomodoro_task_name}' 집중 시간 완료!** 잠시 숨을 돌려요 🎉")
+                st.info(f"🌿 **AI의 휴식 제안:** {st.session_state.pomodoro_break_suggestion}")
+
+                if st.button("🧘‍♀️ 휴식 시간 시작!", key="start_break_after_focus", use_container_width=True):
+                    start_pomodoro_stage(current_task_details['break_duration_minutes'] * 60)
+                    st.rerun()
+            elif st.session_state.pomodoro_completed_stage == 'break':
+                if stage_just_finished:
+                    st.balloons() # 시각적 완료 알림
+                st.success("✅ **휴식 시간도 완료!** 이제 다시 활기찬 집중을 시작할 준비 되셨나요?")
+                
+                feedback = st.radio("오늘 집중도는 어떠셨나요?", ["매우 좋음", "좋음", "보통", "나쁨", "매우 나쁨"], key=f"feedback_rating_{st.session_state.pomodoro_task_name}_{get_today_date_str()}")
+                if st.button("✅ 피드백 제출 및 작업 완료", key="complete_pomodoro_task", use_container_width=True):
+                    st.session_state.tasks.complete(st.session_state.pomodoro_task_name, get_today_date_str(), feedback)
+                    st.session_state.pomodoro_task_name = ""
+                    st.session_state.pomodoro_completed_stage = None
+                    st.info("✨ 수고하셨습니다! 작업이 성공적으로 완료되고 피드백이 저장되었습니다.")
+                    st.rerun()
+            elif not st.session_state.pomodoro_running: # If timer not running and task is set up
+                st.info("💡 시작 버튼을 눌러 집중 타이머를 가동해보세요!")
+
+        else:
+            st.info("✨ 왼쪽에서 새로운 집중 작업을 설정해주세요. 당신의 생산성을 높여줄 거예요!")
+
+    st.markdown("---")
+    profiling.section("pomodoro.history")
+    st.markdown("### 📈 나의 집중 기록 한눈에 보기")
+    # 메모리에는 최근 기록만 있으니, 비어 있으면 저장소에 더 오래된 기록이 있는지도 봅니다
+    if st.session_state.tasks or get_storage().max_task_id(st.session_state.user_id):
+        st.markdown("##### 📅 전체 집중 세션 이력:")
+        start_date, end_date = select_history_date_range("task_history_range")
+        set_tasks_window(start_date.strftime("%Y-%m-%d"))
+        # 날짜별 버킷에서 조회 기간의 기록만 꺼내기 (Show latest first)
+        history_tasks = []
+        for date_str in iter_date_strs(start_date, end_date):
+            history_tasks.extend(reversed(st.session_state.tasks.tasks_on(date_str)))
+
+        if history_tasks:
+            render_history_page(history_tasks, lambda task: {
+                '날짜': task['date'],
+                '작업': task['name'],
+                '난이도': task['complexity_level'].split(' ')[0], # '매우 쉬움 (간단한 응답)' -> '매우 쉬움'
+                '집중 시간(분)': task['logged_focus_minutes'],
+                '목표(분)': task['focus_duration_minutes'],
+                '피드백': task['feedback'] if task['feedback'] else "진행 중 / 미완료"
+            }, key="task_history_page")
+        else:
+            st.info("선택한 기간에는 집중 기록이 없어요. 조회 기간을 바꿔보세요! 🔎")
+        
+        profiling.section("pomodoro.report")
+        st.markdown("##### 📊 나의 집중 패턴 분석 리포트:")
+        task_store = st.session_state.tasks
+        if task_store.completed_count:
+            st.write(f"🚀 **총 집중 기록 시간:** **`{task_store.completed_minutes}`분** 동안 열심히 집중하셨네요!")
+            st.write(f"📅 **오늘 기록한 집중 시간:** `{task_store.minutes_by_day.get(get_today_date_str(), 0)}`분")
+
+            # Feedback distribution (누적 집계 사용)
+            if task_store.feedback_counts:
+                st.write("- **집중도 피드백 분포:**")
+                for fb, count in task_store.feedback_counts.items():
+                    st.write(f"  - `{fb}`: `{count}`회 (총 {task_store.completed_count}회 중)")
+            else:
+                st.info("피드백 데이터가 아직 부족해요. 작업을 더 많이 완료해주세요!")
+
+            period_label = st.radio("집중 시간 묶어 보기", ["주별", "월별"], horizontal=True, key="focus_report_period")
+            if period_label == "주별":
+                recent_minutes = task_store.recent_minutes('week', 8)
+            else:
+                recent_minutes = task_store.recent_minutes('month', 12)
+            st.bar_chart({"집중 시간(분)": recent_minutes})
+        else:
+            st.info("아직 완료된 집중 기록이 없습니다. 타이머를 사용해서 기록을 쌓아보세요!")
+    else:
+        st.info("아직 집중 기록이 없습니다. 첫 번째 작업을 시작하고 멋진 기록을 만들어보세요! 😊")
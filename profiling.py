@@ -0,0 +1,169 @@
+# profiling.py
+# 켜 두었을 때만 동작하는 rerun 성능 계측: 구간별 시간, 화면 요소 수, 세션 상태 크기
+#
+# 켜는 방법
+#   ?debug=1                               방문자 자신의 세션 숫자만 (구간별 시간, 자기 세션 상태 크기)
+#   ASSISTANT_PROFILE=1                    운영자용: 모든 rerun 을 계측하고 화면 요소 수와 서버 전체 세션 상태까지
+#   ?debug=<ASSISTANT_PROFILE_SECRET 값>   운영자용을 한 세션에서만 (환경 변수에 비밀값을 정해 둔 경우)
+# 서버 전체 계측은 모든 세션 상태를 pickle 하고 Streamlit 내부(세션 관리자, 메시지 큐)를 건드려서 운영자만 켤 수 있어요.
+# 꺼져 있으면 section() 은 thread-local 값 하나만 확인하고 바로 돌아갑니다.
+import functools
+import hmac
+import json
+import logging
+import logging.handlers
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+LOG_PATH = os.environ.get("ASSISTANT_PROFILE_LOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "assistant_profile.log"))
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+_local = threading.local() # 세션마다 스크립트 스레드가 달라서 실행 중인 계측도 스레드별로 둡니다
+
+
+def is_operator(query_params):
+    # 서버 전체 계측을 켤 수 있는지: 환경 변수로 켰거나 ?debug= 가 운영자 비밀값과 같을 때
+    if os.environ.get("ASSISTANT_PROFILE") == "1":
+        return True
+    secret = os.environ.get("ASSISTANT_PROFILE_SECRET", "")
+    debug = query_params.get("debug", "")
+    return bool(secret) and hmac.compare_digest(debug.encode("utf-8"), secret.encode("utf-8"))
+
+
+def is_enabled(query_params):
+    return query_params.get("debug") == "1" or is_operator(query_params)
+
+
+@functools.lru_cache(maxsize=None)
+def get_logger():
+    logger = logging.getLogger("assistant.profile")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = logging.handlers.RotatingFileHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+class RunProfile:
+    """rerun 한 번의 계측 결과. section() 을 부를 때마다 이전 구간을 닫고 새 구간을 엽니다.
+
+    server_wide 가 아니면(방문자의 ?debug=1) 화면 요소 수와 서버 전체 숫자는 비워 둡니다.
+    """
+
+    def __init__(self, label, server_wide=False):
+        self.label = label
+        self.server_wide = server_wide
+        self.started = time.perf_counter()
+        self.elements = 0 # 이번 rerun 에서 보낸 화면 요소(delta) 수 (server_wide 일 때만 셈)
+        self.sections = [] # {'section', 'ms', 'elements'}
+        self.total_ms = 0.0
+        self.session_state_bytes = {}
+        self.active_sessions = 0 # 서버 전체의 활성 세션 수와 세션 상태 크기 합계 (키별)
+        self.all_sessions_state_bytes = {}
+        self._current = None
+
+    def section(self, name):
+        self.end_section()
+        self._current = (name, time.perf_counter(), self.elements)
+
+    def end_section(self):
+        if self._current is None:
+            return
+        name, started, elements = self._current
+        row = {'section': name, 'ms': round((time.perf_counter() - started) * 1000, 2)}
+        if self.server_wide:
+            row['elements'] = self.elements - elements
+        self.sections.append(row)
+        self._current = None
+
+
+def begin_run(label, server_wide=False):
+    profile = RunProfile(label, server_wide)
+    ctx = get_script_run_ctx() if server_wide else None
+    if ctx is not None:
+        # 세션으로 나가는 메시지를 세어 요소 수를 잽니다 (운영자 계측일 때만 감쌈)
+        send = ctx._enqueue
+
+        def counting_enqueue(msg):
+            if msg.HasField("delta"):
+                profile.elements += 1
+            send(msg)
+
+        ctx._enqueue = counting_enqueue
+        profile._restore = (ctx, send)
+    _local.profile = profile
+    return profile
+
+
+def section(name):
+    profile = getattr(_local, "profile", None)
+    if profile is not None:
+        profile.section(name)
+
+
+def current():
+    return getattr(_local, "profile", None)
+
+
+def session_state_size(session_state):
+    # 키별 pickle 크기로 세션 상태가 얼마나 큰지 어림합니다 (계측이 켜졌을 때만)
+    sizes = {}
+    for key in session_state:
+        try:
+            sizes[key] = len(pickle.dumps(session_state[key], protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            sizes[key] = -1
+    return sizes
+
+
+def active_sessions_state_size():
+    # 이 서버 프로세스의 모든 활성 세션 상태를 키별로 합칩니다: (세션 수, {key: bytes})
+    # 세션 수만큼 pickle 하므로 운영자 계측일 때만 부릅니다. 서버 없이(AppTest 등) 실행 중이면 (0, {})
+    session_mgr = getattr(runtime.get_instance(), "_session_mgr", None) if runtime.exists() else None
+    if session_mgr is None:
+        return 0, {}
+    sessions = session_mgr.list_active_sessions()
+    totals = {}
+    for session_info in sessions:
+        for key, size in session_state_size(session_info.session.session_state.filtered_state).items():
+            if size > 0:
+                totals[key] = totals.get(key, 0) + size
+    return len(sessions), totals
+
+
+def end_run(session_state):
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return None
+    _local.profile = None
+    profile.end_section()
+    profile.total_ms = round((time.perf_counter() - profile.started) * 1000, 2)
+    restore = getattr(profile, "_restore", None)
+    if restore is not None:
+        ctx, send = restore
+        ctx._enqueue = send
+    profile.session_state_bytes = session_state_size(session_state)
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec="seconds"),
+        'label': profile.label,
+        'total_ms': profile.total_ms,
+        'session_state_bytes': sum(size for size in profile.session_state_bytes.values() if size > 0),
+        'sections': profile.sections,
+    }
+    if profile.server_wide:
+        profile.active_sessions, profile.all_sessions_state_bytes = active_sessions_state_size()
+        entry.update({
+            'elements': profile.elements,
+            'active_sessions': profile.active_sessions,
+            'all_sessions_state_bytes': sum(profile.all_sessions_state_bytes.values()),
+        })
+    get_logger().info(json.dumps(entry, ensure_ascii=False))
+    return profile
@@ -0,0 +1,102 @@
+# records.py
+# 집중 기록 / 습관 / 회고 한 건을 담는 __slots__ 레코드
+
+
+class Record:
+    """__slots__ 레코드의 공통 부분.
+
+    레코드마다 dict(해시 테이블)를 두지 않고 필드 칸만 두어 한 건당 메모리가
+    훨씬 작아요. 기존 dict 코드가 그대로 돌도록 record['name'], get(), update(),
+    'id' in record 도 지원합니다. 아직 값을 넣지 않은 필드는 없는 키로 봐요.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls.__new__(cls)
+        record.update(data)
+        return record
+
+    # --- 기존 dict 처럼 쓸 수 있도록 ---
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def update(self, fields):
+        for key, value in fields.items():
+            self[key] = value
+
+    def keys(self):
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TaskRecord(Record):
+    """집중 세션 작업 한 건. 필드 순서는 storage.TASK_COLUMNS 와 같아요 (새 작업의 id 는 저장할 때 SQLite 가 채움)."""
+
+    __slots__ = ('id', 'name', 'complexity_level', 'focus_duration_minutes', 'break_duration_minutes',
+                 'logged_focus_minutes', 'feedback', 'date')
+
+    def __init__(self, id, name, complexity_level, focus_duration_minutes, break_duration_minutes,
+                 logged_focus_minutes, feedback, date):
+        self.id = id
+        self.name = name
+        self.complexity_level = complexity_level
+        self.focus_duration_minutes = focus_duration_minutes
+        self.break_duration_minutes = break_duration_minutes
+        self.logged_focus_minutes = logged_focus_minutes
+        self.feedback = feedback
+        self.date = date
+
+
+class HabitRecord(Record):
+    """습관 하나. 날짜별 달성 기록은 tracking(HabitTracking 비트셋)에 있어요."""
+
+    __slots__ = ('id', 'name', 'creation_date', 'tracking')
+
+    def __init__(self, id, name, creation_date, tracking):
+        self.id = id
+        self.name = name
+        self.creation_date = creation_date
+        self.tracking = tracking
+
+
+class ReflectionRecord(Record):
+    """하루치 회고. 날짜는 st.session_state.reflections 의 키라서 따로 두지 않아요."""
+
+    __slots__ = ('q1', 'q2', 'q3', 'summary', 'sentiment_level', 'sentiment_score', 'lexicon_version')
+
+    def __init__(self, q1, q2, q3, summary, sentiment_level, sentiment_score=None, lexicon_version=None):
+        self.q1 = q1
+        self.q2 = q2
+        self.q3 = q3
+        self.summary = summary
+        self.sentiment_level = sentiment_level
+        self.sentiment_score = sentiment_score
+        self.lexicon_version = lexicon_version
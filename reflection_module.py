@@ -0,0 +1,198 @@
+# reflection_module.py
+# 3. 자기전 회고 도우미 모듈 - 탭을 처음 열 때 불러옵니다
+import streamlit as st
+import profiling
+from records import ReflectionRecord
+from sentiment import SentimentTrend, get_matcher, reflection_text, rescore_reflections, sentiment_label
+from assistant_common import get_storage, get_today_date_str, get_hot_window_start, last_analytics, request_analytics
+from history_view import iter_date_strs, select_history_date_range, render_history_page
+
+def init_state():
+    # 이 탭에서 쓰는 세션 상태만 초기화
+    if 'dirty_reflection_dates' not in st.session_state:
+        st.session_state.dirty_reflection_dates = set()
+    if 'reflections' not in st.session_state:
+        # 최근 HOT_WINDOW_DAYS 일 회고만 메모리에 두고, 더 오래된 회고는 이력 화면에서 고를 때 불러와요
+        st.session_state.reflections_loaded_from = get_hot_window_start()
+        st.session_state.reflections = get_storage().load_reflections(st.session_state.user_id, since=st.session_state.reflections_loaded_from) # {date: ReflectionRecord}
+    if 'stale_reflection_dates' not in st.session_state:
+        # 지금 감성 사전과 다른 버전으로 채점된 회고들 (사전이 바뀌면 다시 분석할 수 있게)
+        version = get_matcher().version
+        stale_dates = {date for date, _ in get_storage().load_stale_reflections(st.session_state.user_id, version)}
+        stale_dates.update(date for date, data in st.session_state.reflections.items() if data.get('lexicon_version') != version)
+        st.session_state.stale_reflection_dates = sorted(stale_dates)
+
+def set_reflections_window(since_date_str):
+    # 이력 화면이 보려는 기간에 맞춰 메모리에 둘 회고 범위를 조정합니다 (pomodoro_module.set_tasks_window 와 같은 방식)
+    loaded_from = st.session_state.get('reflections_loaded_from')
+    if loaded_from is None: # 전체 회고가 메모리에 있음
+        return
+    reflections = st.session_state.reflections
+    if since_date_str < loaded_from:
+        for date, data in get_storage().load_reflections(st.session_state.user_id, since=since_date_str, until=loaded_from).items():
+            reflections.setdefault(date, data)
+        st.session_state.reflections_loaded_from = since_date_str
+        return
+    keep_from = min(since_date_str, get_hot_window_start())
+    if keep_from <= loaded_from:
+        return
+    if any(date < keep_from for date in st.session_state.dirty_reflection_dates):
+        return # 아직 저장되지 않은 회고가 있으면 저장된 뒤(다음 rerun)에 내려놓기
+    for date in [date for date in reflections if date < keep_from]:
+        del reflections[date]
+    st.session_state.reflections_loaded_from = keep_from
+
+EMPTY_TREND_ROW = {'점수': None, '7일 평균': None, '30일 평균': None} # 아직 통계에 들어가지 않은 날짜
+TREND_CHART_MAX_POINTS = 180 # 추이 그래프에 그릴 최대 날짜 수 (넘으면 일정 간격으로 골라 그려요)
+
+def build_sentiment_trend(storage, user_id, previous=None):
+    # 감성 통계를 만듭니다 (백그라운드 스레드에서 돌아요). 직전 통계가 있으면 그 뒤로 넣거나 고친 회고만 반영하고,
+    # 없으면 저장된 모든 회고의 점수(본문 제외)로. 버전은 점수보다 먼저 읽어서, 그 사이의 변경은 다음에 한 번 더 반영돼요
+    version = storage.reflection_version(user_id)
+    if previous is not None:
+        return previous.with_changes(storage.load_reflection_changes(user_id, previous.version), version)
+    return SentimentTrend.from_scores(storage.load_reflection_scores(user_id), version)
+
+def get_sentiment_trend(reflection_version):
+    # (감성 통계, 최신 여부). 저장된 회고의 버전이 바뀔 때만 스레드 풀에서 직전 통계를 고쳐 만들고, 그 사이엔 직전 결과를 써요
+    return request_analytics(
+        "sentiment_trend", reflection_version, build_sentiment_trend,
+        get_storage(), st.session_state.user_id, last_analytics("sentiment_trend")
+    )
+
+# 3. 자기전 회고 도우미 모듈
+def evening_reflection_module():
+    init_state()
+    profiling.section("reflection.form")
+    st.markdown("## 🌙 마음챙김 저널: 자기 전 회고 도우미 📝")
+    st.write("AI와 함께 하루를 차분히 되돌아보고, 오늘의 의미를 발견하며 내일을 위한 성장의 씨앗을 심어보세요.")
+
+    st.markdown("---")
+
+    today = get_today_date_str()
+    st.markdown(f"### 🌅 `{today}` 오늘 하루 회고하기")
+
+    if today in st.session_state.reflections:
+        st.info("😊 **이미 오늘 회고를 작성하셨군요!** 멋진 하루의 마무리를 하셨네요. 내일 또 만나요! 👋")
+        st.markdown("---")
+        st.markdown("### ✨ 오늘 회고한 내용 요약")
+        reflect_data = st.session_state.reflections[today]
+        st.write(f"**💖 오늘 기뻤던 일:** **`{reflect_data['q1']}`**")
+        st.write(f"**🧠 오늘 배운 점:** **`{reflect_data['q2']}`**")
+        st.write(f"**🚀 내일 기대하는 것:** **`{reflect_data['q3']}`**")
+        st.markdown("##### 📝 AI의 하루 브리핑:")
+        st.success(f"'{reflect_data['summary']}'")
+        st.markdown(f"##### ✨ 오늘의 감성 점수: **`{reflect_data['sentiment_level'].capitalize()}`**")
+    else:
+        st.markdown("간단한 질문에 답하며 오늘 하루를 되돌아볼까요? 💭")
+        q1 = st.text_area("✍️ 오늘 가장 기뻤던 일 한 가지는 무엇인가요?", key="reflect_q1", placeholder="예: 뜻밖의 칭찬을 들었다.")
+        q2 = st.text_area("💡 오늘 새롭게 배우거나 깨달은 점은 무엇인가요?", key="reflect_q2", placeholder="예: 새로운 코딩 방법을 익혔다.")
+        q3 = st.text_area("🌟 내일 가장 기대하는 것은 무엇인가요?", key="reflect_q3", placeholder="예: 오랜만에 친구와 만날 생각에 설렌다.")
+
+        if st.button("✨ 회고 완료 및 AI 분석 시작!", key="submit_reflection", use_container_width=True):
+            if q1 and q2 and q3:
+                # ⭐️ AI 요약 및 감성 분석 (규칙 기반 시뮬레이션)
+                full_text = reflection_text(q1, q2, q3)
+                
+                summary = f"오늘 하루는 '{q1}'으로 기뻤고, '{q2}'를 배운 의미 있는 하루였습니다. 내일은 '{q3}'를 기대하고 있습니다."
+                
+                # 감성 어간 사전(sentiment_lexicon.tsv)은 프로세스당 한 번 컴파일해 모든 세션이 함께 써요
+                matcher = get_matcher()
+                sentiment_score = matcher.score(full_text)
+                sentiment = sentiment_label(sentiment_score)
+
+                st.session_state.reflections[today] = ReflectionRecord(
+                    q1=q1,
+                    q2=q2,
+                    q3=q3,
+                    summary=summary,
+                    sentiment_level=sentiment,
+                    sentiment_score=sentiment_score,
+                    lexicon_version=matcher.version
+                )
+                st.session_state.dirty_reflection_dates.add(today) # 저장되면 회고 버전이 바뀌어 감성 통계도 다시 계산돼요
+                st.success("🎉 회고가 저장되고 AI 분석이 완료되었습니다! 잠시 후 회고 기록에서 확인해보세요.")
+                st.rerun()
+            else:
+                st.warning("앗, 모든 질문에 답해주셔야 AI가 멋진 분석을 해줄 수 있어요! 😅")
+
+    st.markdown("---")
+    profiling.section("reflection.gallery")
+    st.markdown("### 📚 나의 회고 기록 갤러리")
+    reflection_version = get_storage().reflection_version(st.session_state.user_id) # 회고 변경 번호 (회고가 없으면 0)
+    if reflection_version or st.session_state.reflections:
+        stale_dates = st.session_state.stale_reflection_dates
+        if stale_dates:
+            st.warning(f"🔄 감성 분석 기준이 바뀌었어요! `{len(stale_dates)}`개의 회고가 예전 기준으로 분석되어 있어요.")
+            if st.button("🔄 예전 회고 감성 다시 분석하기", key="rescore_reflections_button", use_container_width=True):
+                matcher = get_matcher()
+                progress_bar = st.progress(0.0, text="회고를 다시 분석하는 중...")
+                # 메모리에 있는 회고는 고쳐서 저장하고, 내려놓은 오래된 회고는 저장소에서 읽어 점수만 바로 고쳐 씁니다
+                reflections = st.session_state.reflections
+                stale_items = [(date, reflections[date]) for date in stale_dates if date in reflections]
+                stale_items += [item for item in get_storage().load_stale_reflections(st.session_state.user_id, matcher.version) if item[0] not in reflections]
+                archived_scores = []
+                for done, (date, score, label) in enumerate(rescore_reflections(stale_items, matcher), start=1):
+                    if date in reflections:
+                        reflections[date].update({
+                            'sentiment_level': label,
+                            'sentiment_score': score,
+                            'lexicon_version': matcher.version
+                        })
+                        st.session_state.dirty_reflection_dates.add(date)
+                    else:
+                        archived_scores.append((st.session_state.user_id, date, score, label, matcher.version))
+                    if done % 50 == 0 or done == len(stale_items):
+                        progress_bar.progress(done / len(stale_items), text=f"회고를 다시 분석하는 중... ({done}/{len(stale_items)})")
+                get_storage().update_reflection_scores(archived_scores)
+                st.session_state.stale_reflection_dates = []
+                st.rerun()
+
+        st.markdown("##### 📝 전체 회고 목록:")
+        start_date, end_date = select_history_date_range("reflection_history_range")
+        set_reflections_window(start_date.strftime("%Y-%m-%d"))
+        # 날짜 키로 조회 기간의 회고만 꺼내기 (최신순)
+        reflection_dates = [date for date in iter_date_strs(start_date, end_date) if date in st.session_state.reflections]
+
+        if reflection_dates:
+            render_history_page(reflection_dates, lambda date: {
+                '날짜': date,
+                '감성': st.session_state.reflections[date]['sentiment_level'],
+                '요약': st.session_state.reflections[date]['summary']
+            }, key="reflection_history_page")
+        else:
+            st.info("선택한 기간에는 회고 기록이 없어요. 조회 기간을 바꿔보세요! 🔎")
+        
+        profiling.section("reflection.trend")
+        st.markdown("##### 📊 나의 감성 변화 트렌드:")
+        sentiment_trend, fresh = get_sentiment_trend(reflection_version)
+        if sentiment_trend is None:
+            st.info("📊 감성 통계를 계산하고 있어요... 잠시만 기다려주세요! ⏳")
+        elif not fresh:
+            st.caption("🔄 새 회고로 감성 통계를 다시 계산하고 있어요. 아래는 직전 결과예요.")
+        sentiment_counts = sentiment_trend.label_counts if sentiment_trend is not None else {}
+
+        if sentiment_counts:
+            for sentiment, count in sentiment_counts.items():
+                st.write(f"- **`{sentiment}`:** `{count}`회")
+        elif sentiment_trend is not None:
+            st.info("아직 감성 분석 데이터가 부족해요. 회고를 더 많이 작성해주세요! ✏️")
+
+        st.markdown("##### 📈 일별 감성 변화 추이:")
+        if reflection_dates and sentiment_trend is not None:
+            # 목록과 같은 조회 기간만. 그래프는 TREND_CHART_MAX_POINTS 개까지 (이동 평균이라 건너뛰어도 모양이 남아요),
+            # 표는 이력 목록처럼 한 페이지씩 보냅니다
+            def make_trend_row(date):
+                return {'날짜': date, '감성': st.session_state.reflections[date]['sentiment_level'], **sentiment_trend.rows.get(date, EMPTY_TREND_ROW)}
+
+            stride = -(-len(reflection_dates) // TREND_CHART_MAX_POINTS)
+            chart_dates = reflection_dates[::stride] # 가장 최근 날짜는 항상 들어가요
+            st.line_chart([make_trend_row(date) for date in reversed(chart_dates)], x='날짜', y=['7일 평균', '30일 평균'])
+            if stride > 1:
+                st.caption(f"📉 그래프는 `{len(reflection_dates)}`일 중 `{stride}`일 간격으로 `{len(chart_dates)}`일만 그렸어요.")
+            render_history_page(reflection_dates, make_trend_row, key="reflection_trend_page")
+        elif not reflection_dates:
+            st.info("선택한 기간에는 감성 기록이 없어요. 🗓️")
+
+    else:
+        st.info("아직 작성된 회고가 없어요. 오늘 하루를 기록하고 당신의 내면을 탐험해보세요! 🚀")
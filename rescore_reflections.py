@@ -0,0 +1,50 @@
+# rescore_reflections.py
+# 감성 사전(sentiment_lexicon.tsv)을 바꾼 뒤 저장된 모든 회고를 다시 채점하는 일괄 작업
+#
+#   python rescore_reflections.py [DB 경로] [--all]
+#
+# 기본으로는 현재 사전 버전으로 채점되지 않은 회고만 다시 채점합니다.
+import os
+import sys
+import time
+
+from sentiment import get_matcher, rescore_reflections
+from storage import Storage
+
+BATCH_SIZE = 1000
+
+
+def main(argv):
+    rescore_all = "--all" in argv
+    paths = [arg for arg in argv if not arg.startswith("--")]
+    db_path = paths[0] if paths else os.environ.get("ASSISTANT_DB_PATH", "assistant_data.db")
+
+    storage = Storage(db_path)
+    matcher = get_matcher()
+    total = storage.count_reflections()
+    started = time.perf_counter()
+
+    # (user_id, date) 를 키로 넘겨 한 건씩 흘려보내고, BATCH_SIZE 개마다 한 트랜잭션으로 저장
+    stale = (
+        ((user_id, date), data) for user_id, date, data in storage.iter_all_reflections(BATCH_SIZE)
+        if rescore_all or data['lexicon_version'] != matcher.version
+    )
+    rescored = 0
+    batch = []
+    for (user_id, date), score, label in rescore_reflections(stale, matcher):
+        batch.append((user_id, date, score, label, matcher.version))
+        if len(batch) >= BATCH_SIZE:
+            storage.update_reflection_scores(batch)
+            rescored += len(batch)
+            batch = []
+            print(f"  {rescored} rescored...", flush=True)
+    storage.update_reflection_scores(batch)
+    rescored += len(batch)
+
+    elapsed = time.perf_counter() - started
+    print(f"rescored {rescored} of {total} reflections with lexicon {matcher.version} in {elapsed:.2f}s")
+    storage.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
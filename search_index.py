@@ -0,0 +1,192 @@
+# search_index.py
+# 회고(q1/q2/q3/summary)와 집중 작업 이름을 찾는 글자 n-gram 역색인
+#
+# 한국어는 띄어쓰기 단위가 검색어와 잘 맞지 않아서(예: '코딩' 으로 '코딩을' 찾기)
+# 낱말 대신 두 글자씩 끊은 조각(bigram)으로 색인합니다. 검색어의 조각을 모두 가진 기록만
+# 후보가 되고, 검색어가 그대로 들어 있으면 점수를 더 줘요.
+import heapq
+import sys
+import threading
+import unicodedata
+from array import array
+
+GRAM_SIZE = 2
+COMPACT_RATIO = 0.5 # 지운 문서 칸이 이만큼 쌓이면 색인을 새로 정리
+
+
+def normalize(text):
+    # 전각/반각, 대소문자, 공백 차이를 없앤 검색용 문자열
+    return " ".join(unicodedata.normalize("NFKC", text or "").lower().split())
+
+
+def grams(normalized):
+    # normalize() 한 글의 낱말마다 GRAM_SIZE 글자 조각. 한 글자 낱말은 그 글자 하나 (조각 집합을 돌려줘요)
+    result = set()
+    for word in normalized.split(" "):
+        if len(word) <= GRAM_SIZE:
+            if word:
+                result.add(word)
+        else:
+            result.update([word[i:i + GRAM_SIZE] for i in range(len(word) - GRAM_SIZE + 1)])
+    return result
+
+
+def reflection_document(reflection):
+    return "\n".join(reflection.get(field) or "" for field in ('q1', 'q2', 'q3', 'summary'))
+
+
+class SearchHit:
+    """검색 결과 한 건. key 는 작업이면 task id, 회고면 날짜예요."""
+
+    __slots__ = ('kind', 'key', 'date', 'text', 'score')
+
+    def __init__(self, kind, key, date, text, score):
+        self.kind = kind
+        self.key = key
+        self.date = date
+        self.text = text
+        self.score = score
+
+    def snippet(self, query, width=40):
+        # 검색어 첫 낱말이 처음 나오는 곳 주변만 잘라 보여줘요
+        text = self.text.replace("\n", " / ")
+        words = normalize(query).split(" ")
+        position = text.lower().find(words[0]) if words[0] else -1
+        start = max(0, min(position - width // 2, len(text) - width * 2))
+        end = start + width * 2
+        return ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+class SearchIndex:
+    """한 사용자의 작업 / 회고를 담는 증분 역색인.
+
+    문서마다 번호를 하나씩 늘려 가며 매기므로 조각별 문서 번호 목록(array)은 늘 정렬되어 있고
+    추가는 끝에 덧붙이기만 하면 돼요. 고치거나 지운 문서는 칸만 비워 두었다가(tombstone)
+    빈 칸이 많아지면 남은 문서만으로 번호를 새로 매깁니다.
+
+    저장소에서 처음 읽는 일은 검색할 때까지 미뤄요(ensure_loaded). 그 전에 들어온
+    update 는 버려도 됩니다 (저장된 뒤에 읽으니 어차피 들어 있음).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loaded = False
+        self._reset()
+
+    def _reset(self):
+        self._docs = []       # 문서 번호 -> (kind, key, date, text, 검색용 text, 조각 수) / 지운 칸은 None
+        self._doc_by_key = {} # (kind, key) -> 문서 번호
+        self._postings = {}   # 조각 -> array('I', 문서 번호들)
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._doc_by_key)
+
+    # --- 채우기 / 고치기 ---
+    def ensure_loaded(self, storage, user_id):
+        with self._lock:
+            if self.loaded:
+                return
+            self._reset()
+            for task in storage.iter_tasks(user_id):
+                self._add('task', task['id'], task['date'], task['name'])
+            for date_str, reflection in storage.iter_reflections(user_id):
+                self._add('reflection', date_str, date_str, reflection_document(reflection))
+            self.loaded = True
+
+    def invalidate(self):
+        # 가져오기처럼 저장소가 통째로 바뀌었을 때: 다음 검색에서 다시 읽어요
+        with self._lock:
+            self.loaded = False
+            self._reset()
+
+    def update(self, tasks=(), reflections=()):
+        # 저장된 작업 / (date, 회고) 를 색인에 반영합니다 (같은 key 면 바꿔 넣기)
+        with self._lock:
+            if not self.loaded:
+                return
+            for task in tasks:
+                self._add('task', task['id'], task['date'], task['name'])
+            for date_str, reflection in reflections:
+                self._add('reflection', date_str, date_str, reflection_document(reflection))
+            if self._removed > COMPACT_RATIO * max(1, len(self._docs)):
+                self._compact()
+
+    def _add(self, kind, key, date_str, text):
+        old = self._doc_by_key.get((kind, key))
+        if old is not None:
+            if self._docs[old][3] == text and self._docs[old][2] == date_str:
+                return
+            self._docs[old] = None
+            self._removed += 1
+        doc_no = len(self._docs)
+        text = sys.intern(text) if kind == 'task' else text # 같은 작업 이름이 여러 번 나와도 문자열은 하나만
+        search_text = normalize(text)
+        if search_text == text:
+            search_text = text
+        doc_grams = grams(search_text)
+        self._docs.append((kind, key, date_str, text, search_text, max(1, len(doc_grams))))
+        self._doc_by_key[(kind, key)] = doc_no
+        for gram in doc_grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                self._postings[gram] = array('I', (doc_no,))
+            else:
+                posting.append(doc_no)
+
+    def _compact(self):
+        live = [doc for doc in self._docs if doc is not None]
+        self._reset()
+        for kind, key, date_str, text, _, _ in live:
+            self._add(kind, key, date_str, text)
+
+    # --- 검색 ---
+    def _candidates(self, query_grams):
+        postings = []
+        for gram in query_grams:
+            if len(gram) < GRAM_SIZE:
+                # 한 글자 검색어는 그 글자가 들어간 조각들의 합집합
+                merged = set()
+                for indexed_gram, posting in self._postings.items():
+                    if gram in indexed_gram:
+                        merged.update(posting)
+                postings.append(merged)
+            else:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return set()
+                postings.append(posting)
+        postings.sort(key=len) # 가장 짧은 목록부터 좁혀 가요
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, query, since="", until="9999-12-31", kinds=None, limit=100):
+        """query 의 조각을 모두 가진 문서 중 since <= date <= until 인 것을 점수 순서로
+        limit 개까지 찾아 (SearchHit 목록, 조건에 맞는 전체 수) 로 돌려줍니다.
+
+        점수: 검색어 낱말이 그대로 나온 횟수(낱말마다 최대 3번) × 2
+              + 짧은 문서일수록 조금 더 (조각이 많이 겹칠수록).  같은 점수면 최근 날짜부터.
+        """
+        normalized = normalize(query)
+        words = normalized.split(" ") if normalized else []
+        query_grams = grams(normalized)
+        if not query_grams:
+            return [], 0
+        with self._lock:
+            candidates = self._candidates(query_grams)
+            scored = []
+            for doc_no in candidates:
+                doc = self._docs[doc_no]
+                if doc is None:
+                    continue
+                kind, key, date_str, text, search_text, gram_count = doc
+                if (kinds is not None and kind not in kinds) or not since <= date_str <= until:
+                    continue
+                score = 2 * sum(min(3, search_text.count(word)) for word in words) + len(query_grams) / gram_count
+                scored.append((score, date_str, doc_no))
+            top = heapq.nlargest(limit, scored)
+            return [SearchHit(*self._docs[doc_no][:4], round(score, 2)) for score, _, doc_no in top], len(scored)
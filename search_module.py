@@ -0,0 +1,55 @@
+# search_module.py
+# 4. 기록 검색 모듈 - 탭을 처음 열 때 불러옵니다
+import time
+import streamlit as st
+import profiling
+from assistant_common import get_search_index, get_storage
+from history_view import select_history_date_range, render_history_page
+
+SEARCH_LIMIT = 200 # 점수 순서로 보여줄 최대 결과 수
+KIND_OPTIONS = {
+    "전체": None,
+    "🌙 회고": ('reflection',),
+    "🧠 집중 작업": ('task',),
+}
+KIND_LABELS = {'reflection': "🌙 회고", 'task': "🧠 작업"}
+
+def history_search_module():
+    profiling.section("search.input")
+    st.markdown("## 🔎 나의 기록 검색")
+    st.write("지난 회고와 집중 작업을 낱말 일부만으로도 찾아보세요. (예: '코딩' 으로 '코딩을', '코딩하며' 까지)")
+
+    st.markdown("---")
+    query = st.text_input("검색어를 입력하세요", key="history_search_query", placeholder="예: 산책, 보고서, 배웠다")
+    kind_label = st.radio("찾을 기록", list(KIND_OPTIONS), horizontal=True, key="history_search_kind")
+    start_date, end_date = select_history_date_range("history_search_range", default_days=365)
+
+    if not query.strip():
+        st.info("검색어를 입력하면 조회 기간 안의 기록을 찾아드려요! ✨")
+        return
+
+    profiling.section("search.query")
+    user_id = st.session_state.user_id
+    search_index = get_search_index(user_id)
+    search_index.ensure_loaded(get_storage(), user_id) # 처음 검색할 때만 저장소에서 색인을 만들어요
+    started = time.perf_counter()
+    hits, total = search_index.search(
+        query, since=start_date.strftime("%Y-%m-%d"), until=end_date.strftime("%Y-%m-%d"),
+        kinds=KIND_OPTIONS[kind_label], limit=SEARCH_LIMIT
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    profiling.section("search.results")
+    if not hits:
+        st.info(f"'{query}' 이(가) 들어간 기록을 찾지 못했어요. 다른 낱말이나 조회 기간으로 찾아볼까요? 🔎")
+        return
+    st.success(f"🔎 `{total}`개 기록을 찾았어요! (`{elapsed_ms:.1f}`ms)")
+    if total > len(hits):
+        st.caption(f"관련도가 높은 상위 `{len(hits)}`개만 보여드려요. 검색어를 더 구체적으로 적어보세요.")
+    # 일치한 기록 중 현재 페이지만 표로 그려요
+    render_history_page(hits, lambda hit: {
+        '날짜': hit.date,
+        '종류': KIND_LABELS[hit.kind],
+        '내용': hit.snippet(query),
+        '관련도': hit.score,
+    }, key="history_search_page")
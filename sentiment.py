@@ -0,0 +1,228 @@
+# sentiment.py
+# 자기전 회고의 감성 분석: 어간 사전을 하나의 정규식으로 미리 컴파일해 한 번에 훑어요
+import bisect
+import collections
+import functools
+import hashlib
+import os
+import re
+from datetime import date
+
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sentiment_lexicon.tsv")
+
+# 어간 바로 뒤에 붙으면 뜻이 뒤집히는 부정 표현 (예: '행복하지 않았다', '만족 못 했다', '재미없')
+NEGATION_AFTER = re.compile(r"[가-힣]{0,3}?\s?(?:지\s?않|지\s?못|않|없|못)")
+# 어간 바로 앞에 오는 부정 부사 (예: '안 좋은', '못 배운')
+NEGATION_BEFORE = ("안 ", "못 ")
+
+
+def reflection_text(q1, q2, q3):
+    # 감성 점수를 매길 때 쓰는 회고 전문 (저장할 때와 다시 분석할 때 똑같이 만들어야 해요)
+    return f"기뻤던 일: {q1}. 배운 점: {q2}. 내일 기대: {q3}."
+
+
+def lexicon_version(lexicon):
+    # 사전 내용이 바뀌면 달라지는 짧은 버전 값. 회고마다 저장해 두고 오래된 점수를 찾아냅니다
+    digest = hashlib.sha1()
+    for stem, weight in sorted(lexicon.items()):
+        digest.update(f"{stem}\t{weight}\n".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def load_lexicon(path=LEXICON_PATH):
+    lexicon = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            stem, weight = line.split("\t")
+            lexicon[stem] = float(weight)
+    return lexicon
+
+
+def _trie_pattern(words):
+    # 어간들을 트라이로 묶은 정규식을 만듭니다. 공통 접두사를 한 번만 비교하므로
+    # 어간이 수천 개여도 위치마다 모든 어간을 하나씩 대보지 않아요 (가장 긴 어간 우선)
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        terminal = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class SentimentMatcher:
+    """어간 사전(어간 -> 가중치)을 미리 컴파일한 감성 매처.
+
+    hits() 는 글을 한 번만 훑으며 어간별 가중치 합을 돌려주고,
+    부정 표현이 붙은 어간은 가중치의 부호를 뒤집어 셉니다.
+    """
+
+    def __init__(self, lexicon):
+        self.lexicon = dict(lexicon)
+        self.version = lexicon_version(self.lexicon)
+        self._pattern = re.compile(_trie_pattern(self.lexicon)) if self.lexicon else None
+
+    def hits(self, text):
+        hits = {}
+        if self._pattern is None:
+            return hits
+        for match in self._pattern.finditer(text):
+            stem = match.group()
+            if not stem:
+                continue
+            weight = self.lexicon[stem]
+            if NEGATION_AFTER.match(text, match.end()) or text[max(0, match.start() - 2):match.start()] in NEGATION_BEFORE:
+                weight = -weight
+            hits[stem] = hits.get(stem, 0) + weight
+        return hits
+
+    def score(self, text):
+        return sum(self.hits(text).values())
+
+
+def sentiment_label(score):
+    if score > 0:
+        return "긍정적"
+    elif score < 0:
+        return "부정적"
+    return "중립적"
+
+
+def rescore_reflections(items, matcher):
+    """(key, 회고 dict) 들을 하나씩 현재 사전으로 다시 채점합니다.
+
+    key 는 보통 날짜이고 그대로 돌려줘요. 전체를 한꺼번에 만들지 않고
+    (key, score, label) 을 하나씩 내보내므로
+    호출하는 쪽에서 진행률을 보여주거나 일정 개수마다 저장할 수 있어요.
+    """
+    for key, data in items:
+        score = matcher.score(reflection_text(data['q1'], data['q2'], data['q3']))
+        yield key, score, sentiment_label(score)
+
+
+class SentimentTrend:
+    """회고 감성의 통계: 감성별 횟수와 날짜별 7일/30일 이동 평균.
+
+    from_scores() 가 저장된 점수를 날짜 순서대로 한 번 훑으며 창(window)마다
+    합계를 들고 다니므로, 창 안의 점수를 날짜마다 다시 더하지 않아요.
+    회고가 더해지거나 다시 채점되면 with_changes() 가 바뀐 날짜와, 그 날짜를
+    창 안에 두는 뒤쪽 날짜(최대 30일)의 평균만 다시 계산한 새 통계를 돌려줍니다.
+    여러 세션이 같은 통계를 읽으므로 만든 뒤에는 고쳐 쓰지 않아요.
+    """
+
+    # 바뀐 날짜가 전체의 이 비율을 넘으면(사전 변경 뒤 일괄 재채점 등) 한 번 훑어 전부 다시 계산
+    FULL_PASS_RATIO = 0.25
+
+    def __init__(self, windows=(7, 30)):
+        self.windows = windows
+        self.label_counts = {}
+        self.total = 0
+        self.rows = {} # date -> {'점수', '7일 평균', '30일 평균'}
+        self.version = 0 # 반영한 마지막 회고 변경 번호 (storage.reflection_version)
+        self._dates = [] # 정렬된 날짜와 그 서수 (이동 평균 창을 bisect 로 찾음)
+        self._ordinals = []
+        self._labels = {} # date -> 감성
+
+    @classmethod
+    def from_scores(cls, rows, version=0):
+        # rows: (date, score, label). 회고 본문 없이 점수만으로 만들 수 있어요 (날짜는 사용자마다 하나씩)
+        trend = cls()
+        for date_str, score, label in sorted(rows):
+            trend._dates.append(date_str)
+            trend._ordinals.append(date.fromisoformat(date_str).toordinal())
+            trend._set(date_str, score, label)
+        trend._fill_all()
+        trend.version = version
+        return trend
+
+    def with_changes(self, rows, version):
+        """rows (date, score, label) 를 더하거나 고친 새 통계를 돌려줍니다 (이 통계는 그대로).
+
+        같은 날짜를 다시 넣어도 결과가 같아서, 이미 반영한 변경이 섞여 와도 괜찮아요.
+        """
+        trend = SentimentTrend(self.windows)
+        trend.label_counts = dict(self.label_counts)
+        trend.total = self.total
+        trend.rows = dict(self.rows)
+        trend._dates = list(self._dates)
+        trend._ordinals = list(self._ordinals)
+        trend._labels = dict(self._labels)
+        changed = []
+        for date_str, score, label in rows:
+            if date_str not in trend._labels:
+                index = bisect.bisect_left(trend._dates, date_str)
+                trend._dates.insert(index, date_str)
+                trend._ordinals.insert(index, date.fromisoformat(date_str).toordinal())
+            trend._set(date_str, score, label)
+            changed.append(date_str)
+        if len(changed) > len(trend._dates) * self.FULL_PASS_RATIO:
+            trend._fill_all()
+        else:
+            longest = max(self.windows)
+            affected = set()
+            for date_str in changed:
+                first = bisect.bisect_left(trend._dates, date_str)
+                ordinal = trend._ordinals[first]
+                affected.update(range(first, bisect.bisect_left(trend._ordinals, ordinal + longest)))
+            for index in affected:
+                trend._fill(index)
+        trend.version = max(self.version, version)
+        return trend
+
+    def _set(self, date_str, score, label):
+        # 날짜의 점수 / 감성을 바꾸고 횟수를 맞춥니다 (평균은 _fill 이 채움)
+        old_label = self._labels.get(date_str)
+        if old_label is None:
+            self.total += 1
+        else:
+            self.label_counts[old_label] -= 1
+            if not self.label_counts[old_label]:
+                del self.label_counts[old_label]
+        self._labels[date_str] = label
+        self.label_counts[label] = self.label_counts.get(label, 0) + 1
+        self.rows[date_str] = {'점수': score or 0}
+
+    def _fill_all(self):
+        # 모든 날짜의 평균을 한 번 훑어 채워요. 창마다 (서수, 점수) 와 합계를 들고 다닙니다
+        recent = {window: collections.deque() for window in self.windows}
+        sums = {window: 0.0 for window in self.windows}
+        for date_str, ordinal in zip(self._dates, self._ordinals):
+            score = self.rows[date_str]['점수']
+            row = {'점수': score}
+            for window in self.windows:
+                recent[window].append((ordinal, score))
+                sums[window] += score
+                while recent[window][0][0] <= ordinal - window:
+                    sums[window] -= recent[window].popleft()[1]
+                row[f'{window}일 평균'] = sums[window] / len(recent[window])
+            self.rows[date_str] = row
+
+    def _fill(self, index):
+        # index 번째 날짜 하나의 평균을 창 안의 점수로 다시 계산 (행은 새 dict 로 바꿔 넣어요)
+        date_str, ordinal = self._dates[index], self._ordinals[index]
+        row = {'점수': self.rows[date_str]['점수']}
+        for window in self.windows:
+            first = bisect.bisect_right(self._ordinals, ordinal - window, 0, index)
+            scores = [self.rows[self._dates[i]]['점수'] for i in range(first, index + 1)]
+            row[f'{window}일 평균'] = sum(scores) / len(scores)
+        self.rows[date_str] = row
+
+
+@functools.lru_cache(maxsize=None)
+def get_matcher(path=LEXICON_PATH):
+    # 프로세스당 한 번만 사전을 읽고 컴파일해 모든 세션이 함께 씁니다
+    return SentimentMatcher(load_lexicon(path))
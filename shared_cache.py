@@ -0,0 +1,260 @@
+# shared_cache.py
+# 한 서버(노드)에서 도는 여러 Streamlit 프로세스가 함께 쓰는 SQLite 캐시
+#
+# 프로세스마다 같은 결과 카드 / 분석 결과를 다시 만들지 않도록, 한 번 만든 값을 pickle 해서
+# 파일 하나에 (namespace, key) 마다 하나씩 둡니다. 값에는 버전이 붙어 있어서 데이터가 바뀌면
+# (버전이 다르면) 없는 것으로 보고 새로 만들어요. 용량을 넘으면 오래 안 쓴 값부터, 유효 시간이
+# 지난 값은 읽을 때 지웁니다. 적중 / 놓침 수는 모든 프로세스 것을 합쳐 파일에 남겨요.
+#
+#   python shared_cache.py [캐시 경로] [--clear]    # 통계를 JSON 으로 출력 (--clear 는 값을 모두 지움)
+#
+# key / version 은 pickle 결과가 프로세스마다 같은 값(str, int, float, bytes 와 그 tuple)만 써야 해요.
+# (set / dict 는 문자열 해시 순서가 프로세스마다 달라서 안 됨)
+import atexit
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+
+SHARED_CACHE_PATH = os.environ.get(
+    "ASSISTANT_SHARED_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_cache.db")
+)
+SHARED_CACHE_MAX_BYTES = int(os.environ.get("ASSISTANT_SHARED_CACHE_MB", "256")) * 1024 * 1024
+STATS_FLUSH_SECONDS = 5.0 # 프로세스의 적중 / 놓침 수를 이 간격으로 모아서 파일에 더해요
+TOUCH_SECONDS = 30.0      # 마지막 사용 시각은 이보다 오래됐을 때만 고쳐 씀 (읽을 때마다 쓰지 않도록)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    compute_ms REAL NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS cache_entries_by_access ON cache_entries (accessed_at);
+
+CREATE TABLE IF NOT EXISTS cache_stats (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    stores INTEGER NOT NULL DEFAULT 0,
+    evictions INTEGER NOT NULL DEFAULT 0,
+    saved_ms REAL NOT NULL DEFAULT 0
+);
+"""
+
+SELECT_ENTRY = "SELECT version, value, compute_ms, expires_at, accessed_at FROM cache_entries WHERE namespace = ? AND key = ?"
+DELETE_ENTRY = "DELETE FROM cache_entries WHERE namespace = ? AND key = ?"
+TOUCH_ENTRY = "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?"
+UPSERT_ENTRY = ("INSERT OR REPLACE INTO cache_entries (namespace, key, version, value, size, compute_ms, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+DELETE_EXPIRED = "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ? RETURNING namespace"
+TOTAL_SIZE = "SELECT TOTAL(size) FROM cache_entries"
+OLDEST_ENTRIES = "SELECT namespace, key, size FROM cache_entries ORDER BY accessed_at LIMIT ?"
+ADD_STATS = ("INSERT INTO cache_stats (namespace, hits, misses, stores, evictions, saved_ms) VALUES (?, ?, ?, ?, ?, ?) "
+             "ON CONFLICT (namespace) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses, "
+             "stores = stores + excluded.stores, evictions = evictions + excluded.evictions, saved_ms = saved_ms + excluded.saved_ms")
+SELECT_STATS = ("SELECT s.namespace, s.hits, s.misses, s.stores, s.evictions, s.saved_ms, COUNT(e.key), TOTAL(e.size) "
+                "FROM cache_stats s LEFT JOIN cache_entries e ON e.namespace = s.namespace GROUP BY s.namespace ORDER BY s.namespace")
+
+STAT_FIELDS = ('hits', 'misses', 'stores', 'evictions', 'saved_ms')
+
+
+def digest(obj):
+    # key / version 을 프로세스가 달라도 같은 짧은 문자열로
+    return hashlib.sha1(pickle.dumps(obj, protocol=4)).hexdigest()
+
+
+class SharedCache:
+    """여러 프로세스가 함께 쓰는 (namespace, key) -> (버전, 값) 캐시 (SQLite, WAL 모드).
+
+    프로세스마다 연결 하나를 만들어 모든 스레드가 잠금으로 나눠 씁니다 (Storage 와 같은 방식).
+    두 프로세스가 같은 값을 동시에 놓치면 둘 다 만들 수 있지만, 나중에 쓴 값 하나만 남아요.
+    """
+
+    def __init__(self, path, max_bytes=SHARED_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0, cached_statements=32)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.local_stats = {} # 이 프로세스의 namespace -> {'hits', 'misses', 'stores', 'evictions', 'saved_ms'}
+        self._pending = {}    # 아직 파일에 더하지 않은 같은 모양의 수
+        self._flushed_at = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._flush_stats()
+            self._conn.close()
+
+    def flush_stats(self):
+        # 모아 둔 이 프로세스의 수를 지금 파일에 더합니다 (프로세스가 끝날 때 등)
+        with self._lock:
+            self._flush_stats()
+
+    # --- 읽기 / 쓰기 ---
+    def get(self, namespace, key, version):
+        """(찾았는지, 값). 버전이 다르거나 유효 시간이 지났거나 읽을 수 없는 값이면 (False, None)."""
+        key_digest, version_digest = digest(key), digest(version)
+        try:
+            row = self._read(namespace, key_digest, version_digest)
+        except sqlite3.OperationalError: # 다른 프로세스가 오래 잠그고 있으면 캐시 없이 계속해요
+            row = None
+        if row is not None:
+            try:
+                value = pickle.loads(row[1])
+            except Exception: # 코드가 바뀌어 예전 값을 읽을 수 없으면 없는 셈 치고 다시 만들어요
+                with self._lock, self._conn:
+                    self._conn.execute(DELETE_ENTRY, (namespace, key_digest))
+                row = None
+        with self._lock:
+            if row is None:
+                self._count(namespace, misses=1)
+            else:
+                self._count(namespace, hits=1, saved_ms=row[2])
+            if time.monotonic() - self._flushed_at > STATS_FLUSH_SECONDS:
+                self._flush_stats()
+        return (True, value) if row is not None else (False, None)
+
+    def _read(self, namespace, key_digest, version_digest):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(SELECT_ENTRY, (namespace, key_digest)).fetchone()
+            if row is None:
+                return None
+            if row[3] is not None and row[3] < now:
+                with self._conn:
+                    self._conn.execute(DELETE_ENTRY, (namespace, key_digest))
+                return None
+            if row[0] != version_digest:
+                return None # 새 버전을 만들어 put 하면 바뀌어요
+            if now - row[4] > TOUCH_SECONDS:
+                with self._conn:
+                    self._conn.execute(TOUCH_ENTRY, (now, namespace, key_digest))
+            return row
+
+    def put(self, namespace, key, version, value, ttl=None, compute_ms=0.0):
+        # ttl 초가 지나면 버전이 같아도 다시 만들어요 (None 이면 용량이 찰 때까지 둠)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(UPSERT_ENTRY, (
+                        namespace, digest(key), digest(version), blob, len(blob), compute_ms,
+                        None if ttl is None else now + ttl, now,
+                    ))
+                    self._evict(now)
+                self._count(namespace, stores=1)
+                self._flush_stats()
+            except sqlite3.OperationalError: # 못 넣어도 다음에 다시 만들면 되니 그냥 넘어가요
+                pass
+
+    def get_or_compute(self, namespace, key, version, compute, *args, ttl=None):
+        found, value = self.get(namespace, key, version)
+        if found:
+            return value
+        started = time.perf_counter()
+        value = compute(*args)
+        self.put(namespace, key, version, value, ttl=ttl, compute_ms=(time.perf_counter() - started) * 1000)
+        return value
+
+    def clear(self, namespace=None):
+        with self._lock, self._conn:
+            if namespace is None:
+                self._conn.execute("DELETE FROM cache_entries")
+            else:
+                self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def _evict(self, now):
+        # 유효 시간이 지난 값을 지우고, 그래도 용량을 넘으면 오래 안 쓴 값부터 (잠금 + 트랜잭션 안에서 불러요)
+        for (namespace,) in self._conn.execute(DELETE_EXPIRED, (now,)).fetchall():
+            self._count(namespace, evictions=1)
+        excess = self._conn.execute(TOTAL_SIZE).fetchone()[0] - self.max_bytes
+        while excess > 0:
+            oldest = self._conn.execute(OLDEST_ENTRIES, (64,)).fetchall()
+            if not oldest:
+                break
+            for namespace, key_digest, size in oldest:
+                self._conn.execute(DELETE_ENTRY, (namespace, key_digest))
+                self._count(namespace, evictions=1)
+                excess -= size
+                if excess <= 0:
+                    break
+
+    # --- 통계 ---
+    def _count(self, namespace, **counts):
+        for target in (self.local_stats, self._pending):
+            stats = target.setdefault(namespace, dict.fromkeys(STAT_FIELDS, 0))
+            for field, count in counts.items():
+                stats[field] += count
+
+    def _flush_stats(self):
+        self._flushed_at = time.monotonic()
+        if not self._pending:
+            return
+        rows = [(namespace, *(stats[field] for field in STAT_FIELDS)) for namespace, stats in self._pending.items()]
+        try:
+            with self._conn:
+                self._conn.executemany(ADD_STATS, rows)
+        except sqlite3.OperationalError:
+            return # 잠겨 있으면 모아 둔 수를 다음에 더해요
+        self._pending = {}
+
+    def stats(self):
+        """모든 프로세스를 합친 namespace 별 통계 목록.
+
+        hit_rate 는 적중 비율, saved_ms 는 적중한 값을 처음 만들 때 걸렸던 시간의 합
+        (= 다시 만들지 않아 아낀 시간), entries / bytes 는 지금 들고 있는 값이에요.
+        """
+        with self._lock:
+            self._flush_stats()
+            rows = self._conn.execute(SELECT_STATS).fetchall()
+        return [
+            {
+                'namespace': namespace, 'hits': hits, 'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                'stores': stores, 'evictions': evictions, 'saved_ms': round(saved_ms, 1),
+                'entries': entries, 'bytes': int(size),
+            }
+            for namespace, hits, misses, stores, evictions, saved_ms, entries, size in rows
+        ]
+
+
+def file_stamp(*paths):
+    # 파일이 바뀌면 달라지는 버전 값: 파일마다 (수정 시각 ns, 크기)
+    return tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths)
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_cache(path=SHARED_CACHE_PATH):
+    # 프로세스당 연결 하나를 모든 세션 / 스레드가 함께 씁니다
+    cache = SharedCache(path)
+    atexit.register(cache.flush_stats) # 마지막 STATS_FLUSH_SECONDS 동안의 수도 남기기
+    return cache
+
+
+def main(argv):
+    paths = [arg for arg in argv if not arg.startswith("--")]
+    cache = SharedCache(paths[0] if paths else SHARED_CACHE_PATH)
+    if "--clear" in argv:
+        cache.clear()
+    print(json.dumps(cache.stats(), ensure_ascii=False, indent=2))
+    cache.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
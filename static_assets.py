@@ -0,0 +1,189 @@
+# static_assets.py
+# main.py 테마의 스타일시트와 글꼴을 static/ 에 내용 해시가 붙은 이름으로 묶어 두는 곳
+#
+#   python static_assets.py            # assets/ 를 다시 묶고(지난 해시 파일은 지움) manifest 를 JSON 으로 출력
+#   python static_assets.py --check    # static/ 이 assets/ 와 맞는지, 글꼴이 묶였는지만 확인 (배포 전 검사용)
+#
+# 묶는 건 배포할 때 한 번 하는 일이에요. 실행 중인 서버는 static/ 을 읽기만 하고 아무것도 쓰지 않으며,
+# 묶어 둔 것이 없으면 main.py 가 스타일시트를 인라인으로 보냅니다.
+#
+# 묶은 파일은 Streamlit 의 정적 파일 서빙(.streamlit/config.toml 의 server.enableStaticServing)으로
+# app/static/<이름> 에서 내려갑니다. 내용이 바뀌면 이름(주소)도 바뀌니 브라우저가 오래 캐시해도 안전해요.
+# Streamlit 은 app/static 에 Cache-Control 을 붙이지 않고 ETag 로 다시 확인만 하므로, 앞단 프록시가 있다면
+# app/static/*.<해시>.* 에 "Cache-Control: public, max-age=31536000, immutable" 을 붙여 주세요.
+#
+# 글꼴은 assets/fonts/ 의 Baloo 2 woff2 파일(Baloo2-Regular.woff2, Baloo2-Bold.woff2, SIL OFL 이라 함께
+# 배포 가능, https://fonts.google.com/specimen/Baloo+2)을 @font-face 로 붙여 외부 요청 없이 씁니다. 파일을
+# 아직 넣지 않았으면 예전처럼 fonts.googleapis.com 의 글꼴을 @import 하고(렌더링을 막는 요청 하나가 남음),
+# 묶을 때 경고를 내고 --check 는 실패해요.
+import argparse
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(APP_DIR, "assets")
+STATIC_DIR = os.path.join(APP_DIR, "static") # Streamlit 은 실행한 스크립트 옆의 static/ 을 내려줘요
+STATIC_URL = "app/static/"
+MANIFEST_NAME = "asset_manifest.json"
+HASH_LENGTH = 10
+
+STYLESHEETS = ("theme.css",)
+# (글꼴 이름, assets/ 안의 파일, 굵기). Baloo 2 는 SIL OFL 글꼴이라 함께 배포해도 됩니다
+FONT_FACES = (
+    ("Baloo 2", "fonts/Baloo2-Regular.woff2", "400"),
+    ("Baloo 2", "fonts/Baloo2-Bold.woff2", "700"),
+)
+REMOTE_FONT_IMPORT = "@import url('https://fonts.googleapis.com/css2?family=Baloo+2:wght@400;700&display=swap');\n"
+FINGERPRINTED = re.compile(r"^.+\.[0-9a-f]{%d}\.[A-Za-z0-9]+$" % HASH_LENGTH) # 지난 빌드가 남긴 파일 찾기
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprint(name, data):
+    # 'theme.css' -> 'theme.<해시>.css'
+    stem, ext = os.path.splitext(os.path.basename(name))
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def read_sources(assets_dir=ASSETS_DIR):
+    # 묶을 원본들: assets/ 안의 경로 -> bytes (없는 글꼴은 빠짐)
+    sources = {}
+    for name in STYLESHEETS + tuple(path for _, path, _ in FONT_FACES):
+        path = os.path.join(assets_dir, name)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                sources[name] = f.read()
+    return sources
+
+
+def sources_digest(sources):
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(name.encode("utf-8") + b"\0" + sources[name] + b"\0")
+    return digest.hexdigest()
+
+
+def replace_file(path, data):
+    # 서버가 떠 있는 채로 다시 묶어도 반쯤 쓴 파일이 내려가지 않도록 임시 파일에 쓰고 바꿔 넣어요
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def write_fingerprinted(path, data):
+    # 이름에 내용 해시가 있으니 이미 있으면 같은 내용이에요
+    if not os.path.exists(path):
+        replace_file(path, data)
+
+
+def missing_fonts(sources):
+    return [name for _, name, _ in FONT_FACES if name not in sources]
+
+
+def build(assets_dir=ASSETS_DIR, static_dir=STATIC_DIR, prune=False):
+    """assets/ 를 static/ 에 묶고 manifest ({'files': 원본 -> 묶은 이름, 'sources': 원본 digest}) 를 돌려줍니다.
+
+    prune 이면 지난 빌드의 해시 이름 파일을 지워요. 배포 중에 옛 주소를 쓰는 서버 프로세스가 남아 있다면
+    그 프로세스를 내린 뒤에 지우세요.
+    """
+    os.makedirs(static_dir, exist_ok=True)
+    sources = read_sources(assets_dir)
+    files = {}
+    font_rules = []
+    for family, name, weight in FONT_FACES:
+        if name not in sources:
+            continue
+        files[name] = fingerprint(name, sources[name])
+        write_fingerprinted(os.path.join(static_dir, files[name]), sources[name])
+        # 스타일시트와 같은 폴더라 상대 주소로 충분해요. swap: 글꼴을 받는 동안에도 대체 글꼴로 바로 그림
+        font_rules.append(
+            f"@font-face {{ font-family: '{family}'; font-style: normal; font-weight: {weight}; "
+            f"font-display: swap; src: url('{files[name]}') format('woff2'); }}\n"
+        )
+    # 묶을 글꼴 파일이 없으면 원격 글꼴을 그대로 씁니다 (@import 는 스타일시트 맨 앞에 있어야 해요)
+    font_css = "".join(font_rules) if font_rules else REMOTE_FONT_IMPORT
+    for name in STYLESHEETS:
+        data = font_css.encode("utf-8") + sources[name]
+        files[name] = fingerprint(name, data)
+        write_fingerprinted(os.path.join(static_dir, files[name]), data)
+
+    manifest = {'files': files, 'sources': sources_digest(sources)}
+    replace_file(os.path.join(static_dir, MANIFEST_NAME), (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+    if prune:
+        current = set(files.values())
+        for name in os.listdir(static_dir):
+            if FINGERPRINTED.match(name) and name not in current:
+                os.remove(os.path.join(static_dir, name))
+    return manifest
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    try:
+        with open(os.path.join(static_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_manifest():
+    # 프로세스당 한 번 읽기만 해요. 묶는 건 배포 단계(python static_assets.py)의 일이라 여기서는 쓰지 않습니다
+    return load_manifest()
+
+
+def asset_url(name):
+    # 'theme.css' -> 'app/static/theme.<해시>.css' (페이지 주소 기준 상대 경로라 baseUrlPath 아래서도 동작).
+    # 묶어 둔 것이 없으면 None
+    manifest = get_manifest()
+    if manifest is None or name not in manifest['files']:
+        return None
+    return STATIC_URL + manifest['files'][name]
+
+
+@functools.lru_cache(maxsize=None)
+def theme_css():
+    # 정적 파일 서빙 없이 인라인으로 보낼 때 쓸 스타일시트 (글꼴 파일은 내려줄 주소가 없어 원격 글꼴을 씀)
+    with open(os.path.join(ASSETS_DIR, "theme.css"), encoding="utf-8") as f:
+        return REMOTE_FONT_IMPORT + f.read()
+
+
+def check(assets_dir=ASSETS_DIR, static_dir=STATIC_DIR):
+    # 배포 전 검사: 문제 목록 (비어 있으면 통과)
+    sources = read_sources(assets_dir)
+    problems = [f"missing font {name}: the theme falls back to the remote Google Fonts @import"
+                for name in missing_fonts(sources)]
+    manifest = load_manifest(static_dir)
+    if manifest is None:
+        problems.append("static/ has no manifest: run python static_assets.py")
+    else:
+        if manifest.get('sources') != sources_digest(sources):
+            problems.append("static/ is out of date with assets/: run python static_assets.py")
+        problems += [f"static/{name} is missing" for name in manifest['files'].values()
+                     if not os.path.exists(os.path.join(static_dir, name))]
+    return problems
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="assets/ 의 스타일시트와 글꼴을 static/ 에 내용 해시 이름으로 묶어요 (배포할 때 실행).")
+    parser.add_argument("--check", action="store_true", help="묶지 않고 static/ 이 최신인지, 글꼴이 다 있는지만 확인 (문제가 있으면 종료 코드 1)")
+    args = parser.parse_args(argv)
+    if args.check:
+        problems = check()
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        return 1 if problems else 0
+    for name in missing_fonts(read_sources()):
+        print(f"warning: {name} not found in assets/, using the remote Google Fonts @import", file=sys.stderr)
+    print(json.dumps(build(prune=True), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
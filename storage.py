@@ -0,0 +1,392 @@
+# storage.py
+# 집중 기록 / 습관 / 회고를 로컬 SQLite 에 저장하는 저장소
+import collections
+import sqlite3
+import threading
+
+from records import ReflectionRecord, TaskRecord
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY, -- 새 행을 넣을 때 SQLite 가 매겨요 (INSERT ... RETURNING id)
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    complexity_level TEXT NOT NULL,
+    focus_duration_minutes INTEGER NOT NULL,
+    break_duration_minutes INTEGER NOT NULL,
+    logged_focus_minutes INTEGER NOT NULL,
+    feedback TEXT,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_user ON tasks (user_id, id);
+CREATE INDEX IF NOT EXISTS tasks_by_date ON tasks (user_id, date);
+
+CREATE TABLE IF NOT EXISTS habits (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    creation_date TEXT NOT NULL,
+    bits BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS habits_by_user ON habits (user_id, id);
+
+CREATE TABLE IF NOT EXISTS reflections (
+    user_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    q1 TEXT NOT NULL,
+    q2 TEXT NOT NULL,
+    q3 TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    sentiment_level TEXT NOT NULL,
+    sentiment_score REAL,
+    lexicon_version TEXT,
+    change_seq INTEGER, -- 이 회고를 마지막으로 쓴 때의 사용자별 변경 번호 (아래 트리거가 채움)
+    PRIMARY KEY (user_id, date)
+);
+
+-- 사용자별 회고 변경 번호: 회고를 넣거나(INSERT OR REPLACE 포함) 고칠 때마다 1씩 늘어요
+CREATE TABLE IF NOT EXISTS reflection_changes (
+    user_id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+"""
+
+# 열을 옮긴(MIGRATIONS) 뒤에 만들어요 (change_seq 가 없는 예전 표를 가리키지 않게)
+CHANGE_TRACKING = """
+CREATE INDEX IF NOT EXISTS reflections_by_change ON reflections (user_id, change_seq);
+CREATE TRIGGER IF NOT EXISTS reflections_inserted AFTER INSERT ON reflections BEGIN
+    INSERT INTO reflection_changes (user_id, seq) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET seq = seq + 1;
+    UPDATE reflections SET change_seq = (SELECT seq FROM reflection_changes WHERE user_id = NEW.user_id)
+        WHERE user_id = NEW.user_id AND date = NEW.date;
+END;
+CREATE TRIGGER IF NOT EXISTS reflections_updated
+AFTER UPDATE OF q1, q2, q3, summary, sentiment_level, sentiment_score, lexicon_version ON reflections BEGIN
+    INSERT INTO reflection_changes (user_id, seq) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET seq = seq + 1;
+    UPDATE reflections SET change_seq = (SELECT seq FROM reflection_changes WHERE user_id = NEW.user_id)
+        WHERE user_id = NEW.user_id AND date = NEW.date;
+END;
+"""
+
+# 예전 DB 파일에 없는 열은 열 때 추가해 줍니다: (table, column, 정의)
+MIGRATIONS = (
+    ("reflections", "sentiment_score", "REAL"),
+    ("reflections", "lexicon_version", "TEXT"),
+    ("reflections", "change_seq", "INTEGER"),
+)
+# 예전 DB 는 (user_id, id) 복합 키에 세션이 id 를 매겼어요. 열 때 새 표로 옮기며 SQLite 가 id 를 다시 매기게 합니다: table -> id 뺀 열
+REKEYED_TABLES = {
+    "tasks": TaskRecord.__slots__[1:],
+    "habits": ('name', 'creation_date', 'bits'),
+}
+
+# 매번 같은 SQL 문자열을 써서 sqlite3 의 statement 캐시(prepared statement)를 재사용합니다
+TASK_COLUMNS = TaskRecord.__slots__ # 열 순서 = TaskRecord(*row) 인자 순서
+SELECT_TASKS = "SELECT " + ", ".join(TASK_COLUMNS) + " FROM tasks WHERE user_id = ? AND date >= ? AND date < ? ORDER BY id"
+# 새 작업은 INSERT 로 넣고 SQLite 가 매긴 id 를 받아요. 이미 있는 작업은 그 행만 UPDATE (다른 세션이 넣은 행을 덮어쓰지 않음)
+INSERT_TASK = ("INSERT INTO tasks (user_id, " + ", ".join(TASK_COLUMNS[1:]) + ") "
+               "VALUES (?, " + ", ".join("?" * len(TASK_COLUMNS[1:])) + ") RETURNING id")
+UPDATE_TASK = "UPDATE tasks SET " + ", ".join(f"{column} = ?" for column in TASK_COLUMNS[1:]) + " WHERE user_id = ? AND id = ?"
+MAX_TASK_ID = "SELECT COALESCE(MAX(id), 0) FROM tasks WHERE user_id = ?"
+SCAN_TASKS = "SELECT " + ", ".join(TASK_COLUMNS) + " FROM tasks WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?"
+# 가져오기: 진행 중인 작업은 (name, date) 로 하나만 둡니다. 완료한 작업은 같은 날 같은 이름 / 피드백 / 집중 시간인
+# 작업이 파일에서 n 번째로 나왔을 때, 저장소에 그런 작업이 n 개보다 적을 때만 넣어요 (같은 세션 두 번도 그대로 두 줄,
+# 같은 파일을 다시 가져와도 늘지 않음)
+INSERT_TASK_IF_NEW = ("INSERT INTO tasks (user_id, " + ", ".join(TASK_COLUMNS[1:]) + ") "
+                      "SELECT ?, " + ", ".join("?" * len(TASK_COLUMNS[1:])) + " "
+                      "WHERE (SELECT COUNT(*) FROM tasks WHERE user_id = ? AND date = ? AND name = ? AND feedback IS ? "
+                      "AND (feedback IS NULL OR logged_focus_minutes = ?)) < ?")
+MINUTES_BY_DAY_BEFORE = ("SELECT date, SUM(logged_focus_minutes) FROM tasks "
+                         "WHERE user_id = ? AND date < ? AND logged_focus_minutes > 0 GROUP BY date")
+FEEDBACK_BEFORE = ("SELECT feedback, COUNT(*), SUM(logged_focus_minutes) FROM tasks "
+                   "WHERE user_id = ? AND date < ? AND feedback IS NOT NULL GROUP BY feedback")
+
+SELECT_HABITS = "SELECT id, name, creation_date, bits FROM habits WHERE user_id = ? ORDER BY id"
+INSERT_HABIT = "INSERT INTO habits (user_id, name, creation_date, bits) VALUES (?, ?, ?, ?) RETURNING id"
+UPDATE_HABIT = "UPDATE habits SET name = ?, creation_date = ?, bits = ? WHERE user_id = ? AND id = ?"
+
+REFLECTION_COLUMNS = ('date', *ReflectionRecord.__slots__) # date 다음 열 순서 = ReflectionRecord(*row[1:]) 인자 순서
+SELECT_REFLECTIONS = ("SELECT " + ", ".join(REFLECTION_COLUMNS) + " FROM reflections "
+                      "WHERE user_id = ? AND date >= ? AND date < ? ORDER BY date")
+SELECT_REFLECTION_SCORES = "SELECT date, sentiment_score, sentiment_level FROM reflections WHERE user_id = ? ORDER BY date"
+SELECT_REFLECTION_CHANGES = ("SELECT date, sentiment_score, sentiment_level FROM reflections "
+                             "WHERE user_id = ? AND change_seq > ? ORDER BY date")
+SEED_REFLECTION_CHANGES = "INSERT OR IGNORE INTO reflection_changes (user_id, seq) SELECT DISTINCT user_id, 1 FROM reflections"
+REFLECTION_VERSION = "SELECT COALESCE(MAX(seq), 0) FROM reflection_changes WHERE user_id = ?"
+SCAN_USER_REFLECTIONS = ("SELECT " + ", ".join(REFLECTION_COLUMNS) + " FROM reflections "
+                         "WHERE user_id = ? AND date > ? ORDER BY date LIMIT ?")
+SELECT_STALE_REFLECTIONS = "SELECT date, q1, q2, q3 FROM reflections WHERE user_id = ? AND lexicon_version IS NOT ? ORDER BY date"
+UPSERT_REFLECTION = ("INSERT OR REPLACE INTO reflections (user_id, " + ", ".join(REFLECTION_COLUMNS) + ") "
+                     "VALUES (?, " + ", ".join("?" * len(REFLECTION_COLUMNS)) + ")")
+# 가져오기: 같은 날짜의 회고가 이미 있으면 그대로 둠
+INSERT_REFLECTION_IF_NEW = ("INSERT OR IGNORE INTO reflections (user_id, " + ", ".join(REFLECTION_COLUMNS) + ") "
+                            "VALUES (?, " + ", ".join("?" * len(REFLECTION_COLUMNS)) + ")")
+SCAN_REFLECTIONS = ("SELECT user_id, date, q1, q2, q3, lexicon_version FROM reflections "
+                    "WHERE (user_id, date) > (?, ?) ORDER BY user_id, date LIMIT ?")
+COUNT_REFLECTIONS = "SELECT COUNT(*) FROM reflections"
+# 운영 분석 스냅숏: 모든 사용자의 기록을 (user_id, id/date) 순서로 끊어 읽어요 (회고 본문 / 작업 이름은 빼고)
+SNAPSHOT_TASK_COLUMNS = ('user_id', 'id', 'date', 'complexity_level', 'focus_duration_minutes',
+                         'break_duration_minutes', 'logged_focus_minutes', 'feedback')
+SCAN_ALL_TASKS = ("SELECT " + ", ".join(SNAPSHOT_TASK_COLUMNS) + " FROM tasks "
+                  "WHERE (user_id, id) > (?, ?) ORDER BY user_id, id LIMIT ?")
+SCAN_ALL_HABITS = "SELECT user_id, id, creation_date, bits FROM habits WHERE (user_id, id) > (?, ?) ORDER BY user_id, id LIMIT ?"
+SCAN_ALL_REFLECTION_SCORES = ("SELECT user_id, date, sentiment_score, sentiment_level, lexicon_version FROM reflections "
+                              "WHERE (user_id, date) > (?, ?) ORDER BY user_id, date LIMIT ?")
+UPDATE_REFLECTION_SCORE = ("UPDATE reflections SET sentiment_score = ?, sentiment_level = ?, lexicon_version = ? "
+                           "WHERE user_id = ? AND date = ?")
+
+MAX_DATE = "9999-12-31"
+
+
+def task_occurrences(tasks, seen):
+    # 작업마다 같은 완료 작업(날짜, 이름, 피드백, 집중 시간)이 지금까지 몇 번째로 나왔는지. seen(Counter)에 누적해요
+    occurrences = []
+    for task in tasks:
+        key = (task['date'], task['name'], task['feedback'], task['logged_focus_minutes'])
+        seen[key] += 1
+        occurrences.append(seen[key])
+    return occurrences
+
+
+def bits_to_blob(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+
+def blob_to_bits(blob):
+    return int.from_bytes(blob, 'little')
+
+
+class Storage:
+    """사용자별 기록을 담는 SQLite 저장소 (WAL 모드).
+
+    프로세스마다 하나의 연결을 만들어 모든 세션이 함께 씁니다.
+    쓰기는 save() 한 번에 하나의 트랜잭션으로 모아서 처리해요.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._set_aside_old_keyed_tables()
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._conn.executescript(CHANGE_TRACKING)
+
+    def _set_aside_old_keyed_tables(self):
+        # (user_id, id) 복합 키인 예전 표는 <table>_old 로 이름을 바꿔 두고, _migrate() 가 새 표로 옮겨요
+        for table in REKEYED_TABLES:
+            key_columns = [row for row in self._conn.execute(f"PRAGMA table_info({table})") if row[5]]
+            if len(key_columns) < 2:
+                continue
+            indexes = self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+            ).fetchall()
+            for (index,) in indexes: # 새 표가 같은 이름의 색인을 만들 수 있게
+                self._conn.execute(f"DROP INDEX {index}")
+            self._conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+
+    def _migrate(self):
+        for table, column, definition in MIGRATIONS:
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                if column == "change_seq": # 변경 번호가 생기기 전의 회고가 있는 사용자는 1 부터
+                    with self._conn:
+                        self._conn.execute(SEED_REFLECTION_CHANGES)
+        for table, columns in REKEYED_TABLES.items():
+            if self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_old",)).fetchone():
+                column_list = ", ".join(columns)
+                with self._conn: # 사용자별 원래 순서(id 순)대로 넣어 새 id 도 같은 순서가 돼요
+                    self._conn.execute(f"INSERT INTO {table} (user_id, {column_list}) SELECT user_id, {column_list} FROM {table}_old ORDER BY user_id, id")
+                    self._conn.execute(f"DROP TABLE {table}_old")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _fetch(self, sql, params):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- 집중 기록 ---
+    def load_tasks(self, user_id, since="", until=MAX_DATE):
+        # since <= date < until 인 기록만 불러옵니다
+        return [TaskRecord(*row) for row in self._fetch(SELECT_TASKS, (user_id, since, until))]
+
+    def max_task_id(self, user_id):
+        # 저장된 작업이 없으면 0
+        return self._fetch(MAX_TASK_ID, (user_id,))[0][0]
+
+    def iter_tasks(self, user_id, batch_size=1000):
+        # 한 사용자의 작업을 id 순서로 batch_size 개씩 끊어 읽습니다 (내보내기용)
+        last_id = 0
+        while True:
+            rows = self._fetch(SCAN_TASKS, (user_id, last_id, batch_size))
+            if not rows:
+                return
+            for row in rows:
+                yield TaskRecord(*row)
+            last_id = rows[-1][0]
+
+    def insert_new_tasks(self, user_id, tasks, occurrences=None):
+        """가져온 작업 중 이미 있는 것과 겹치지 않는 것만 넣고(id 는 SQLite 가 매김), 넣은 개수를 돌려줍니다.
+
+        occurrences[i] 는 tasks[i] 와 똑같은 완료 작업이 가져오는 파일에서 몇 번째로 나왔는지(1부터)예요.
+        주지 않으면 tasks 안에서 셉니다. 진행 중인 작업은 (name, date) 마다 하나만 넣어요.
+        """
+        if occurrences is None:
+            occurrences = task_occurrences(tasks, collections.Counter())
+        rows = [
+            (user_id, *(task[column] for column in TASK_COLUMNS[1:]),
+             user_id, task['date'], task['name'], task['feedback'], task['logged_focus_minutes'],
+             1 if task['feedback'] is None else occurrence)
+            for task, occurrence in zip(tasks, occurrences)
+        ]
+        with self._lock, self._conn:
+            changes = self._conn.total_changes
+            self._conn.executemany(INSERT_TASK_IF_NEW, rows)
+            return self._conn.total_changes - changes
+
+    def task_rollups_before(self, user_id, date):
+        """date 이전 기록의 (날짜별 집중 시간, 피드백별 (횟수, 집중 시간)) 합계.
+
+        오래된 기록을 불러오지 않고도 리포트 합계를 맞출 수 있게 해줍니다.
+        """
+        minutes_by_day = dict(self._fetch(MINUTES_BY_DAY_BEFORE, (user_id, date)))
+        feedback_totals = {feedback: (count, minutes) for feedback, count, minutes in self._fetch(FEEDBACK_BEFORE, (user_id, date))}
+        return minutes_by_day, feedback_totals
+
+    # --- 습관 ---
+    def load_habits(self, user_id):
+        return [
+            {'id': habit_id, 'name': name, 'creation_date': creation_date, 'bits': blob_to_bits(bits)}
+            for habit_id, name, creation_date, bits in self._fetch(SELECT_HABITS, (user_id,))
+        ]
+
+    # --- 회고 ---
+    def load_reflections(self, user_id, since="", until=MAX_DATE):
+        # since <= date < until 인 회고만 불러옵니다
+        return {row[0]: ReflectionRecord(*row[1:]) for row in self._fetch(SELECT_REFLECTIONS, (user_id, since, until))}
+
+    def load_reflection_scores(self, user_id):
+        # 감성 통계용 (date, score, label) 만. 회고 본문은 읽지 않아요
+        return self._fetch(SELECT_REFLECTION_SCORES, (user_id,))
+
+    def reflection_version(self, user_id):
+        # 회고를 넣거나 고치거나 다시 채점할 때마다 늘어나는 변경 번호 (회고가 없으면 0). 감성 통계를 다시 계산할지 정할 때 써요
+        return self._fetch(REFLECTION_VERSION, (user_id,))[0][0]
+
+    def load_reflection_changes(self, user_id, since_version):
+        # 변경 번호 since_version 뒤에 넣거나 고친 회고의 (date, score, label). 감성 통계를 고쳐 쓸 때 써요
+        return self._fetch(SELECT_REFLECTION_CHANGES, (user_id, since_version))
+
+    def iter_reflections(self, user_id, batch_size=1000):
+        # 한 사용자의 회고를 날짜 순서로 batch_size 개씩 끊어 읽습니다 (내보내기용)
+        last_date = ""
+        while True:
+            rows = self._fetch(SCAN_USER_REFLECTIONS, (user_id, last_date, batch_size))
+            if not rows:
+                return
+            for row in rows:
+                yield row[0], ReflectionRecord(*row[1:])
+            last_date = rows[-1][0]
+
+    def insert_new_reflections(self, user_id, reflections):
+        # (date, 회고) 중 그 날짜에 회고가 없는 것만 넣고, 넣은 개수를 돌려줍니다
+        rows = [(user_id, date, *(data.get(column) for column in REFLECTION_COLUMNS[1:])) for date, data in reflections]
+        with self._lock, self._conn:
+            changes = self._conn.total_changes
+            self._conn.executemany(INSERT_REFLECTION_IF_NEW, rows)
+            return self._conn.total_changes - changes
+
+    def load_stale_reflections(self, user_id, lexicon_version):
+        # lexicon_version 이 아닌 사전으로 채점된 회고의 (date, {'q1', 'q2', 'q3'})
+        return [(date, {'q1': q1, 'q2': q2, 'q3': q3}) for date, q1, q2, q3 in self._fetch(SELECT_STALE_REFLECTIONS, (user_id, lexicon_version))]
+
+    def count_reflections(self):
+        return self._fetch(COUNT_REFLECTIONS, ())[0][0]
+
+    def iter_all_reflections(self, batch_size=1000):
+        # 모든 사용자의 회고를 (user_id, date) 순서로 batch_size 개씩 끊어 읽습니다 (전체를 메모리에 올리지 않음)
+        last_key = ("", "")
+        while True:
+            rows = self._fetch(SCAN_REFLECTIONS, (*last_key, batch_size))
+            if not rows:
+                return
+            for user_id, date, q1, q2, q3, version in rows:
+                yield user_id, date, {'q1': q1, 'q2': q2, 'q3': q3, 'lexicon_version': version}
+            last_key = rows[-1][:2]
+
+    def update_reflection_scores(self, rows):
+        # rows: (user_id, date, score, label, lexicon_version)
+        rows = [(score, label, version, user_id, date) for user_id, date, score, label, version in rows]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(UPDATE_REFLECTION_SCORE, rows)
+
+    # --- 운영 분석 스냅숏 (모든 사용자) ---
+    def _scan_batches(self, sql, batch_size):
+        # 앞의 두 열 (user_id, id 또는 date) 을 키로 batch_size 줄씩 끊어 읽어 줄 목록을 하나씩 돌려줍니다
+        last_key = ("", "")
+        while True:
+            rows = self._fetch(sql, (*last_key, batch_size))
+            if not rows:
+                return
+            yield rows
+            last_key = rows[-1][:2]
+
+    def scan_all_tasks(self, batch_size=50000):
+        # SNAPSHOT_TASK_COLUMNS 순서의 줄 목록
+        return self._scan_batches(SCAN_ALL_TASKS, batch_size)
+
+    def scan_all_habits(self, batch_size=1000):
+        # (user_id, id, creation_date, bits) 줄 목록 (bits 는 int 로)
+        for rows in self._scan_batches(SCAN_ALL_HABITS, batch_size):
+            yield [(user_id, habit_id, creation_date, blob_to_bits(bits)) for user_id, habit_id, creation_date, bits in rows]
+
+    def scan_all_reflection_scores(self, batch_size=50000):
+        # (user_id, date, sentiment_score, sentiment_level, lexicon_version) 줄 목록
+        return self._scan_batches(SCAN_ALL_REFLECTION_SCORES, batch_size)
+
+    # --- 쓰기 (rerun 당 한 번) ---
+    def save(self, user_id, tasks=(), habits=(), reflections=()):
+        """바뀐 기록을 한 트랜잭션으로 저장합니다.
+
+        id 가 None 인 작업 / 습관은 새 행으로 넣고, 커밋한 뒤 SQLite 가 매긴 id 를 레코드에 채워 줘요.
+        """
+        new_tasks = [task for task in tasks if task['id'] is None]
+        task_rows = [(*(task[column] for column in TASK_COLUMNS[1:]), user_id, task['id']) for task in tasks if task['id'] is not None]
+        new_habits = [habit for habit in habits if habit['id'] is None]
+        habit_rows = [
+            (habit['name'], habit['creation_date'], bits_to_blob(habit['tracking'].bits), user_id, habit['id'])
+            for habit in habits if habit['id'] is not None
+        ]
+        reflection_rows = [
+            (user_id, date, *(data.get(column) for column in REFLECTION_COLUMNS[1:]))
+            for date, data in reflections
+        ]
+        if not (new_tasks or task_rows or new_habits or habit_rows or reflection_rows):
+            return
+        with self._lock, self._conn:
+            # RETURNING 은 executemany 로 받을 수 없어 새 행은 하나씩 (rerun 당 몇 개뿐이에요)
+            task_ids = [
+                self._conn.execute(INSERT_TASK, (user_id, *(task[column] for column in TASK_COLUMNS[1:]))).fetchone()[0]
+                for task in new_tasks
+            ]
+            if task_rows:
+                self._conn.executemany(UPDATE_TASK, task_rows)
+            habit_ids = [
+                self._conn.execute(INSERT_HABIT, (user_id, habit['name'], habit['creation_date'], bits_to_blob(habit['tracking'].bits))).fetchone()[0]
+                for habit in new_habits
+            ]
+            if habit_rows:
+                self._conn.executemany(UPDATE_HABIT, habit_rows)
+            if reflection_rows:
+                self._conn.executemany(UPSERT_REFLECTION, reflection_rows)
+        # 커밋된 뒤에만 채워요 (실패하면 다음 저장 때 다시 새 행으로 넣음)
+        for record, record_id in zip(new_tasks + new_habits, task_ids + habit_ids):
+            record.id = record_id
@@ -0,0 +1,176 @@
+# task_store.py
+# 지능형 집중 타이머(Smart Pomodoro)의 작업 기록 저장소
+from datetime import datetime
+
+from records import TaskRecord
+
+
+def week_key(date_str):
+    year, week, _ = datetime.strptime(date_str, "%Y-%m-%d").isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_key(date_str):
+    return date_str[:7]
+
+
+class TaskStore:
+    """집중 세션 작업 기록을 담는 저장소.
+
+    기록은 TaskRecord(__slots__) 로 추가된 순서대로 보관하고, 진행 중인 작업(feedback is None)은
+    (name, date) 키로, 전체 기록은 날짜별 버킷으로 색인해 둡니다.
+    덕분에 rerun 마다 전체 목록을 훑지 않고 O(1)로 찾고 갱신할 수 있어요.
+
+    집중 패턴 리포트에 쓰는 합계(완료 작업 수/시간, 피드백 분포, 일/주/월별
+    집중 시간)도 작업이 완료되거나 시간이 기록될 때 바로 누적해 둡니다.
+
+    저장소와 함께 쓸 때는 최근 기록만 불러오고(loaded_from 이후), 그 이전
+    기록의 합계는 seed_rollups() 로 채웁니다. 오래된 기록은 load_older() 로
+    불러왔다가 evict_before() 로 다시 내려놓을 수 있어요 (합계는 그대로).
+    바뀐 작업은 dirty 에 모아 두었다가 pop_dirty() 로 한 번에 저장해요. 새 작업은 id 가
+    None 이고, 저장할 때 SQLite 가 매긴 id 가 채워집니다 (세션마다 id 를 매기면 겹쳐요).
+    """
+
+    def __init__(self, tasks=None, loaded_from=None):
+        self.loaded_from = loaded_from # None 이면 전체 기록이 메모리에 있음
+        self.dirty = {}     # id(작업 객체) -> 저장되지 않은 작업 (새 작업은 아직 id 가 없어서 객체로 구분)
+        self._tasks = []    # 추가된 순서 그대로 (이력 표시용)
+        self._open = {}     # (name, date) -> 진행 중인 작업
+        self._by_date = {}  # date -> [작업, ...]
+
+        # --- 리포트용 누적 집계 ---
+        self.completed_count = 0
+        self.completed_minutes = 0  # 완료된 작업들의 집중 기록 시간 합계
+        self.feedback_counts = {}   # feedback -> 횟수
+        self.minutes_by_day = {}    # 'YYYY-MM-DD' -> 기록된 집중 시간(분)
+        self.minutes_by_week = {}   # 'YYYY-Www' -> 기록된 집중 시간(분)
+        self.minutes_by_month = {}  # 'YYYY-MM' -> 기록된 집중 시간(분)
+        for task in tasks or []:
+            self.add(task, dirty=False)
+
+    # --- 기존 list 처럼 쓸 수 있도록 ---
+    def __iter__(self):
+        return iter(self._tasks)
+
+    def __reversed__(self):
+        return reversed(self._tasks)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __bool__(self):
+        return bool(self._tasks)
+
+    # --- 조회 ---
+    def get_open(self, name, date):
+        return self._open.get((name, date))
+
+    def tasks_on(self, date):
+        return self._by_date.get(date, [])
+
+    # --- 추가 / 갱신 ---
+    def add(self, task, dirty=True, count=True):
+        if not isinstance(task, TaskRecord):
+            task = TaskRecord.from_dict(task)
+        if task.get('id') is None:
+            task.id = None # 저장할 때 채워져요
+        self._tasks.append(task)
+        self._by_date.setdefault(task['date'], []).append(task)
+        if count and task['logged_focus_minutes']:
+            self._count_minutes(task['date'], task['logged_focus_minutes'])
+        if task['feedback'] is None:
+            # 같은 키의 진행 중 작업이 이미 있으면 먼저 들어온 작업을 유지 (기존 선형 탐색과 동일)
+            self._open.setdefault((task['name'], task['date']), task)
+        elif count:
+            self._count_completion(task)
+        if dirty:
+            self.dirty[id(task)] = task
+        return task
+
+    def load_older(self, tasks, since):
+        # 저장소에서 [since, loaded_from) 구간을 불러와 붙입니다 (합계는 seed_rollups 로 이미 반영됨)
+        for task in tasks:
+            self.add(task, dirty=False, count=False)
+        self.loaded_from = since
+
+    def evict_before(self, since):
+        # since 이전 기록을 메모리에서 내려놓습니다. 저장소에 이미 있으므로 load_older 로 다시 불러올 수 있어요
+        if self.loaded_from is None or since <= self.loaded_from:
+            return 0
+        if any(task['date'] < since for task in self.dirty.values()):
+            return 0 # 아직 저장되지 않은 기록이 있으면 저장된 뒤(다음 rerun)에 내려놓기
+        evicted = sum(len(self._by_date.pop(date)) for date in [date for date in self._by_date if date < since])
+        self._tasks = [task for task in self._tasks if task['date'] >= since]
+        for key in [key for key in self._open if key[1] < since]:
+            del self._open[key]
+        self.loaded_from = since
+        return evicted
+
+    def pop_dirty(self):
+        dirty_tasks = list(self.dirty.values())
+        self.dirty.clear()
+        return dirty_tasks
+
+    def upsert_open(self, name, date, complexity_level, focus_duration_minutes, break_duration_minutes):
+        task = self.get_open(name, date)
+        if task is not None:
+            task.update({
+                'complexity_level': complexity_level,
+                'focus_duration_minutes': focus_duration_minutes,
+                'break_duration_minutes': break_duration_minutes,
+            })
+            self.dirty[id(task)] = task
+            return task
+        return self.add(TaskRecord(
+            id=None, # 저장할 때 SQLite 가 매겨요
+            name=name,
+            complexity_level=complexity_level,
+            focus_duration_minutes=focus_duration_minutes,
+            break_duration_minutes=break_duration_minutes,
+            logged_focus_minutes=0, # Total focus minutes logged for this task
+            feedback=None, # To mark task as incomplete initially
+            date=date
+        ))
+
+    def log_focus_minutes(self, name, date, minutes):
+        task = self.get_open(name, date)
+        if task is not None:
+            task['logged_focus_minutes'] += minutes
+            self._count_minutes(date, minutes)
+            self.dirty[id(task)] = task
+        return task
+
+    def complete(self, name, date, feedback):
+        task = self._open.pop((name, date), None)
+        if task is not None:
+            task['feedback'] = feedback
+            self._count_completion(task)
+            self.dirty[id(task)] = task
+        return task
+
+    # --- 누적 집계 ---
+    def _count_minutes(self, date, minutes):
+        self.minutes_by_day[date] = self.minutes_by_day.get(date, 0) + minutes
+        week = week_key(date)
+        self.minutes_by_week[week] = self.minutes_by_week.get(week, 0) + minutes
+        month = month_key(date)
+        self.minutes_by_month[month] = self.minutes_by_month.get(month, 0) + minutes
+
+    def seed_rollups(self, minutes_by_day, feedback_totals):
+        # 불러오지 않은 오래된 기록의 합계를 저장소에서 받아 채워 넣기
+        for date, minutes in minutes_by_day.items():
+            self._count_minutes(date, minutes)
+        for feedback, (count, minutes) in feedback_totals.items():
+            self.completed_count += count
+            self.completed_minutes += minutes
+            self.feedback_counts[feedback] = self.feedback_counts.get(feedback, 0) + count
+
+    def _count_completion(self, task):
+        self.completed_count += 1
+        self.completed_minutes += task['logged_focus_minutes']
+        self.feedback_counts[task['feedback']] = self.feedback_counts.get(task['feedback'], 0) + 1
+
+    def recent_minutes(self, period='week', count=8):
+        # 최근 count 개 기간만 돌려주므로 전체 이력을 다시 훑지 않아요
+        rollup = self.minutes_by_week if period == 'week' else self.minutes_by_month
+        return {key: rollup[key] for key in sorted(rollup)[-count:]}
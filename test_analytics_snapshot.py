@@ -0,0 +1,74 @@
+# test_analytics_snapshot.py
+# analytics_snapshot.py 의 스냅숏 쓰기 / 읽기 확인 (python -m pytest test_analytics_snapshot.py)
+from datetime import date
+
+import pytest
+
+from analytics_snapshot import (
+    daily_focus, daily_habit_completion, daily_sentiment, feedback_distribution, latest_snapshot,
+    sentiment_distribution, write_snapshot,
+)
+from records import TaskRecord
+from storage import Storage
+
+SINCE = date(2026, 1, 1)
+UNTIL = date(2026, 12, 31)
+
+
+def test_empty_tables_are_readable(tmp_path):
+    # 습관 / 회고가 아직 없는 설치에서 처음 뜬 스냅숏도 대시보드 집계가 빈 결과로 돌아와야 해요
+    storage = Storage(str(tmp_path / "assistant.db"))
+    storage.insert_new_tasks("user", [
+        TaskRecord(None, "작업", "쉬움", 25, 5, 25, "좋음", "2026-03-02"),
+        TaskRecord(None, "진행 중", "쉬움", 25, 5, 10, None, "2026-03-02"),
+    ])
+    manifest = write_snapshot(storage, str(tmp_path / "snapshots"), today_str="2026-03-02")
+    storage.close()
+
+    assert manifest['rows'] == {'tasks': 2, 'habit_days': 0, 'reflections': 0}
+    assert (tmp_path / "snapshots" / manifest['id'] / "habit_days").is_dir()
+    out_dir = str(tmp_path / "snapshots")
+    snapshot_id = latest_snapshot(out_dir)['id']
+    focus = daily_focus(out_dir, snapshot_id, SINCE, UNTIL)
+    assert focus['focus_minutes'].to_pylist() == [35]
+    assert focus['sessions'].to_pylist() == [1] # 진행 중인 작업은 완료 세션이 아니에요
+    assert feedback_distribution(out_dir, snapshot_id, SINCE, UNTIL)['count'].to_pylist() == [1]
+    assert daily_habit_completion(out_dir, snapshot_id, SINCE, UNTIL).num_rows == 0
+    assert daily_sentiment(out_dir, snapshot_id, SINCE, UNTIL).num_rows == 0
+    assert sentiment_distribution(out_dir, snapshot_id, SINCE, UNTIL).num_rows == 0
+
+
+def test_missing_table_directory_reads_as_empty(tmp_path):
+    # 폴더를 항상 만들기 전에 뜬 예전 스냅숏
+    storage = Storage(str(tmp_path / "assistant.db"))
+    manifest = write_snapshot(storage, str(tmp_path / "snapshots"), today_str="2026-03-02")
+    storage.close()
+    snapshot_dir = tmp_path / "snapshots" / manifest['id']
+    for table in ("tasks", "habit_days", "reflections"):
+        (snapshot_dir / table).rmdir()
+
+    out_dir = str(tmp_path / "snapshots")
+    assert daily_focus(out_dir, manifest['id'], SINCE, UNTIL).num_rows == 0
+    assert daily_habit_completion(out_dir, manifest['id'], SINCE, UNTIL).num_rows == 0
+    assert sentiment_distribution(out_dir, manifest['id'], SINCE, UNTIL).num_rows == 0
+
+
+def test_snapshots_started_in_the_same_second_do_not_collide(tmp_path):
+    storage = Storage(str(tmp_path / "assistant.db"))
+    out_dir = str(tmp_path / "snapshots")
+    first = write_snapshot(storage, out_dir, today_str="2026-03-02")
+    second = write_snapshot(storage, out_dir, today_str="2026-03-02")
+    storage.close()
+    assert first['id'] != second['id']
+    assert latest_snapshot(out_dir)['id'] == second['id']
+
+
+def test_keep_must_leave_at_least_one_snapshot(tmp_path):
+    storage = Storage(str(tmp_path / "assistant.db"))
+    out_dir = str(tmp_path / "snapshots")
+    with pytest.raises(ValueError):
+        write_snapshot(storage, out_dir, keep=0, today_str="2026-03-02")
+    write_snapshot(storage, out_dir, keep=1, today_str="2026-03-02")
+    latest = write_snapshot(storage, out_dir, keep=1, today_str="2026-03-02")
+    storage.close()
+    assert sorted(path.name for path in (tmp_path / "snapshots").iterdir() if path.is_dir()) == [latest['id']]